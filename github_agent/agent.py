@@ -1,47 +1,55 @@
+import functools
+
 #import the agent from google.adk.agents
 from google.adk.agents import Agent
 from google.genai import types # For further configuration controls
-from dotenv import load_dotenv
 from google.adk.tools import FunctionTool
 from .tools.create_repo_tool import create_repository_tool
 from .tools.delete_repo_tool import delete_repository_tool
-
-
-
-load_dotenv() 
-
-
-
-
-def list_repositories_tool() -> list[str]:
-    return ["repository1", "repository2", "repository3"]
-
-
-list_repositories_tool = FunctionTool(list_repositories_tool)
-
-
-#create a new agent
-root_agent = Agent(
-    name="github_agent",
-    model="gemini-2.0-flash",
-    description="A helpful assistant that can create create and delete github repositories",
-    instruction="""
+from .tools.list_repos_tool import list_repositories_tool, repository_exists_tool
+from .tools.bulk_repo_tool import bulk_create_repositories_tool, bulk_delete_repositories_tool
+from .tools.github_client import load_env
+
+
+
+#create a new agent on first use: importing the package (adk web, tools, tests)
+#builds nothing and reads .env only once, right before the agent is built
+@functools.lru_cache(maxsize=None)
+def build_root_agent() -> Agent:
+    load_env()
+    return Agent(
+        name="github_agent",
+        model="gemini-2.0-flash",
+        description="A helpful assistant that can create create and delete github repositories",
+        instruction="""
     You are a helpful assistant that can create create and delete github repositories.
     You are also able to create and delete github repositories.
     You will have access to the following tools:
     - create_repository(name: str, description: str, private: bool) -> str: Creates a new repository with the given name and description
     - delete_repository(name: str) -> str: Deletes the repository with the given name
-    - list_repositories() -> list[str]: Lists all repositories
+    - list_repositories(query: str, limit: int, refresh: bool) -> dict: Lists repositories (owner/name), optionally only those whose name contains query
+    - repository_exists(name: str) -> bool: Checks whether a repository with the given name already exists
+    - bulk_create_repositories(names: list[str], description: str, private: bool, dry_run: bool) -> dict: Creates several repositories at once
+    - bulk_delete_repositories(names: list[str], dry_run: bool) -> dict: Deletes several repositories at once
+    Use repository_exists rather than list_repositories to check for a single repository.
+    Use the bulk tools whenever more than one repository is created or deleted, in a single call.
+    After a bulk call, summarize: give the count per status and name only the repositories that were not created / deleted as asked (exists, not_found, error with its detail).
     """,
-    generate_content_config = types.GenerateContentConfig(
-        temperature=0.2, # More deterministic output, closer to 0 more deterministic it is
-        max_output_tokens=250
-    ),
-
-    tools=[create_repository_tool, delete_repository_tool, list_repositories_tool]
+        generate_content_config = types.GenerateContentConfig(
+            temperature=0.2, # More deterministic output, closer to 0 more deterministic it is
+            max_output_tokens=600  # room for a bulk summary with its failed items
+        ),
+
+        tools=[
+            create_repository_tool, delete_repository_tool, list_repositories_tool, repository_exists_tool,
+            bulk_create_repositories_tool, bulk_delete_repositories_tool,
+        ]
     
-)
-
-
+    )
 
 
+def __getattr__(name):
+    # ADK web reads agent.root_agent
+    if name == "root_agent":
+        return build_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
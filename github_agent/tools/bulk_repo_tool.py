@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+
+import requests
+from google.adk.tools import FunctionTool
+from .github_client import GitHubClient, get_client
+from .list_repos_tool import repo_index
+
+# Bulk create / delete: one tool call for a whole list of repositories.
+#
+# Items run with bounded concurrency (GITHUB_BULK_CONCURRENCY, default 4)
+# through the shared client, which still spaces the writes themselves
+# (GITHUB_WRITE_INTERVAL) to stay clear of GitHub's secondary rate limit. Every
+# item gets its own status; an existing / missing repository or a failed
+# request is reported for that item and does not stop the others. With
+# dry_run=True nothing is written: the statuses say what would happen, based
+# on one snapshot of the repository listing (refreshed once per call if stale).
+#
+# Item statuses: created, deleted, exists, not_found, error,
+#                would_create, would_delete (dry run).
+
+
+def _dedupe(names: List[str]) -> List[str]:
+    seen, unique = set(), []
+    for name in names:
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            unique.append(name)
+    return unique
+
+
+def _error(name: str, resp: requests.Response) -> Dict[str, str]:
+    try:
+        message = resp.json().get("message", "")
+    except ValueError:
+        message = resp.text[:200]
+    return {"name": name, "status": "error", "detail": f"HTTP {resp.status_code}: {message}"}
+
+
+def _existing(client: GitHubClient) -> Set[str]:
+    """Lower-cased full names, refreshing the index once for the whole dry run."""
+    return {name.lower() for name in repo_index.names(client)}
+
+
+def _create_one(
+    client: GitHubClient, name: str, description: str, private: bool, existing: Optional[Set[str]]
+) -> Dict[str, str]:
+    owner = client.login()
+    if existing is not None:  # dry run
+        exists = f"{owner}/{name}".lower() in existing
+        return {"name": name, "status": "exists" if exists else "would_create"}
+    resp = client.request("POST", "/user/repos", json={"name": name, "description": description, "private": private})
+    if resp.status_code == 422 and "already exists" in resp.text:
+        return {"name": name, "status": "exists"}
+    if resp.status_code != 201:
+        return _error(name, resp)
+    repo = resp.json()
+    repo_index.add(client, repo["full_name"])
+    return {"name": name, "status": "created", "url": repo["html_url"]}
+
+
+def _delete_one(client: GitHubClient, name: str, existing: Optional[Set[str]]) -> Dict[str, str]:
+    owner = client.login()
+    if existing is not None:  # dry run
+        exists = f"{owner}/{name}".lower() in existing
+        return {"name": name, "status": "would_delete" if exists else "not_found"}
+    resp = client.request("DELETE", f"/repos/{owner}/{name}")
+    if resp.status_code == 204:
+        repo_index.discard(client, f"{owner}/{name}")
+        return {"name": name, "status": "deleted"}
+    if resp.status_code == 404:
+        return {"name": name, "status": "not_found"}
+    return _error(name, resp)
+
+
+def _run_bulk(names: List[str], run_one: Callable[[str], Dict[str, str]]) -> dict:
+    concurrency = int(os.getenv("GITHUB_BULK_CONCURRENCY", "4"))
+
+    def safe(name: str) -> Dict[str, str]:
+        try:
+            return run_one(name)
+        except Exception as e:  # one failing item must not hide the others' results
+            return {"name": name, "status": "error", "detail": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(safe, names))
+    summary: Dict[str, int] = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return {"summary": summary, "results": results}
+
+
+def bulk_create_repositories_tool(
+    names: list[str], description: str = "", private: bool = False, dry_run: bool = False
+) -> dict:
+    """
+    Creates several repositories in one call
+
+    Args:
+        names: list[str] - The names of the repositories (each is prefixed with agent-, like create_repository)
+        description: str - The description for all of them
+        private: bool - Whether the repositories are private
+        dry_run: bool - Only report what would be created
+
+    Returns:
+        dict - count per status and one result per repository (created, exists, error, would_create)
+    """
+    client = get_client()
+    names = _dedupe([f"agent-{name}" for name in names])
+    existing = _existing(client) if dry_run else None
+    return _run_bulk(names, lambda name: _create_one(client, name, description, private, existing))
+
+
+def bulk_delete_repositories_tool(names: list[str], dry_run: bool = False) -> dict:
+    """
+    Deletes several repositories in one call.
+
+    Args:
+        names: The names of the repositories.
+        dry_run: Only report what would be deleted.
+
+    Returns:
+        Count per status and one result per repository (deleted, not_found, error, would_delete).
+    """
+    client = get_client()
+    existing = _existing(client) if dry_run else None
+    return _run_bulk(_dedupe(names), lambda name: _delete_one(client, name, existing))
+
+
+bulk_create_repositories_tool = FunctionTool(bulk_create_repositories_tool)
+bulk_delete_repositories_tool = FunctionTool(bulk_delete_repositories_tool)
@@ -1,14 +1,12 @@
 from google.adk.tools import FunctionTool
-from dotenv import load_dotenv
-import requests
-import os
-load_dotenv()
+from .github_client import get_client
+from .list_repos_tool import repo_index
 
 
 def create_repository_tool( name: str, description: str, private: bool = False) -> str:
     """
     Creates a new repository with the given name and description
-    
+
     Args:
         name: str - The name of the repository
         description: str - The description of the repository
@@ -17,29 +15,19 @@ def create_repository_tool( name: str, description: str, private: bool = False)
     Returns:
         str - A message indicating that the repository was created successfully
     """
-
-
-    headers = {
-        "Authorization": f"Bearer {os.getenv('GITHUB_TOKEN')}",
-        "Accept": "application/vnd.github+json",
-    }
+    client = get_client()
     #Always add agent-{name} to the repository name
     name = f"agent-{name}"
-    
-    # 1) Check if repo exists for the authenticated user
-    me = requests.get("https://api.github.com/user", headers=headers)
-    me.raise_for_status()
-    owner = me.json()["login"]
-
-    check = requests.get(f"https://api.github.com/repos/{owner}/{name}", headers=headers)
 
-    if check.status_code == 200:
-        raise RuntimeError(f"Repository '{owner}/{name}' already exists")
+    # A single POST: GitHub answers 422 if the repo already exists, so no
+    # separate existence check is needed (the owner login is cached)
+    payload = {"name": name, "description": description, "private": private}
+    resp = client.request("POST", "/user/repos", json=payload)
 
-    # 2) Create repo (will still fail if race condition)
-    payload = {"name": name, "private": private}
-    resp = requests.post("https://api.github.com/user/repos", json=payload, headers=headers)
+    if resp.status_code == 422 and "already exists" in resp.text:
+        raise RuntimeError(f"Repository '{client.login()}/{name}' already exists")
     resp.raise_for_status()
+    repo_index.add(client, resp.json()["full_name"])
 
     return resp.json()
 
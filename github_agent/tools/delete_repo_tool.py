@@ -1,17 +1,6 @@
 from google.adk.tools import FunctionTool
-from dotenv import load_dotenv
-import os
-import requests
-
-load_dotenv()
-
-
-from google.adk.tools import FunctionTool
-from dotenv import load_dotenv
-import os
-import requests
-
-load_dotenv()
+from .github_client import get_client
+from .list_repos_tool import repo_index
 
 def delete_repository_tool(name: str) -> str:
     """
@@ -23,21 +12,16 @@ def delete_repository_tool(name: str) -> str:
     Returns:
         A message indicating the result.
     """
-    headers = {
-        "Authorization": f"Bearer {os.getenv('GITHUB_TOKEN')}",
-        "Accept": "application/vnd.github+json",
-    }
+    client = get_client()
 
-    # 1) Get username (owner) from token
-    me = requests.get("https://api.github.com/user", headers=headers)
-    me.raise_for_status()
-    owner = me.json()["login"]
+    # 1) Owner login from the token (cached after the first call)
+    owner = client.login()
 
     # 2) Delete repo under that owner
-    url = f"https://api.github.com/repos/{owner}/{name}"
-    resp = requests.delete(url, headers=headers)
+    resp = client.request("DELETE", f"/repos/{owner}/{name}")
 
     if resp.status_code == 204:
+        repo_index.discard(client, f"{owner}/{name}")
         return f"Repository '{owner}/{name}' deleted successfully."
     if resp.status_code == 404:
         raise RuntimeError(f"Repository '{owner}/{name}' does not exist or you lack access.")
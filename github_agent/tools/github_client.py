@@ -0,0 +1,217 @@
+import functools
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+# Shared GitHub REST client for the github_agent tools.
+#
+# - One pooled requests.Session for every tool call (keep-alive, no new TLS
+#   handshake per request); connection errors are retried.
+# - The authenticated user's login is looked up once per token (a changed
+#   GITHUB_TOKEN is picked up on the next call).
+# - GETs are conditional: the ETag of each response is kept and re-sent with
+#   If-None-Match, and a 304 (which does not count against the rate limit) is
+#   answered from the cache.
+# - Rate limits: a 403/429 with Retry-After, an exhausted primary limit or a
+#   secondary rate limit is waited out and retried, up to GITHUB_MAX_RATE_LIMIT_WAIT
+#   seconds; beyond that GitHubRateLimitError is raised. Writes (POST, PATCH,
+#   PUT, DELETE) are spaced GITHUB_WRITE_INTERVAL seconds apart, as GitHub asks
+#   for content-creating requests, so bursts of tool calls do not trigger the
+#   secondary limit in the first place.
+#
+# Env: GITHUB_TOKEN, GITHUB_API_URL (default https://api.github.com),
+#      GITHUB_MAX_RATE_LIMIT_WAIT (default 120), GITHUB_WRITE_INTERVAL (default 1.0).
+
+DEFAULT_API_URL = "https://api.github.com"
+ETAG_CACHE_SIZE = 512
+_WRITE_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubRateLimitError(RuntimeError):
+    """GitHub asked us to wait longer than GITHUB_MAX_RATE_LIMIT_WAIT allows."""
+
+
+def _rate_limit_wait(resp: requests.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying, or None if the response is not a rate limit."""
+    if resp.status_code not in (403, 429):
+        return None
+    headers = resp.headers
+    if "Retry-After" in headers:
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            return 60.0
+    if headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+        return max(0.0, float(headers["X-RateLimit-Reset"]) - time.time()) + 1.0
+    if "secondary rate limit" in resp.text.lower():
+        # no hint given: GitHub recommends at least a minute, growing on repeats
+        return 60.0 * (2**attempt)
+    return None
+
+
+class GitHubClient:
+    """
+    Pooled, rate-limit-aware GitHub REST client.
+
+    Args:
+        token: API token (default: GITHUB_TOKEN, read on every request).
+        api_url: API root. Env: GITHUB_API_URL.
+        max_rate_limit_wait: Longest total wait for rate limits per request, in seconds.
+        write_interval: Minimum seconds between two write requests.
+        pool_size: Connections kept open.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        api_url: Optional[str] = None,
+        max_rate_limit_wait: Optional[float] = None,
+        write_interval: Optional[float] = None,
+        pool_size: int = 16,
+    ):
+        self._token = token
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL", DEFAULT_API_URL)).rstrip("/")
+        self.max_rate_limit_wait = (
+            max_rate_limit_wait
+            if max_rate_limit_wait is not None
+            else float(os.getenv("GITHUB_MAX_RATE_LIMIT_WAIT", "120"))
+        )
+        self.write_interval = (
+            write_interval if write_interval is not None else float(os.getenv("GITHUB_WRITE_INTERVAL", "1.0"))
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(connect=3, read=0, status=0, backoff_factor=0.5),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        )
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._last_write = 0.0
+        # (token digest, url) -> (etag, data, headers)
+        self._etags: "OrderedDict[Tuple[str, str], Tuple[str, Any, CaseInsensitiveDict]]" = OrderedDict()
+        self._logins: Dict[str, str] = {}
+
+    @property
+    def token(self) -> str:
+        return self._token or os.getenv("GITHUB_TOKEN", "")
+
+    def token_key(self) -> str:
+        # responses are cached per token, without keeping the token itself around
+        return hashlib.sha256(self.token.encode("utf-8")).hexdigest()[:16]
+
+    def url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.api_url}/{path.lstrip('/')}"
+
+    def _pace_write(self) -> None:
+        with self._write_lock:
+            wait = self._last_write + self.write_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_write = time.monotonic()
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request, waiting out rate limits. The response is returned as is
+        (including 4xx), so callers can handle e.g. 404 / 422 themselves.
+        """
+        method = method.upper()
+        headers = {"Authorization": f"Bearer {self.token}", **kwargs.pop("headers", {})}
+        kwargs.setdefault("timeout", 30)
+        waited = 0.0
+        attempt = 0
+        while True:
+            if method in _WRITE_METHODS and self.write_interval > 0:
+                self._pace_write()
+            resp = self.session.request(method, self.url(path), headers=headers, **kwargs)
+            wait = _rate_limit_wait(resp, attempt)
+            if wait is None:
+                return resp
+            if waited + wait > self.max_rate_limit_wait:
+                raise GitHubRateLimitError(
+                    f"GitHub rate limit hit for {method} {path}; retry in {int(wait)}s "
+                    f"(waits longer than GITHUB_MAX_RATE_LIMIT_WAIT={int(self.max_rate_limit_wait)}s are not done)"
+                )
+            logger.warning("GitHub rate limit on %s %s, waiting %.0fs", method, path, wait)
+            time.sleep(wait)
+            waited += wait
+            attempt += 1
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, CaseInsensitiveDict]:
+        """
+        Conditional GET: (parsed JSON, response headers). Unchanged resources
+        are served from the ETag cache. Raises requests.HTTPError on errors.
+        """
+        prepared = requests.Request("GET", self.url(path), params=params).prepare()
+        key = (self.token_key(), prepared.url)
+        with self._lock:
+            cached = self._etags.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        resp = self.request("GET", prepared.url, headers=headers)
+        if resp.status_code == 304 and cached:
+            with self._lock:
+                self._etags.move_to_end(key)
+            return cached[1], cached[2]
+        resp.raise_for_status()
+        data = resp.json() if resp.content else None
+        etag = resp.headers.get("ETag")
+        if etag:
+            with self._lock:
+                self._etags[key] = (etag, data, resp.headers)
+                self._etags.move_to_end(key)
+                while len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return data, resp.headers
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return self.get(path, params)[0]
+
+    def login(self) -> str:
+        """The authenticated user's login, looked up once per token."""
+        key = self.token_key()
+        with self._lock:
+            login = self._logins.get(key)
+        if login is None:
+            login = self.get_json("/user")["login"]
+            with self._lock:
+                self._logins[key] = login
+        return login
+
+
+_default_client: Optional[GitHubClient] = None
+_default_client_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load .env once, for the agent and for tools called directly."""
+    load_dotenv()
+
+
+def get_client() -> GitHubClient:
+    """The process-wide client shared by all GitHub tools."""
+    global _default_client
+    load_env()
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = GitHubClient()
+    return _default_client
@@ -0,0 +1,150 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from google.adk.tools import FunctionTool
+from .github_client import GitHubClient, get_client
+
+# Repository listing for the authenticated user.
+#
+# iter_repositories() walks /user/repos with per_page=100: the first page's Link
+# header gives the page count, the remaining pages are fetched concurrently and
+# yielded in order as they arrive. Every page is a conditional GET, so
+# re-walking an unchanged account costs only 304s.
+#
+# The full names are kept in an in-memory index (per token). The tools answer
+# from it while it is younger than GITHUB_REPO_CACHE_TTL seconds, revalidate it
+# after that, and create / delete update it directly, so "do I already have
+# repo X?" rarely needs a listing at all.
+#
+# Env: GITHUB_LIST_CONCURRENCY (default 8), GITHUB_REPO_CACHE_TTL (default 300).
+
+PER_PAGE = 100
+_LAST_PAGE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+def _last_page(link_header: Optional[str]) -> int:
+    match = _LAST_PAGE.search(link_header or "")
+    return int(match.group(1)) if match else 1
+
+
+def iter_repositories(client: GitHubClient, concurrency: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the pages of /user/repos in order; pages after the first are fetched concurrently."""
+    if concurrency is None:
+        concurrency = int(os.getenv("GITHUB_LIST_CONCURRENCY", "8"))
+    params = {"per_page": PER_PAGE, "sort": "full_name"}
+    first, headers = client.get("/user/repos", {**params, "page": 1})
+    yield first
+    last = _last_page(headers.get("Link"))
+    if last <= 1:
+        return
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        futures = [pool.submit(client.get_json, "/user/repos", {**params, "page": page}) for page in range(2, last + 1)]
+        for future in futures:
+            yield future.result()
+    finally:
+        # a caller that stops early does not wait for the remaining pages
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class RepoIndex:
+    """Full names of the user's repositories, refreshed at most every `ttl` seconds."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._names: Dict[str, List[str]] = {}  # token key -> full names
+        self._fetched_at: Dict[str, float] = {}
+
+    @property
+    def ttl(self) -> float:
+        # read per use: the shared index exists before .env is loaded
+        return self._ttl if self._ttl is not None else float(os.getenv("GITHUB_REPO_CACHE_TTL", "300"))
+
+    def _fresh(self, key: str) -> bool:
+        return key in self._names and time.monotonic() - self._fetched_at[key] < self.ttl
+
+    def refresh(self, client: GitHubClient, stop_at: Optional[str] = None) -> List[str]:
+        """
+        Re-list the repositories. With `stop_at` (a full name), stop at the page
+        containing it; the partial listing is then not stored.
+        """
+        names: List[str] = []
+        for page in iter_repositories(client):
+            page_names = [repo["full_name"] for repo in page]
+            names.extend(page_names)
+            if stop_at and stop_at.lower() in (name.lower() for name in page_names):
+                return names
+        with self._lock:
+            key = client.token_key()
+            self._names[key] = names
+            self._fetched_at[key] = time.monotonic()
+        return names
+
+    def names(self, client: GitHubClient, refresh: bool = False) -> List[str]:
+        key = client.token_key()
+        with self._lock:
+            if not refresh and self._fresh(key):
+                return list(self._names[key])
+        return self.refresh(client)
+
+    def contains(self, client: GitHubClient, full_name: str) -> bool:
+        key = client.token_key()
+        with self._lock:
+            if self._fresh(key):
+                return full_name.lower() in (name.lower() for name in self._names[key])
+        return full_name.lower() in (name.lower() for name in self.refresh(client, stop_at=full_name))
+
+    def add(self, client: GitHubClient, full_name: str) -> None:
+        with self._lock:
+            names = self._names.get(client.token_key())
+            if names is not None and full_name not in names:
+                names.append(full_name)
+
+    def discard(self, client: GitHubClient, full_name: str) -> None:
+        with self._lock:
+            names = self._names.get(client.token_key())
+            if names is not None:
+                names[:] = [name for name in names if name.lower() != full_name.lower()]
+
+
+repo_index = RepoIndex()
+
+
+def list_repositories_tool(query: str = "", limit: int = 100, refresh: bool = False) -> dict:
+    """
+    Lists the repositories of the authenticated user.
+
+    Args:
+        query: Only repositories whose name contains this text (case-insensitive)
+        limit: Maximum number of names to return
+        refresh: Re-list from GitHub even if the cached listing is recent
+
+    Returns:
+        dict - total number of matches and up to `limit` full names (owner/name)
+    """
+    names = repo_index.names(get_client(), refresh=refresh)
+    matches = [name for name in names if query.lower() in name.lower()]
+    return {"total": len(matches), "repositories": matches[:limit]}
+
+
+def repository_exists_tool(name: str) -> bool:
+    """
+    Checks whether the authenticated user already has a repository with this name.
+
+    Args:
+        name: The repository name (without the owner)
+
+    Returns:
+        bool - True if the repository exists
+    """
+    client = get_client()
+    return repo_index.contains(client, f"{client.login()}/{name}")
+
+
+list_repositories_tool = FunctionTool(list_repositories_tool)
+repository_exists_tool = FunctionTool(repository_exists_tool)
@@ -1,83 +1,82 @@
 
+import functools
 import os
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
 
-import requests
 from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 from google.genai import types
 
+from .audio_cache import audio_key, get_audio_cache
+from .reddit_client import fetch_top_posts
+from .tts import AudioSink, stream_file, synthesize_long_text
 
-load_dotenv()
+# Agents and tools are built on first access of root_agent (see __getattr__ at
+# the bottom). .env is loaded once, by load_env(), when the root agent is built
+# or a tool is first called directly; the TTS key is read per call.
 
-ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
-ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")  # must be a valid ElevenLabs voice_id
 
+@functools.lru_cache(maxsize=None)
+def load_env() -> None:
+    load_dotenv()
 
-def get_top_posts(subreddits: List[str], limit: int = 5) -> Dict[str, List[Dict[str, str]]]:
+
+def get_top_posts(subreddits: List[str], limit: int = 5) -> Dict[str, Any]:
     """
     For each subreddit in `subreddits`, return up to `limit` top posts of the day.
-    Returns a dict: {subreddit_name: [{title, link}, ...], ...}
+    Returns a dict: {"posts": {subreddit_name: [{title, link}, ...]}, "errors": {subreddit_name: reason}}
+    Subreddits that could not be fetched are left out of "posts" and listed under "errors".
+
+    Subreddits are fetched concurrently over a shared connection pool (see reddit_client.py).
     """
-    results: Dict[str, List[Dict[str, str]]] = {}
-    headers = {"User-Agent": "my-simple-script/0.1 by your_name"}
-
-    for subreddit in subreddits:
-        url = f"https://www.reddit.com/r/{subreddit}/top.json"
-        params = {"t": "day", "limit": limit}
-        resp = requests.get(url, params=params, headers=headers)
-        resp.raise_for_status()
-        data = resp.json()
-
-        posts: List[Dict[str, str]] = []
-        for child in data.get("data", {}).get("children", []):
-            post_data = child.get("data", {})
-            title = post_data.get("title", "")
-            link = "https://www.reddit.com" + post_data.get("permalink", "")
-            posts.append({"title": title, "link": link})
-        results[subreddit] = posts
-
-    return results
-
-
-get_top_posts_tool = FunctionTool(get_top_posts)
-
-
-reddit_fetcher_agent = Agent(
-    name="reddit_fetcher_agent",
-    description="Fetches top Reddit posts from specified subreddits.",
-    model="gemini-2.0-flash",
-    instruction=(
-        "You are a Reddit data fetcher. "
-        "When asked to fetch Reddit posts, use the get_top_posts tool to retrieve the top posts "
-        "from the specified subreddits. Return the results in a clear, organized format."
-    ),
-    tools=[get_top_posts_tool],
-)
-
-
-summarizer_agent = Agent(
-    name="newscaster_summarizer_agent",
-    description="Summarizes a list of Reddit post titles in a newscaster style.",
-    model="gemini-2.0-flash",
-    instruction=(
-        "You are a news anchor summarizing Reddit headlines. "
-        "Given a list of post titles, provide a concise, engaging summary in a professional newscaster style. "
-        "Highlight key themes or interesting points found only in the titles. "
-        "Start with an anchor intro like 'Here are today's top stories from the subreddit...' or similar. "
-        "Refer to subreddits by name, no need to mention 'r/'."
-    ),
-    tools=[],
-)
-
-
-def text_to_speech_will(text: str) -> str:
+    load_env()
+    return fetch_top_posts(subreddits, limit)
+
+
+def build_reddit_fetcher_agent() -> Agent:
+    return Agent(
+        name="reddit_fetcher_agent",
+        description="Fetches top Reddit posts from specified subreddits.",
+        model="gemini-2.0-flash",
+        instruction=(
+            "You are a Reddit data fetcher. "
+            "When asked to fetch Reddit posts, use the get_top_posts tool to retrieve the top posts "
+            "from the specified subreddits. Return the results in a clear, organized format. "
+            "If the result's 'errors' is not empty, mention which subreddits could not be fetched."
+        ),
+        tools=[FunctionTool(get_top_posts)],
+    )
+
+
+def build_summarizer_agent() -> Agent:
+    return Agent(
+        name="newscaster_summarizer_agent",
+        description="Summarizes a list of Reddit post titles in a newscaster style.",
+        model="gemini-2.0-flash",
+        instruction=(
+            "You are a news anchor summarizing Reddit headlines. "
+            "Given a list of post titles, provide a concise, engaging summary in a professional newscaster style. "
+            "Highlight key themes or interesting points found only in the titles. "
+            "Start with an anchor intro like 'Here are today's top stories from the subreddit...' or similar. "
+            "Refer to subreddits by name, no need to mention 'r/'."
+        ),
+        tools=[],
+    )
+
+
+def text_to_speech_will(text: str, sink: Optional[AudioSink] = None) -> str:
     """
     Convert text to speech using ElevenLabs.
     Returns the local file path of the generated audio.
+
+    `sink` (direct callers only, e.g. a player) receives the MP3 bytes in order
+    while they are produced, segment by segment for long text; a cached result
+    is replayed into it.
     """
 
+    load_env()
+    ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
     ELEVENLABS_VOICE_ID = "weA4Q36twV5kwSaTEL0Q"
     if not ELEVENLABS_API_KEY:
         raise RuntimeError("ELEVENLABS_API_KEY is not set")
@@ -86,66 +85,95 @@ def text_to_speech_will(text: str) -> str:
 
     voice_id = ELEVENLABS_VOICE_ID  # must be a valid ElevenLabs voice_id, not the display name
     model_id = "eleven_multilingual_v2"
-    output_path = "output_will_tts.mp3"
-
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-    headers = {
-        "xi-api-key": ELEVENLABS_API_KEY,
-        "Accept": "audio/mpeg",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "text": text,
-        "model_id": model_id,
-    }
-
-    resp = requests.post(url, json=payload, headers=headers)
-    resp.raise_for_status()
-
-    with open(output_path, "wb") as f:
-        f.write(resp.content)
-
-    return output_path
-
-
-tts_tool = FunctionTool(text_to_speech_will)
-
-
-tts_agent = Agent(
-    name="tts_speaker_agent",
-    description="Converts provided text into speech using ElevenLabs TTS.",
-    instruction=(
-        "You are a Text-to-Speech agent. Convert user text to speech audio files.\n\n"
-        "IMPORTANT FORMATTING RULES:\n"
-        "1. Always use the text_to_speech_will tool (voice 'Will').\n"
-        "2. When the tool returns a file path, format your response like this example:\n"
-        "   \"I've converted your text to speech. The audio file is saved at `/path/to/file.mp3`\"\n"
-        "3. Put ONLY the file path inside backticks (`), not any additional text.\n"
-        "4. Never modify or abbreviate the path.\n\n"
-        "This exact format is critical for proper processing."
-    ),
-    model="gemini-2.0-flash",
-    tools=[tts_tool],
-    generate_content_config=types.GenerateContentConfig(
-        temperature=0.2,
-        max_output_tokens=250,
-    ),
-)
-
-
-root_agent = Agent(
-    name="redit_summarizer_texttospeech",
-    model="gemini-2.0-flash",
-    description="Fetches Reddit posts, summarizes them, and can convert summaries to speech.",
-    instruction=(
-        "You are a helpful assistant that can fetch Reddit posts and summarize them. "
-        "Use the reddit_fetcher_agent to get posts, then use the summarizer_agent to create summaries. "
-        "When audio is requested, delegate to tts_speaker_agent."
-    ),
-    tools=[],
-    sub_agents=[reddit_fetcher_agent, summarizer_agent, tts_agent],
-    generate_content_config=types.GenerateContentConfig(
-        temperature=0.2,
-        max_output_tokens=2050,
-    ),
-)
\ No newline at end of file
+
+    # Identical (text, voice, model) requests reuse the stored file; new audio is
+    # synthesized segment by segment in parallel (segments are cached too), then
+    # stitched into a temp file and atomically renamed into the cache.
+    cache = get_audio_cache()
+    key = audio_key(text, voice_id, model_id)
+    synthesized = []
+
+    def create(tmp_path: str) -> None:
+        synthesized.append(tmp_path)
+        synthesize_long_text(text, tmp_path, voice_id, ELEVENLABS_API_KEY, model_id=model_id, cache=cache, sink=sink)
+
+    with cache.pinned([key]):
+        path = cache.get_or_create(key, create)
+        if sink and not synthesized:
+            stream_file(path, sink)
+    return path
+
+
+def _text_to_speech_tool(text: str) -> str:
+    """
+    Convert text to speech using ElevenLabs.
+    Returns the local file path of the generated audio.
+    """
+    return text_to_speech_will(text)
+
+
+# the model sees the tool as text_to_speech_will; the sink is not a tool argument
+_text_to_speech_tool.__name__ = "text_to_speech_will"
+
+
+
+def build_tts_agent() -> Agent:
+    return Agent(
+        name="tts_speaker_agent",
+        description="Converts provided text into speech using ElevenLabs TTS.",
+        instruction=(
+            "You are a Text-to-Speech agent. Convert user text to speech audio files.\n\n"
+            "IMPORTANT FORMATTING RULES:\n"
+            "1. Always use the text_to_speech_will tool (voice 'Will').\n"
+            "2. When the tool returns a file path, format your response like this example:\n"
+            "   \"I've converted your text to speech. The audio file is saved at `/path/to/file.mp3`\"\n"
+            "3. Put ONLY the file path inside backticks (`), not any additional text.\n"
+            "4. Never modify or abbreviate the path.\n\n"
+            "This exact format is critical for proper processing."
+        ),
+        model="gemini-2.0-flash",
+        tools=[FunctionTool(_text_to_speech_tool)],
+        generate_content_config=types.GenerateContentConfig(
+            temperature=0.2,
+            max_output_tokens=250,
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def build_root_agent() -> Agent:
+    load_env()
+    return Agent(
+        name="redit_summarizer_texttospeech",
+        model="gemini-2.0-flash",
+        description="Fetches Reddit posts, summarizes them, and can convert summaries to speech.",
+        instruction=(
+            "You are a helpful assistant that can fetch Reddit posts and summarize them. "
+            "Use the reddit_fetcher_agent to get posts, then use the summarizer_agent to create summaries. "
+            "When audio is requested, delegate to tts_speaker_agent."
+        ),
+        tools=[],
+        sub_agents=[build_reddit_fetcher_agent(), build_summarizer_agent(), build_tts_agent()],
+        generate_content_config=types.GenerateContentConfig(
+            temperature=0.2,
+            max_output_tokens=2050,
+        ),
+    )
+
+
+# module attribute -> object inside the (single) built agent tree
+_LAZY_ATTRIBUTES = {
+    "root_agent": lambda root: root,
+    "reddit_fetcher_agent": lambda root: root.find_sub_agent("reddit_fetcher_agent"),
+    "summarizer_agent": lambda root: root.find_sub_agent("newscaster_summarizer_agent"),
+    "tts_agent": lambda root: root.find_sub_agent("tts_speaker_agent"),
+    "get_top_posts_tool": lambda root: root.find_sub_agent("reddit_fetcher_agent").tools[0],
+    "tts_tool": lambda root: root.find_sub_agent("tts_speaker_agent").tools[0],
+}
+
+
+def __getattr__(name):
+    # ADK web reads agent.root_agent; the tree is built on that first access
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name](build_root_agent())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
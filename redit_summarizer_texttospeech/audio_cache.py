@@ -0,0 +1,152 @@
+# audio_cache.py
+#
+# Content-addressed store for synthesized audio.
+# Files are named by sha256(text, voice_id, model_id), so identical requests map
+# to the same file and different requests never collide. New audio is written to
+# a temp file in the cache directory and renamed into place (atomic), and the
+# directory is kept under `max_bytes` by evicting the least recently used files.
+# Files a caller is still reading can be pinned, and eviction skips them.
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+
+DEFAULT_CACHE_DIR = "tts_cache"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+AUDIO_SUFFIX = ".mp3"
+
+
+def audio_key(text: str, voice_id: str, model_id: str) -> str:
+    raw = json.dumps([text, voice_id, model_id], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Args:
+        directory: Cache directory. Env: TTS_CACHE_DIR.
+        max_bytes: Size bound for all cached audio. Env: TTS_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        directory = directory or os.getenv("TTS_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("TTS_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._pins: Dict[str, int] = {}  # path -> number of holders
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + AUDIO_SUFFIX)
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @contextlib.contextmanager
+    def pinned(self, keys: Iterable[str]) -> Iterator[None]:
+        """Keep the files for `keys` from being evicted (by this process) inside the block."""
+        paths = [self.path_for(key) for key in keys]
+        with self._locks_guard:
+            for path in paths:
+                self._pins[path] = self._pins.get(path, 0) + 1
+        try:
+            yield
+        finally:
+            with self._locks_guard:
+                for path in paths:
+                    self._pins[path] -= 1
+                    if not self._pins[path]:
+                        del self._pins[path]
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached path and mark it as recently used, or None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # mtime doubles as last-access time for LRU
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_or_create(self, key: str, create: Callable[[str], None]) -> str:
+        """
+        Return the cached file for `key`, calling `create(tmp_path)` to produce it on a miss.
+        Concurrent callers for the same key in this process wait for a single `create`.
+        """
+        path = self.lookup(key)
+        if path:
+            self.hits += 1
+            return path
+
+        with self._key_lock(key):
+            path = self.lookup(key)
+            if path:
+                self.hits += 1
+                return path
+
+            self.misses += 1
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+            os.close(fd)
+            try:
+                create(tmp_path)
+                path = self.path_for(key)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Delete least recently used files until the cache fits in `max_bytes`."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(AUDIO_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with self._locks_guard:  # checked and removed together, see pinned()
+                if path == keep or path in self._pins:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+
+_default_cache: Optional[AudioCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    """Process-wide cache, created on first use so importing doesn't touch the disk."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AudioCache()
+    return _default_cache
@@ -0,0 +1,104 @@
+# benchmark.py
+#
+# Local benchmark for the Reddit fetch engine. Starts a stub HTTP server that
+# serves fake /r/{sub}/top.json listings with injected latency, then compares
+# the old serial `requests.get` loop with the concurrent pooled client.
+#
+# Run:
+#   python -m redit_summarizer_texttospeech.benchmark --subreddits 20 --latency 0.2
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import requests
+
+from .rate_limiter import RateLimitScheduler
+from .reddit_client import RedditClient, fetch_top_posts, parse_listing
+
+
+class _StubRedditHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    latency = 0.2
+    jitter = 0.05
+
+    def do_GET(self):
+        subreddit = self.path.split("/")[2] if self.path.startswith("/r/") else "unknown"
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        children = [
+            {"data": {"title": f"{subreddit} post {i}", "permalink": f"/r/{subreddit}/comments/{i}/"}}
+            for i in range(5)
+        ]
+        body = json.dumps({"data": {"children": children}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float = 0.2, jitter: float = 0.05) -> ThreadingHTTPServer:
+    """Start the stub server on a free localhost port in a daemon thread."""
+    handler = type("Handler", (_StubRedditHandler,), {"latency": latency, "jitter": jitter})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def serial_fetch(base_url: str, subreddits: List[str], limit: int = 5):
+    """The original get_top_posts loop: one blocking request per subreddit, no session."""
+    results = {}
+    headers = {"User-Agent": "benchmark"}
+    for subreddit in subreddits:
+        resp = requests.get(f"{base_url}/r/{subreddit}/top.json", params={"t": "day", "limit": limit}, headers=headers)
+        resp.raise_for_status()
+        results[subreddit] = parse_listing(resp.json())
+    return results
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Reddit fetch engine against a local stub.")
+    parser.add_argument("--subreddits", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="Injected per-request latency (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    subreddits = [f"sub{i}" for i in range(args.subreddits)]
+    # The stub has no rate limit, so open the client-side throttle all the way.
+    unthrottled = RateLimitScheduler(rate=1000, burst=1000)
+    client = RedditClient(base_url=base_url, max_concurrency=args.concurrency, use_cache=False, scheduler=unthrottled)
+    cached_client = RedditClient(base_url=base_url, max_concurrency=args.concurrency, scheduler=unthrottled)
+
+    print(f"{args.subreddits} subreddits, {args.latency:.3f}s latency, concurrency={args.concurrency}")
+    for round_no in range(1, args.rounds + 1):
+        serial = _timed(serial_fetch, base_url, subreddits)
+        pooled = _timed(fetch_top_posts, subreddits, 5, client)
+        cached = _timed(fetch_top_posts, subreddits, 5, cached_client)
+        print(
+            f"round {round_no}: serial {serial:.3f}s | concurrent {pooled:.3f}s "
+            f"| speedup {serial / pooled:.1f}x | cached {cached:.4f}s"
+        )
+    print(f"cache stats: {cached_client.cache.stats.as_dict()}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
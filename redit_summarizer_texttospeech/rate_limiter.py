@@ -0,0 +1,171 @@
+# rate_limiter.py
+#
+# Shared request scheduler for Reddit. Every request made by RedditClient goes
+# through RateLimitScheduler.send(), which:
+# - waits on a token bucket (client-side throttle),
+# - tightens the bucket from X-Ratelimit-Remaining / X-Ratelimit-Reset,
+# - on 429 pauses *all* callers until the server's reset, then retries,
+# - retries 5xx / transport errors with jittered exponential backoff.
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+import httpx
+
+
+DEFAULT_RATE = 1.0  # sustained requests per second
+DEFAULT_BURST = 30  # a whole digest can go out at once
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 60.0
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BASE_DELAY, cap: float = DEFAULT_MAX_DELAY) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Async token bucket. `acquire()` waits until a token is available."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # Holding the lock while sleeping keeps waiters roughly FIFO.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (e.g. until the server's window resets)."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Never hold more tokens than the server says we have left in this window."""
+        remaining = _header_float(headers, "X-Ratelimit-Remaining")
+        if remaining is None:
+            return
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+        reset = _header_float(headers, "X-Ratelimit-Reset")
+        if remaining < 1 and reset:
+            self.block_for(reset)
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    throttled: int = 0  # 429 responses
+    retries: int = 0
+    failures: int = 0  # gave up after max_retries
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class RateLimitScheduler:
+    """
+    Runs requests through a shared token bucket with 429-aware retries.
+
+    Args:
+        rate: Sustained requests per second. Env: REDDIT_RATE.
+        burst: Bucket capacity. Env: REDDIT_BURST.
+        max_retries: Retries per request for 429 / 5xx / transport errors.
+        base_delay, max_delay: Backoff parameters in seconds.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        if rate is None:
+            rate = float(os.getenv("REDDIT_RATE", DEFAULT_RATE))
+        if burst is None:
+            burst = float(os.getenv("REDDIT_BURST", DEFAULT_BURST))
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = SchedulerStats()
+
+    def _retry_delay(self, resp: Optional[httpx.Response], attempt: int) -> float:
+        if resp is not None:
+            server_delay = _header_float(resp.headers, "Retry-After")
+            if server_delay is None:
+                server_delay = _header_float(resp.headers, "X-Ratelimit-Reset")
+            if server_delay is not None:
+                # jitter so the waiting callers don't all retry on the same tick
+                return min(self.max_delay, server_delay) + random.uniform(0, self.base_delay)
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
+
+    async def send(self, request_fn: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Call `request_fn` under the rate limit, retrying throttled / failed attempts.
+        Returns the last response (caller decides on raise_for_status) or re-raises
+        the last transport error.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.stats.requests += 1
+            try:
+                resp = await request_fn()
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    self.stats.failures += 1
+                    raise
+                self.stats.retries += 1
+                await asyncio.sleep(self._retry_delay(None, attempt))
+                continue
+
+            self.bucket.update_from_headers(resp.headers)
+            if resp.status_code != 429 and resp.status_code < 500:
+                return resp
+            if attempt == self.max_retries:
+                self.stats.failures += 1
+                return resp
+
+            self.stats.retries += 1
+            delay = self._retry_delay(resp, attempt)
+            if resp.status_code == 429:
+                # Throttling is global: pause every caller, not just this one.
+                self.stats.throttled += 1
+                self.bucket.block_for(delay)
+            else:
+                await asyncio.sleep(delay)
@@ -0,0 +1,206 @@
+# reddit_cache.py
+#
+# Pluggable cache for Reddit top-post listings, consulted by RedditClient.
+# - MemoryCache: in-process LRU.
+# - SQLiteCache: on-disk, survives restarts and is shared between workers.
+# Entries younger than the TTL are served directly. Older entries that carry an
+# ETag / Last-Modified are revalidated with a conditional GET (304 -> reuse).
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+DEFAULT_TTL = 300.0  # seconds; the daily-top list changes slowly
+DEFAULT_MAX_ENTRIES = 512
+
+
+def cache_key(subreddit: str, limit: int, time_window: str = "day") -> str:
+    """Subreddit names are case-insensitive on Reddit, so normalize them."""
+    return f"{subreddit.lower()}|{limit}|{time_window}"
+
+
+@dataclass
+class CacheEntry:
+    posts: List[Dict[str, str]]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0  # stale entry confirmed by a 304
+    stores: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class ListingCache(ABC):
+    """Base class: subclasses implement clear/_load/_save/_evict. TTL logic lives here."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Return the stored entry (fresh or stale) or None. Does not touch the counters."""
+        with self._lock:
+            return self._load(key)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age() < self.ttl
+
+    def store(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._save(key, entry)
+            self.stats.stores += 1
+            self.stats.evictions += self._evict()
+
+    def record_hit(self) -> None:
+        self.stats.hits += 1
+
+    def record_miss(self) -> None:
+        self.stats.misses += 1
+
+    def record_revalidated(self) -> None:
+        self.stats.revalidated += 1
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        """The entry stored under `key`, or None."""
+
+    @abstractmethod
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        """Store `entry` under `key`, replacing any previous one."""
+
+    @abstractmethod
+    def _evict(self) -> int:
+        """Enforce `max_entries`; returns the number of entries removed."""
+
+
+class MemoryCache(ListingCache):
+    """In-memory LRU cache bounded by `max_entries`."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__(ttl, max_entries)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+    def _evict(self) -> int:
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(ListingCache):
+    """On-disk cache in a single SQLite file, LRU by last access."""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__(ttl, max_entries)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS listings (
+                key TEXT PRIMARY KEY,
+                posts TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            "SELECT posts, etag, last_modified, stored_at FROM listings WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE listings SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        posts, etag, last_modified, stored_at = row
+        return CacheEntry(json.loads(posts), etag, last_modified, stored_at)
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(entry.posts), entry.etag, entry.last_modified, entry.stored_at, time.time()),
+        )
+        self._conn.commit()
+
+    def _evict(self) -> int:
+        cursor = self._conn.execute(
+            """DELETE FROM listings WHERE key IN (
+                SELECT key FROM listings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,),
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM listings")
+            self._conn.commit()
+
+
+def cache_from_env() -> ListingCache:
+    """
+    Build the default cache from env settings:
+        REDDIT_CACHE_TTL   - TTL in seconds (0 disables serving without revalidation)
+        REDDIT_CACHE_PATH  - if set, use an SQLite file at this path instead of memory
+        REDDIT_CACHE_MAX_ENTRIES
+    """
+    ttl = float(os.getenv("REDDIT_CACHE_TTL", DEFAULT_TTL))
+    max_entries = int(os.getenv("REDDIT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    path = os.getenv("REDDIT_CACHE_PATH")
+    if path:
+        return SQLiteCache(path, ttl=ttl, max_entries=max_entries)
+    return MemoryCache(ttl=ttl, max_entries=max_entries)
@@ -0,0 +1,229 @@
+# reddit_client.py
+#
+# Async fetch engine behind `get_top_posts`.
+# All subreddits are fetched concurrently over one pooled httpx.AsyncClient
+# (keep-alive connections are reused across tool calls). The client lives on a
+# dedicated background event loop, so the sync `fetch_top_posts` wrapper works
+# both from plain scripts and from inside ADK's running event loop.
+# Listings are served from / revalidated against a ListingCache (reddit_cache.py),
+# and every network request goes through a RateLimitScheduler (rate_limiter.py).
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .rate_limiter import RateLimitScheduler
+from .reddit_cache import CacheEntry, ListingCache, cache_from_env, cache_key
+
+
+REDDIT_BASE_URL = "https://www.reddit.com"
+USER_AGENT = "my-simple-script/0.1 by your_name"
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 10.0  # seconds, per request
+
+
+def parse_listing(data: dict) -> List[Dict[str, str]]:
+    """Turn a Reddit listing JSON payload into [{title, link}, ...]."""
+    posts: List[Dict[str, str]] = []
+    for child in data.get("data", {}).get("children", []):
+        post_data = child.get("data", {})
+        title = post_data.get("title", "")
+        link = "https://www.reddit.com" + post_data.get("permalink", "")
+        posts.append({"title": title, "link": link})
+    return posts
+
+
+def _copy_posts(posts: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    # callers get their own lists, so editing a result cannot change the cache
+    return [dict(post) for post in posts]
+
+
+class RedditClient:
+    """
+    Fetches top posts for many subreddits concurrently.
+
+    Args:
+        base_url: Reddit host (overridable for local stub servers). Env: REDDIT_BASE_URL.
+        max_concurrency: Maximum number of in-flight requests (and pooled connections).
+            Env: REDDIT_MAX_CONCURRENCY.
+        timeout: Per-request timeout in seconds. Env: REDDIT_TIMEOUT.
+        cache: Listing cache; defaults to `cache_from_env()`.
+        use_cache: Set to False to always hit the network.
+        scheduler: Rate-limit scheduler shared by all requests of this client.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[ListingCache] = None,
+        use_cache: bool = True,
+        scheduler: Optional[RateLimitScheduler] = None,
+    ):
+        base_url = base_url or os.getenv("REDDIT_BASE_URL", REDDIT_BASE_URL)
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("REDDIT_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        if timeout is None:
+            timeout = float(os.getenv("REDDIT_TIMEOUT", DEFAULT_TIMEOUT))
+
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.cache = (cache or cache_from_env()) if use_cache else None
+        self.scheduler = scheduler or RateLimitScheduler()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    async def fetch_subreddit(
+        self, subreddit: str, limit: int = 5, time_window: str = "day"
+    ) -> List[Dict[str, str]]:
+        """Fetch the top posts for a single subreddit, going through the cache."""
+        key = cache_key(subreddit, limit, time_window)
+        entry = self.cache.lookup(key) if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record_hit()
+            return _copy_posts(entry.posts)
+
+        params = {"t": time_window, "limit": limit}
+        headers = entry.validators() if entry is not None else {}
+        client = self._get_client()
+        resp = await self.scheduler.send(
+            lambda: client.get(f"/r/{subreddit}/top.json", params=params, headers=headers)
+        )
+
+        if resp.status_code == 304 and entry is not None:
+            self.cache.record_revalidated()
+            entry.stored_at = time.time()
+            self.cache.store(key, entry)
+            return _copy_posts(entry.posts)
+
+        resp.raise_for_status()
+        posts = parse_listing(resp.json())
+        if self.cache is not None:
+            self.cache.record_miss()
+            self.cache.store(
+                key,
+                CacheEntry(
+                    _copy_posts(posts),
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                ),
+            )
+        return posts
+
+    async def fetch_top_posts(self, subreddits: List[str], limit: int = 5) -> Dict[str, Any]:
+        """
+        Fetch all subreddits concurrently, capped at `max_concurrency` in flight.
+
+        Returns {"posts": {subreddit: [{title, link}, ...]}, "errors": {subreddit: reason}}.
+        A subreddit that still fails after the scheduler's retries does not fail the
+        whole call: it is left out of "posts" and reported under "errors".
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_one(subreddit: str):
+            async with semaphore:
+                try:
+                    return subreddit, await self.fetch_subreddit(subreddit, limit), None
+                except httpx.HTTPStatusError as e:
+                    return subreddit, None, f"HTTP {e.response.status_code}"
+                except httpx.HTTPError as e:
+                    return subreddit, None, f"{type(e).__name__}: {e}"
+                except ValueError as e:
+                    # a 200 with a non-JSON body, e.g. Reddit's HTML block page
+                    return subreddit, None, f"invalid JSON: {e}"
+
+        # dict.fromkeys drops duplicates while keeping the caller's order
+        outcomes = await asyncio.gather(*(fetch_one(s) for s in dict.fromkeys(subreddits)))
+
+        results: Dict[str, List[Dict[str, str]]] = {}
+        errors: Dict[str, str] = {}
+        for subreddit, posts, error in outcomes:
+            if error is None:
+                results[subreddit] = posts
+            else:
+                errors[subreddit] = error
+        return {"posts": results, "errors": errors}
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# -----------------------------
+# Background loop + sync wrapper
+# -----------------------------
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_default_client: Optional[RedditClient] = None
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever, name="reddit-fetch-loop", daemon=True
+            )
+            thread.start()
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared background loop and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def get_default_client() -> RedditClient:
+    global _default_client
+    with _loop_lock:
+        if _default_client is None:
+            _default_client = RedditClient()
+    return _default_client
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss counters of the default client's cache."""
+    cache = get_default_client().cache
+    return cache.stats.as_dict() if cache else {}
+
+
+def scheduler_stats() -> Dict[str, int]:
+    """Request/throttle/retry counters of the default client's scheduler."""
+    return get_default_client().scheduler.stats.as_dict()
+
+
+async def fetch_top_posts_async(
+    subreddits: List[str], limit: int = 5, client: Optional[RedditClient] = None
+) -> Dict[str, Any]:
+    """Async entry point. Must be awaited on the loop that owns `client`."""
+    client = client or get_default_client()
+    return await client.fetch_top_posts(subreddits, limit)
+
+
+def fetch_top_posts(
+    subreddits: List[str], limit: int = 5, client: Optional[RedditClient] = None
+) -> Dict[str, Any]:
+    """Sync wrapper around `fetch_top_posts_async` using the shared background loop."""
+    return run_sync(fetch_top_posts_async(subreddits, limit, client))
@@ -0,0 +1,223 @@
+# tts.py
+#
+# ElevenLabs text-to-speech client used by `text_to_speech_will`.
+# In streaming mode the /stream endpoint is used and the MP3 is written to disk
+# chunk by chunk as it arrives, so memory stays flat and the file is playable
+# before synthesis finishes. Chunks can also be handed to a caller-supplied sink.
+#
+# Long text is split at paragraph/sentence boundaries and the segments are
+# synthesized concurrently (each one cached in the AudioCache). Each segment's
+# MP3 frames are appended to the output (and handed to the sink) as soon as it
+# and every segment before it are done, so playback can start after the first.
+
+import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .audio_cache import AudioCache, audio_key
+
+
+ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"
+DEFAULT_MODEL_ID = "eleven_multilingual_v2"
+CHUNK_SIZE = 16 * 1024
+DEFAULT_TIMEOUT = 60.0  # seconds between bytes, not total
+DEFAULT_SEGMENT_CHARS = 800
+DEFAULT_MAX_WORKERS = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+AudioSink = Callable[[bytes], None]
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session for all ElevenLabs calls."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            _session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return _session
+
+
+def synthesize_speech(
+    text: str,
+    output_path: str,
+    voice_id: str,
+    api_key: str,
+    model_id: str = DEFAULT_MODEL_ID,
+    stream: bool = True,
+    sink: Optional[AudioSink] = None,
+    base_url: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> str:
+    """
+    Synthesize `text` with ElevenLabs and write the MP3 to `output_path`.
+
+    Args:
+        stream: Use the streaming endpoint and write chunks as they arrive.
+            When False, the whole response is buffered before writing.
+        sink: Optional callable receiving each audio chunk (e.g. a player or socket).
+        base_url: API host, overridable for local stubs. Env: ELEVENLABS_BASE_URL.
+
+    Returns:
+        The output path.
+    """
+    base_url = base_url or os.getenv("ELEVENLABS_BASE_URL", ELEVENLABS_BASE_URL)
+    url = f"{base_url.rstrip('/')}/v1/text-to-speech/{voice_id}"
+    if stream:
+        url += "/stream"
+    headers = {
+        "xi-api-key": api_key,
+        "Accept": "audio/mpeg",
+        "Content-Type": "application/json",
+    }
+    payload = {
+        "text": text,
+        "model_id": model_id,
+    }
+
+    with get_session().post(url, json=payload, headers=headers, stream=stream, timeout=timeout) as resp:
+        resp.raise_for_status()
+        with open(output_path, "wb") as f:
+            if not stream:
+                f.write(resp.content)
+                if sink:
+                    sink(resp.content)
+                return output_path
+
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                if not chunk:
+                    continue
+                f.write(chunk)
+                f.flush()  # make the partial file readable by a player right away
+                if sink:
+                    sink(chunk)
+
+    return output_path
+
+
+# -----------------------------
+# Segmented (parallel) synthesis
+# -----------------------------
+
+def split_text(text: str, max_chars: int = DEFAULT_SEGMENT_CHARS) -> List[str]:
+    """
+    Split text into segments of at most ~`max_chars`, breaking at paragraph
+    boundaries first and sentence boundaries second. A single sentence longer
+    than `max_chars` is kept whole rather than cut mid-sentence.
+    """
+    segments: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        current = ""
+        for sentence in _SENTENCE_END.split(paragraph):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                segments.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            segments.append(current)
+    return segments
+
+
+def _strip_tags(data: bytes) -> bytes:
+    """Drop a leading ID3v2 tag and a trailing ID3v1 tag, leaving raw MPEG frames."""
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer:]
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+
+def _append_mp3(out, path: str, sink: Optional[AudioSink] = None) -> None:
+    with open(path, "rb") as f:
+        frames = _strip_tags(f.read())
+    out.write(frames)
+    out.flush()
+    if sink:
+        sink(frames)
+
+
+def stream_file(path: str, sink: AudioSink) -> None:
+    """Hand an existing audio file to `sink` chunk by chunk."""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sink(chunk)
+
+
+def synthesize_long_text(
+    text: str,
+    output_path: str,
+    voice_id: str,
+    api_key: str,
+    model_id: str = DEFAULT_MODEL_ID,
+    max_workers: Optional[int] = None,
+    segment_chars: Optional[int] = None,
+    cache: Optional[AudioCache] = None,
+    base_url: Optional[str] = None,
+    sink: Optional[AudioSink] = None,
+) -> str:
+    """
+    Synthesize `text` as independent segments in parallel and stitch them in order.
+
+    Args:
+        max_workers: Concurrent ElevenLabs requests. Env: TTS_MAX_WORKERS.
+        segment_chars: Target segment size in characters. Env: TTS_SEGMENT_CHARS.
+        cache: Segment-level audio cache; segments are written to a temp dir if None.
+        sink: Optional callable receiving the audio in order, one segment at a
+            time as soon as it and all earlier segments are synthesized.
+
+    Returns:
+        The output path.
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("TTS_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+    if segment_chars is None:
+        segment_chars = int(os.getenv("TTS_SEGMENT_CHARS", DEFAULT_SEGMENT_CHARS))
+
+    segments = split_text(text, segment_chars)
+    if len(segments) <= 1:
+        return synthesize_speech(text, output_path, voice_id, api_key, model_id, sink=sink, base_url=base_url)
+
+    tmp_dir = None
+    if cache is None:
+        tmp_dir = tempfile.mkdtemp(prefix="tts_segments_")
+        cache = AudioCache(tmp_dir, max_bytes=2 ** 62)
+
+    keys = [audio_key(segment, voice_id, model_id) for segment in segments]
+
+    def synthesize_segment(segment: str, key: str) -> str:
+        return cache.get_or_create(
+            key,
+            lambda tmp_path: synthesize_speech(segment, tmp_path, voice_id, api_key, model_id, base_url=base_url),
+        )
+
+    try:
+        # Segments stay pinned until they are appended, so another caller's
+        # eviction cannot delete one in between.
+        with cache.pinned(keys), ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="tts") as pool:
+            futures = [pool.submit(synthesize_segment, segment, key) for segment, key in zip(segments, keys)]
+            with open(output_path, "wb") as out:
+                # waiting in text order writes each segment once it and all earlier ones are done
+                for future in futures:
+                    _append_mp3(out, future.result(), sink)
+        return output_path
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,132 @@
+# tts_benchmark.py
+#
+# Local benchmark for the ElevenLabs TTS client. Starts a stub server that
+# waits `--latency` seconds per request, then serves a fake MP3 with chunked
+# transfer encoding: one chunk per sentence of input text, every `--interval`
+# seconds (so synthesis time grows with text length, like the real API).
+#
+# 1. Buffered vs streaming single request:
+#    time to first audio byte, total wall-clock, peak Python memory.
+# 2. Single request vs parallel segmented synthesis (cold and segment-cached).
+#
+# Run:
+#   python -m redit_summarizer_texttospeech.tts_benchmark --sentences 200 --interval 0.02 --workers 8
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .audio_cache import AudioCache
+from .tts import split_text, synthesize_long_text, synthesize_speech
+
+# One 128 kbps / 44.1 kHz MPEG-1 Layer III frame: header + silent payload.
+MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class _StubTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.3
+    interval = 0.02
+    frames_per_chunk = 40
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        sentences = max(1, len(split_text(body["text"], max_chars=1)))
+        time.sleep(self.latency)  # per-request overhead
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunk = MP3_FRAME * self.frames_per_chunk
+        for _ in range(sentences):
+            time.sleep(self.interval)  # synthesis time per sentence
+            self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float = 0.3, interval: float = 0.02) -> ThreadingHTTPServer:
+    """Start the stub TTS server on a free localhost port in a daemon thread."""
+    handler = type("Handler", (_StubTTSHandler,), {"latency": latency, "interval": interval})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_text(sentences: int) -> str:
+    """A fake multi-subreddit digest: one paragraph per 10 sentences."""
+    lines = [f"Story number {i} from today's digest has an interesting headline." for i in range(sentences)]
+    return "\n\n".join(" ".join(lines[i:i + 10]) for i in range(0, sentences, 10))
+
+
+def _measure(base_url: str, text: str, output_path: str, stream: bool):
+    first_byte = []
+    start = time.perf_counter()
+
+    def sink(chunk: bytes) -> None:
+        if not first_byte:
+            first_byte.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    synthesize_speech(text, output_path, "stub-voice", "stub-key", stream=stream, sink=sink, base_url=base_url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = time.perf_counter() - start
+    return first_byte[0], total, peak, os.path.getsize(output_path)
+
+
+def _timed(fn, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TTS client against a local stub.")
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3, help="Injected per-request latency (s)")
+    parser.add_argument("--interval", type=float, default=0.02, help="Synthesis time per sentence (s)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--segment-chars", type=int, default=800)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency, args.interval)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    text = make_text(args.sentences)
+    segments = len(split_text(text, args.segment_chars))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.sentences} sentences, {len(text)} chars, {args.latency}s/request + {args.interval}s/sentence")
+        for stream in (False, True):
+            label = "streaming" if stream else "buffered "
+            ttfb, total, peak, size = _measure(base_url, text, os.path.join(tmp, f"{label.strip()}.mp3"), stream)
+            print(
+                f"{label}: first audio {ttfb * 1000:7.1f} ms | total {total:.3f}s "
+                f"| peak mem {peak / 1024:8.1f} KiB | file {size / 1024:.0f} KiB"
+            )
+
+        single = _timed(synthesize_speech, text, os.path.join(tmp, "single.mp3"), "stub-voice", "stub-key", base_url=base_url)
+        cache = AudioCache(os.path.join(tmp, "segments"), max_bytes=2 ** 62)
+        parallel_args = (text, os.path.join(tmp, "parallel.mp3"), "stub-voice", "stub-key")
+        parallel_kwargs = dict(max_workers=args.workers, segment_chars=args.segment_chars, cache=cache, base_url=base_url)
+        cold = _timed(synthesize_long_text, *parallel_args, **parallel_kwargs)
+        warm = _timed(synthesize_long_text, *parallel_args, **parallel_kwargs)
+        print(
+            f"single request {single:.3f}s | parallel ({segments} segments, {args.workers} workers) {cold:.3f}s "
+            f"| speedup {single / cold:.1f}x | segment-cached {warm:.4f}s"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,27 +12,90 @@
 # response = run_agent(root_agent, user_message)
 
 import json
+import os
+import threading
 from google.adk.agents import Agent
-from google.adk.tools.agent_tool import AgentTool
 from google.adk.tools import FunctionTool
 from google.adk.agents import SequentialAgent
 import logging
 
+from .agent_runner import ValidatingAgentTool
+from .callbacks import chain_after_model, chain_before_model
+from .context_budget import context_budget_callback, prompt_token_callback
+from .model_router import default_model, route_model_callback
+from .output_validation import output_validation_callback
+from .parse_cache import parse_cache_callbacks
+from .schemas import JDProfile, JobFit, ResumeEnhancement, ResumeProfile
+from .skill_matcher import score_job_fit
+from .workflow import build_workflow_agent
 
-logging.basicConfig(level=logging.INFO)
 
-logging.info("Loading resume_jd_multi_agent agents...")
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Local tools
+# -----------------------------
+
+# Skill matching and numeric scores are computed locally; the model only writes prose.
+def _build_score_job_fit_tool() -> FunctionTool:
+    return FunctionTool(score_job_fit)
+
+# Parse results are memoized on disk (see parse_cache.py); a reply is only
+# cached if it is a JSON object with these keys.
+RESUME_PROFILE_KEYS = ("key_skills", "experience_highlights", "education", "weaknesses")
+JD_PROFILE_KEYS = ("role_title", "must_have_skills", "nice_to_have_skills")
+
+resume_parse_cache_before, resume_parse_cache_after = parse_cache_callbacks(RESUME_PROFILE_KEYS)
+jd_parse_cache_before, jd_parse_cache_after = parse_cache_callbacks(JD_PROFILE_KEYS)
+
+# Replies are validated against schemas.py and repaired locally (fences,
+# trailing commas, score ranges) before they reach output_key or the cache.
+validate_resume_profile = output_validation_callback(ResumeProfile)
+validate_jd_profile = output_validation_callback(JDProfile)
+validate_job_fit = output_validation_callback(JobFit)
+validate_resume_enhancement = output_validation_callback(ResumeEnhancement)
+
+# Downstream agents get only the fields they need, within a token budget
+# (see context_budget.py); every model call's prompt size is recorded.
+# Models are picked per call by the router (model_router.py): flash first,
+# escalating e.g. the enhancer to pro for large inputs or weak replies.
+budget_job_fit_context = context_budget_callback("job_fit_analyst_agent")
+budget_enhancer_context = context_budget_callback("analyze_resume_enhancer_agent")
+
+
+def skip_precomputed_scoring(callback_context, llm_request):
+    """
+    before_model_callback for job_fit_analyst_agent: when the input already
+    carries the score_job_fit result (`fit_scores`, see batch.py), the tool is
+    not offered, so the model writes the prose in a single call.
+    """
+    for content in llm_request.contents:
+        if content.role != "user":
+            continue
+        text = "".join(part.text or "" for part in content.parts or []).lstrip()
+        try:
+            # a retry appends a note after the JSON request
+            request, _ = json.JSONDecoder().raw_decode(text)
+        except ValueError:
+            return None
+        if isinstance(request, dict) and "fit_scores" in request and llm_request.config is not None:
+            llm_request.config.tools = None
+            llm_request.tools_dict.clear()
+        return None
+    return None
 
 # -----------------------------
 # Specialist agents
 # -----------------------------
 
-analyze_resume_agent = Agent(
-    name="analyze_resume_agent",
-    model="gemini-2.5-flash",
-    description="Extracts structured information and insights from resumes.",
-    instruction=(
-       """# Role
+def _build_analyze_resume_agent() -> Agent:
+    """Parses a resume into a ResumeProfile."""
+    return Agent(
+        name="analyze_resume_agent",
+        model=default_model("analyze_resume_agent"),
+        description="Extracts structured information and insights from resumes.",
+        instruction=(
+           """# Role
 You are an expert Resume Parser. 
 
 # Task
@@ -54,17 +117,21 @@ You MUST Return a clean, structured JSON summary of the candidate's profile.
 
 
        """
-    ),
-    output_key="analyze_resume_agent_output",
-)
-
-
-jd_summarize_agent = Agent(
-    name="jd_summarize_agent",
-    model="gemini-2.5-flash",
-    description="Extracts structured information and core requirements from job descriptions.",
-    instruction=(
-        """# Role
+        ),
+        before_model_callback=chain_before_model(route_model_callback, resume_parse_cache_before, prompt_token_callback),
+        after_model_callback=chain_after_model(validate_resume_profile, resume_parse_cache_after),
+        output_key="analyze_resume_agent_output",
+    )
+
+
+def _build_jd_summarize_agent() -> Agent:
+    """Parses a job description into a JDProfile."""
+    return Agent(
+        name="jd_summarize_agent",
+        model=default_model("jd_summarize_agent"),
+        description="Extracts structured information and core requirements from job descriptions.",
+        instruction=(
+            """# Role
 You are an expert Job Description (JD) Parser.
 
 
@@ -115,22 +182,25 @@ You MUST return a clean, structured JSON summary of the job description.
     ]
 }
 """
-    ),
-    output_key="jd_summarize_agent_output",
-)
-
-
-
-job_fit_analyst_agent = Agent(
-    name="job_fit_analyst_agent",
-    model="gemini-2.5-flash",
-    description="Analyzes how well a candidate's resume matches a target job description.",
-    instruction=(
-        """# Role
+        ),
+        before_model_callback=chain_before_model(route_model_callback, jd_parse_cache_before, prompt_token_callback),
+        after_model_callback=chain_after_model(validate_jd_profile, jd_parse_cache_after),
+        output_key="jd_summarize_agent_output",
+    )
+
+
+def _build_job_fit_analyst_agent() -> Agent:
+    """Writes the fit analysis around the locally computed scores."""
+    return Agent(
+        name="job_fit_analyst_agent",
+        model=default_model("job_fit_analyst_agent"),
+        description="Analyzes how well a candidate's resume matches a target job description.",
+        instruction=(
+            """# Role
 You are an expert Job Fit Analyst.
 
 # Inputs
-You receive two structured JSON objects:
+You receive two structured JSON objects (trimmed to the fields relevant to this task):
 1. `resume_profile`  → output of analyze_resume_agent
    {
      "key_skills": [...],
@@ -151,20 +221,22 @@ You receive two structured JSON objects:
      "keywords_for_ats": []
    }
 
+3. `fit_scores` (optional) → the `score_job_fit` result, already computed for you.
+
 # Task
 Compare `resume_profile` and `jd_profile` and evaluate job fit.
 
+If the input contains `fit_scores`, do NOT call the tool: use `fit_scores` as the tool result
+in steps 2 and 3.
+
 You MUST:
-1. Compute numeric scores (0–100) for:
-   - overall_fit
-   - technical_fit
-   - domain_fit
-   - seniority_fit
-2. Identify:
-   - matched_skills: skills that clearly appear in both resume and JD.
-   - missing_must_have_skills: required skills in the JD that the resume does not demonstrate.
-   - missing_nice_to_have_skills: preferred skills in the JD that the resume does not demonstrate.
-3. Provide:
+1. Call the `score_job_fit` tool ONCE with `resume_profile` and `jd_profile` as JSON objects.
+   It deterministically computes:
+   - overall_fit, technical_fit, domain_fit, seniority_fit (integers 0–100)
+   - matched_skills, missing_must_have_skills, missing_nice_to_have_skills
+2. Copy those seven fields from the tool result into your output EXACTLY. Do NOT recompute,
+   round, or edit the scores or skill lists.
+3. Write only the prose fields yourself, using the tool result and both profiles:
    - strengths_summary: 2–5 short bullet-style strings highlighting why the candidate is a good fit.
    - gaps_summary: 2–5 short bullet-style strings highlighting the main gaps.
    - recommendations: 3–7 short, action-oriented suggestions (e.g., what to learn, what to emphasize).
@@ -188,22 +260,28 @@ Return ONLY a clean JSON object with the following keys:
 - Bullet-style text should be short, clear sentences or phrases.
 - Do NOT include any explanation outside the JSON.
 """
-    ),
-    output_key="job_fit_analyst_agent_output",
-)
-
-
-
-analyze_resume_enhancer_agent = Agent(
-    name="analyze_resume_enhancer_agent",
-    model="gemini-2.5-pro",
-    description="Enhances resume wording and structure to better match a target job description without fabricating experience.",
-    instruction=(
-        """# Role
+        ),
+        tools=[get_agent("score_job_fit_tool")],
+        before_model_callback=chain_before_model(
+            budget_job_fit_context, skip_precomputed_scoring, route_model_callback, prompt_token_callback
+        ),
+        after_model_callback=validate_job_fit,
+        output_key="job_fit_analyst_agent_output",
+    )
+
+
+def _build_analyze_resume_enhancer_agent() -> Agent:
+    """Rewrites resume bullets for the target role."""
+    return Agent(
+        name="analyze_resume_enhancer_agent",
+        model=default_model("analyze_resume_enhancer_agent"),
+        description="Enhances resume wording and structure to better match a target job description without fabricating experience.",
+        instruction=(
+            """# Role
 You are an expert Resume Enhancer and Career Coach.
 
 # Inputs
-You receive:
+You receive (trimmed to the fields relevant to this task; absent fields are intentional):
 1. `original_resume_text`: the raw resume text provided by the candidate.
 2. `resume_profile`: the structured JSON output from analyze_resume_agent
    {
@@ -279,35 +357,33 @@ Field guidance:
 
 Do NOT include any explanation outside the JSON.
 """
-    ),
-    output_key="analyze_resume_enhancer_agent_output",
-)
-
-
-
+        ),
+        before_model_callback=chain_before_model(budget_enhancer_context, route_model_callback, prompt_token_callback),
+        after_model_callback=validate_resume_enhancement,
+        output_key="analyze_resume_enhancer_agent_output",
+    )
 
 
 # -----------------------------
 # Tools for root agent
 # -----------------------------
 
-# Use AgentTool to wrap the agent - this handles the agent call properly
-analyze_resume_tool = AgentTool(agent=analyze_resume_agent)
-analyze_job_description_tool = AgentTool(agent=jd_summarize_agent)
-analyze_job_fit_agent = AgentTool(agent=job_fit_analyst_agent)
-analyze_resume_enhancer_agent = AgentTool(agent=analyze_resume_enhancer_agent)
+def _agent_tool(name: str):
+    return lambda: ValidatingAgentTool(agent=get_agent(name))
 
 # -----------------------------
 # Root agent (orchestrator)
 # -----------------------------
 # SequentialAgent only accepts name and sub_agents parameters
 # It orchestrates the workflow automatically between sub-agents
-root_agent = Agent(
-    name="root_agent",
-    model="gemini-2.5-flash",
+def _build_orchestrator_agent() -> Agent:
+    """The LLM orchestrator; calls the specialists as AgentTools."""
+    orchestrator = Agent(
+        name="root_agent",
+        model=default_model("root_agent"),
     
-    description="User-facing orchestrator for resume and JD workflows.",
-    instruction=("""
+        description="User-facing orchestrator for resume and JD workflows.",
+        instruction=("""
         # Role
 You are the Career Services Orchestrator. Your goal is to help users with career tasks by coordinating four specialized tools:
 1. `analyze_resume_tool`
@@ -335,7 +411,7 @@ IF user provides only JD:
 
 # Important Rules
 *   **Dependency:** You cannot run `job_fit_analyst` until you have the structured data from both the Resume and the JD.
-*   **Context Passing:** When calling a downstream agent (like `resume_enhancer`), pass the *results* of the previous agents, not just the raw user text.
+*   **Context Passing:** When calling a downstream agent (like `resume_enhancer`), pass the *results* of the previous agents, not just the raw user text, as a JSON object keyed `resume_profile`, `jd_profile`, `job_fit_summary` and (for `resume_enhancer`) `original_resume_text`. Results already produced in this session are filled in automatically, so you may omit them.
 
 
 
@@ -345,15 +421,80 @@ IF user provides only JD:
 
 
     """),
-    tools=[
-        analyze_resume_tool,
-        analyze_job_description_tool,
-        analyze_job_fit_agent,
-        analyze_resume_enhancer_agent,
-    ],
-    output_key="root_agent_output",
-)
-logging.info("-----------------------------------------------------------------Root agent wired with tools--------------------------------")
+        tools=[
+            get_agent("analyze_resume_tool"),
+            get_agent("analyze_job_description_tool"),
+            get_agent("analyze_job_fit_agent"),
+            get_agent("analyze_resume_enhancer_tool"),
+        ],
+        before_model_callback=chain_before_model(route_model_callback, prompt_token_callback),
+        output_key="root_agent_output",
+    )
+    logger.info("Root agent wired with tools")
+    return orchestrator
+
+# -----------------------------
+# Deterministic workflow (alternative root)
+# -----------------------------
+# Parses resume and JD in parallel, then runs fit and (if asked) the enhancer,
+# passing results through session state instead of an LLM deciding each step.
+# Set RESUME_ANALYZER_ROOT=workflow to serve it as root_agent.
+def _build_workflow_agent():
+    return build_workflow_agent(
+        get_agent("analyze_resume_agent"),
+        get_agent("jd_summarize_agent"),
+        get_agent("job_fit_analyst_agent"),
+        get_agent("analyze_resume_enhancer_agent"),
+    )
+
+
+def _build_root_agent():
+    if os.getenv("RESUME_ANALYZER_ROOT", "orchestrator").lower() == "workflow":
+        return get_agent("workflow_agent")
+    return get_agent("orchestrator_agent")
+
+
+# -----------------------------
+# Lazy construction
+# -----------------------------
+# Nothing above is built at import: `from .agent import root_agent` (or
+# adk web reading agent.root_agent) builds that agent and only what it uses,
+# once, on first access (PEP 562 module __getattr__). batch.py and
+# candidate_store.py import just the parsers / fit analyst the same way.
+_BUILDERS = {
+    "score_job_fit_tool": _build_score_job_fit_tool,
+    "analyze_resume_agent": _build_analyze_resume_agent,
+    "jd_summarize_agent": _build_jd_summarize_agent,
+    "job_fit_analyst_agent": _build_job_fit_analyst_agent,
+    "analyze_resume_enhancer_agent": _build_analyze_resume_enhancer_agent,
+    "analyze_resume_tool": _agent_tool("analyze_resume_agent"),
+    "analyze_job_description_tool": _agent_tool("jd_summarize_agent"),
+    "analyze_job_fit_agent": _agent_tool("job_fit_analyst_agent"),
+    "analyze_resume_enhancer_tool": _agent_tool("analyze_resume_enhancer_agent"),
+    "orchestrator_agent": _build_orchestrator_agent,
+    "workflow_agent": _build_workflow_agent,
+    "root_agent": _build_root_agent,
+}
+_built = {}
+_build_lock = threading.RLock()  # builders resolve other names
+
+
+def get_agent(name: str):
+    """Build (once) and return the agent or tool registered under `name`."""
+    with _build_lock:
+        if name not in _built:
+            _built[name] = _BUILDERS[name]()
+        return _built[name]
+
+
+def __getattr__(name):
+    if name in _BUILDERS:
+        return get_agent(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_BUILDERS))
 
 
 # -----------------------------
@@ -362,10 +503,12 @@ logging.info("-----------------------------------------------------------------R
 if __name__ == "__main__":
     from google.adk.runtime import run_agent  # or equivalent helper
 
+    logging.basicConfig(level=logging.INFO)
+
     print("Type your message (Ctrl+C to exit):")
     while True:
         user_msg = input("> ")
-        result = run_agent(root_agent, user_msg)
+        result = run_agent(get_agent("root_agent"), user_msg)
         #print 
 
         print ("--------------------------------")
@@ -0,0 +1,182 @@
+# agent_runner.py
+#
+# Small helpers to run a single specialist agent programmatically and read its
+# JSON reply. Used by the batch screener, the deterministic workflow and, via
+# ValidatingAgentTool, the orchestrator's tool calls.
+#
+# Replies of agents listed in schemas.OUTPUT_SCHEMAS are validated; the
+# after_model_callback already repairs what it can locally, so a retry (with a
+# corrective note appended to the message) is only spent on replies that are
+# still unusable. Env: RESUME_OUTPUT_MAX_RETRIES (default 1). Re-asks move up
+# the agent's model tiers (model_router.py), e.g. flash -> pro.
+
+import json
+import os
+import re
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import ToolContext
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+from .model_router import (
+    record_escalation,
+    record_run,
+    router_tier_key,
+    routing_policy,
+    starting_tier,
+)
+from .output_validation import record, validate_output
+from .schemas import OUTPUT_SCHEMAS
+
+
+APP_NAME = "resume_job_analyzer"
+USER_ID = "batch_user"
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+
+
+async def run_agent_events(
+    agent: BaseAgent,
+    message: str,
+    state: Optional[Dict[str, Any]] = None,
+    stream: bool = False,
+) -> AsyncGenerator[Event, None]:
+    """
+    Run `agent` once on `message` in a fresh in-memory session and yield its events.
+
+    Args:
+        stream: Use SSE streaming; text then arrives as partial events followed
+            by one merged final event.
+    """
+    session_service = InMemorySessionService()
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=session_service)
+    session = session_service.create_session(app_name=APP_NAME, user_id=USER_ID, state=state or {})
+    content = types.Content(role="user", parts=[types.Part.from_text(text=message)])
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE if stream else StreamingMode.NONE)
+
+    async for event in runner.run_async(
+        user_id=USER_ID, session_id=session.id, new_message=content, run_config=run_config
+    ):
+        yield event
+
+
+async def run_agent(agent: BaseAgent, message: str, state: Optional[Dict[str, Any]] = None) -> str:
+    """Run `agent` once on `message` in a fresh in-memory session and return its final text."""
+    final_text = ""
+    async for event in run_agent_events(agent, message, state):
+        if event.is_final_response() and event.content and event.content.parts:
+            final_text = "".join(part.text or "" for part in event.content.parts)
+    return final_text
+
+
+def parse_json_output(text: str) -> Dict[str, Any]:
+    """Parse an agent's JSON reply, tolerating a surrounding ```json fence."""
+    return json.loads(_FENCE.sub("", text))
+
+
+async def run_agent_json(
+    agent: BaseAgent,
+    message: str,
+    state: Optional[Dict[str, Any]] = None,
+    max_retries: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run `agent` and return its reply as a validated dict.
+
+    Args:
+        max_retries: Re-asks after an unusable reply. Env: RESUME_OUTPUT_MAX_RETRIES.
+
+    Raises:
+        ValueError: if the reply is still invalid after the retries.
+    """
+    state = escalation_state(agent, message, state)
+    return await validate_or_retry(agent, message, await run_agent(agent, message, state), state, max_retries)
+
+
+def escalation_state(agent: BaseAgent, message: str, state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Session state pinning the model tier of the first attempt, for callers that escalate via validate_or_retry()."""
+    tier = starting_tier(routing_policy(agent.name), message)
+    return {**(state or {}), router_tier_key(agent.name): tier}
+
+
+async def validate_or_retry(
+    agent: BaseAgent,
+    message: str,
+    reply: str,
+    state: Optional[Dict[str, Any]] = None,
+    max_retries: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Validate `reply` (already produced by `agent` for `message`) and re-ask if
+    it is unusable or fails the agent's quality check (model_router.py).
+    Each re-ask moves up one model tier while a higher tier exists.
+    """
+    schema = OUTPUT_SCHEMAS.get(agent.name)
+    if schema is None:
+        return parse_json_output(reply)
+    if max_retries is None:
+        max_retries = int(os.getenv("RESUME_OUTPUT_MAX_RETRIES", "1"))
+    policy = routing_policy(agent.name)
+    state = dict(state or {})
+    tier_key = router_tier_key(agent.name)
+    tier = state.get(tier_key)
+    if tier is None:
+        tier = starting_tier(policy, message)
+    record_run(agent.name)
+
+    value, _, error = validate_output(schema, reply)
+    weakness = policy.quality_check(value) if value is not None and policy.quality_check else None
+    for _ in range(max_retries):
+        if value is not None and weakness is None:
+            break
+        can_escalate = tier + 1 < len(policy.tiers)
+        if value is not None and not can_escalate:
+            break  # the quality check only buys a stronger model, not a same-tier retry
+        record(agent.name, "retried")
+        if can_escalate:
+            tier += 1
+            state[tier_key] = tier
+            record_escalation(agent.name, "invalid output" if value is None else weakness)
+        retry_message = message
+        if value is None:
+            retry_message = (
+                f"{message}\n\nYour previous reply could not be used ({error}). "
+                "Return ONLY the JSON object described in your instructions."
+            )
+        previous = value
+        value, _, error = validate_output(schema, await run_agent(agent, retry_message, state))
+        if value is None and previous is not None:
+            value = previous  # a weak but valid reply beats none
+            break
+        weakness = policy.quality_check(value) if value is not None and policy.quality_check else None
+    if value is None:
+        if max_retries:
+            record(agent.name, "retry_failed")
+        raise ValueError(f"{agent.name} returned unusable output: {error}")
+    return value
+
+
+class ValidatingAgentTool(AgentTool):
+    """
+    AgentTool that runs the agent through run_agent_json(), so the
+    orchestrator's calls get the same validation, retry and model escalation
+    as the workflow. The validated value is stored under the agent's
+    output_key and returned as JSON text ({"error": ...} if it stayed unusable).
+    """
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext) -> Any:
+        if self.skip_summarization:
+            tool_context.actions.skip_summarization = True
+        try:
+            value = await run_agent_json(self.agent, args["request"], tool_context.state.to_dict())
+        except ValueError as e:
+            value = {"error": str(e)}
+        if getattr(self.agent, "output_key", None):
+            tool_context.state[self.agent.output_key] = value
+        return json.dumps(value, ensure_ascii=False)
@@ -0,0 +1,162 @@
+# batch.py
+#
+# Batch screening: N resumes x M job descriptions.
+# - Every unique resume / JD text is parsed exactly once
+#   (analyze_resume_agent / jd_summarize_agent), however many pairs use it.
+# - Every pair is scored with score_job_fit as soon as both of its profiles
+#   are ready; job_fit_analyst_agent gets the scores and only writes the prose
+#   (one model call, no tool-call turn). All model calls share one concurrency
+#   limit.
+# - Results are appended to a JSONL file in completion order.
+#
+# Run:
+#   python -m resume_job_analyzer.batch --resumes resumes/ --jds jds.jsonl --out results.jsonl --concurrency 8
+#
+# Inputs are either a directory of .txt/.md files (id = file name without
+# extension) or a JSONL file with one {"id": ..., "text": ...} object per line.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from .agent import analyze_resume_agent, jd_summarize_agent, job_fit_analyst_agent
+from .agent_runner import run_agent_json
+from .context_budget import JD, RESUME, SCORES, assemble_context
+from .skill_matcher import score_job_fit
+
+
+DEFAULT_CONCURRENCY = 8
+TEXT_EXTENSIONS = (".txt", ".md")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Document:
+    id: str
+    text: str
+
+
+def load_documents(source: str) -> List[Document]:
+    """Load documents from a directory of text files or a JSONL file."""
+    if os.path.isdir(source):
+        documents = []
+        for name in sorted(os.listdir(source)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() in TEXT_EXTENSIONS:
+                with open(os.path.join(source, name), "r", encoding="utf-8") as f:
+                    documents.append(Document(stem, f.read()))
+        return documents
+
+    documents = []
+    with open(source, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line.strip():
+                record = json.loads(line)
+                documents.append(Document(str(record.get("id", line_no)), record["text"]))
+    return documents
+
+
+def text_hash(text: str) -> str:
+    """Hash of whitespace-normalized text, so re-pasted copies dedupe."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+async def run_job_fit(
+    resume_profile: Dict[str, Any], jd_profile: Dict[str, Any], scores: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Fit analysis with the deterministic part done locally.
+
+    `scores` (the score_job_fit result, computed here if not given) is passed to
+    job_fit_analyst_agent as `fit_scores`, so the model skips the tool call and
+    only writes the prose; the computed scores and skill lists win over its copy.
+    """
+    if scores is None:
+        scores = score_job_fit(resume_profile, jd_profile)
+    state = {RESUME: resume_profile, JD: jd_profile, SCORES: scores}
+    reply = await run_agent_json(job_fit_analyst_agent, assemble_context(job_fit_analyst_agent.name, state)[0])
+    return {**reply, **scores}
+
+
+class BatchScreener:
+    """Runs the resume x JD screening pipeline under one concurrency limit."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self.model_calls = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._parse_tasks: Dict[tuple, asyncio.Task] = {}
+
+    async def _call(self, call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        async with self._semaphore:
+            self.model_calls += 1
+            return await call
+
+    def _parse(self, agent, document: Document) -> Awaitable[Dict[str, Any]]:
+        key = (agent.name, text_hash(document.text))
+        if key not in self._parse_tasks:
+            self._parse_tasks[key] = asyncio.create_task(self._call(run_agent_json(agent, document.text)))
+        return self._parse_tasks[key]
+
+    async def _fit(self, resume: Document, jd: Document, resume_task, jd_task) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"resume_id": resume.id, "jd_id": jd.id}
+        try:
+            resume_profile, jd_profile = await asyncio.gather(resume_task, jd_task)
+            result["job_fit"] = await self._call(run_job_fit(resume_profile, jd_profile))
+        except Exception as e:  # one bad pair must not stop the batch
+            logger.warning("Pair %s x %s failed: %s", resume.id, jd.id, e)
+            result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    async def screen(self, resumes: List[Document], jds: List[Document], output_path: str) -> int:
+        """Screen every resume against every JD, streaming results to `output_path`. Returns #pairs."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        resume_tasks = {r.id: self._parse(analyze_resume_agent, r) for r in resumes}
+        jd_tasks = {j.id: self._parse(jd_summarize_agent, j) for j in jds}
+        pairs = [
+            self._fit(resume, jd, resume_tasks[resume.id], jd_tasks[jd.id])
+            for resume in resumes
+            for jd in jds
+        ]
+
+        written = 0
+        with open(output_path, "w", encoding="utf-8") as out:
+            for next_result in asyncio.as_completed(pairs):
+                out.write(json.dumps(await next_result, ensure_ascii=False) + "\n")
+                out.flush()
+                written += 1
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen N resumes against M job descriptions.")
+    parser.add_argument("--resumes", required=True, help="Directory of .txt/.md files or a JSONL file")
+    parser.add_argument("--jds", required=True, help="Directory of .txt/.md files or a JSONL file")
+    parser.add_argument("--out", default="screening_results.jsonl")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    load_dotenv()
+    resumes = load_documents(args.resumes)
+    jds = load_documents(args.jds)
+    screener = BatchScreener(args.concurrency)
+
+    start = time.perf_counter()
+    written = asyncio.run(screener.screen(resumes, jds, args.out))
+    print(
+        f"{written} pairs ({len(resumes)} resumes x {len(jds)} JDs) -> {args.out} "
+        f"in {time.perf_counter() - start:.1f}s, {screener.model_calls} model calls"
+    )
+
+
+if __name__ == "__main__":
+    main()
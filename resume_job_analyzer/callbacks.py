@@ -0,0 +1,37 @@
+# callbacks.py
+#
+# ADK agents take a single before_model_callback / after_model_callback.
+# These helpers compose several into one so features (parse cache, output
+# validation, ...) can be stacked on the same agent.
+
+from typing import Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+
+def chain_before_model(*callbacks: Callable) -> Callable:
+    """Run callbacks in order; the first one that returns a response short-circuits the model call."""
+
+    def before_model_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        for callback in callbacks:
+            response = callback(callback_context=callback_context, llm_request=llm_request)
+            if response is not None:
+                return response
+        return None
+
+    return before_model_callback
+
+
+def chain_after_model(*callbacks: Callable) -> Callable:
+    """Run callbacks in order, each seeing the response left by the previous one."""
+
+    def after_model_callback(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        replaced = None
+        for callback in callbacks:
+            response = callback(callback_context=callback_context, llm_response=replaced or llm_response)
+            if response is not None:
+                replaced = response
+        return replaced
+
+    return after_model_callback
@@ -0,0 +1,271 @@
+# candidate_store.py
+#
+# Indexed candidate store for "which of these N resumes fits this JD best".
+#
+# - Resumes are parsed once (analyze_resume_agent) and their profiles persisted
+#   in SQLite, keyed by candidate id; re-adding unchanged text is free.
+# - An inverted index maps skill keys to candidate ids. A skill's keys are its
+#   canonical forms plus, via the skill index, its vocabulary entry and
+#   category, so a "relational databases" requirement finds MySQL candidates.
+# - top_k() pre-ranks candidates by must-have / nice-to-have coverage with
+#   posting-list lookups only, re-scores the best few with the deterministic
+#   score_job_fit, and returns the top K. Only that shortlist is sent to
+#   job_fit_analyst_agent, with those scores, for the prose (screen()).
+#
+# One JD against N stored candidates costs one JD parse + K prose calls instead
+# of N fit runs.
+#
+# Run:
+#   python -m resume_job_analyzer.candidate_store add --resumes resumes/
+#   python -m resume_job_analyzer.candidate_store rank --jd jd.txt --top 10 --out shortlist.jsonl
+#
+# Env: RESUME_CANDIDATE_STORE_PATH (default .cache/candidates.sqlite).
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from .agent import analyze_resume_agent, jd_summarize_agent
+from .agent_runner import run_agent_json
+from .batch import DEFAULT_CONCURRENCY, Document, load_documents, run_job_fit, text_hash
+from .context_budget import total_model_calls
+from .skill_index import get_skill_index
+from .skill_matcher import MUST_HAVE_WEIGHT, NICE_TO_HAVE_WEIGHT, _variants, score_job_fit
+
+
+DEFAULT_STORE_PATH = os.path.join(".cache", "candidates.sqlite")
+RERANK_FACTOR = 3  # candidates re-scored with score_job_fit per shortlist slot
+
+logger = logging.getLogger(__name__)
+
+
+def skill_keys(skills: Iterable[str]) -> Set[str]:
+    """Index keys for a list of skills: canonical variants, vocabulary entry and its categories."""
+    skills = [str(skill) for skill in skills if skill]
+    index = get_skill_index()
+    keys: Set[str] = set()
+    for skill, snapped in zip(skills, index.snap(skills)):
+        keys |= _variants(skill)
+        seen: Set[str] = set()
+        while snapped and snapped not in seen:
+            seen.add(snapped)
+            snapped = index.member_of.get(snapped)  # e.g. pytorch -> deep learning -> machine learning
+        keys |= seen
+    return keys
+
+
+def _requirement_keys(skill: str) -> Set[str]:
+    """Keys a requirement is satisfied by: its variants and (only) its own vocabulary entry."""
+    keys = set(_variants(skill))
+    snapped = get_skill_index().snap([skill])[0]
+    if snapped:
+        keys.add(snapped)
+    return keys
+
+
+class CandidateStore:
+    """
+    Persistent resume profiles with an in-memory skill -> candidate inverted index.
+
+    Args:
+        path: SQLite file. Env: RESUME_CANDIDATE_STORE_PATH.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("RESUME_CANDIDATE_STORE_PATH", DEFAULT_STORE_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS candidates (
+                id TEXT PRIMARY KEY,
+                text_hash TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                added_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        for candidate_id, hash_, profile in self._conn.execute("SELECT id, text_hash, profile FROM candidates"):
+            self._index(candidate_id, json.loads(profile))
+            self._hashes[candidate_id] = hash_
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def _index(self, candidate_id: str, profile: Dict[str, Any]) -> None:
+        self._unindex(candidate_id)
+        self.profiles[candidate_id] = profile
+        for key in skill_keys(profile.get("key_skills") or []):
+            self._postings[key].add(candidate_id)
+
+    def _unindex(self, candidate_id: str) -> None:
+        old = self.profiles.pop(candidate_id, None)
+        if old is None:
+            return
+        for key in skill_keys(old.get("key_skills") or []):
+            postings = self._postings.get(key)
+            if postings is not None:
+                postings.discard(candidate_id)
+                if not postings:
+                    del self._postings[key]
+
+    def add(self, candidate_id: str, profile: Dict[str, Any], hash_: str = "") -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO candidates VALUES (?, ?, ?, ?)",
+                (candidate_id, hash_, json.dumps(profile, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+            self._index(candidate_id, profile)
+            self._hashes[candidate_id] = hash_
+
+    def remove(self, candidate_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+            self._conn.commit()
+            self._unindex(candidate_id)
+            self._hashes.pop(candidate_id, None)
+
+    def is_current(self, document: Document) -> bool:
+        return self._hashes.get(document.id) == text_hash(document.text)
+
+    async def add_resumes(
+        self, documents: List[Document], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> Tuple[int, int]:
+        """
+        Parse and store resumes whose text is new or changed.
+
+        Returns:
+            (parsed, failed): resumes parsed and stored, and resumes whose parse
+            failed (they are skipped and retried on the next run).
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        pending = [document for document in documents if not self.is_current(document)]
+
+        async def parse(document: Document) -> bool:
+            async with semaphore:
+                try:
+                    profile = await run_agent_json(analyze_resume_agent, document.text)
+                except Exception as e:  # one bad resume must not stop the import
+                    logger.warning("Could not parse resume %s: %s", document.id, e)
+                    return False
+            self.add(document.id, profile, text_hash(document.text))
+            return True
+
+        parsed = sum(await asyncio.gather(*(parse(document) for document in pending)))
+        return parsed, len(pending) - parsed
+
+    def top_k(self, jd_profile: Dict[str, Any], k: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Best `k` candidates for a parsed JD, as (candidate_id, score_job_fit result).
+
+        Coverage of must-have / nice-to-have skills is counted from posting lists;
+        the top k * RERANK_FACTOR (plus ties) are then re-scored with score_job_fit.
+        """
+        must = [str(s) for s in jd_profile.get("must_have_skills") or []]
+        nice = [str(s) for s in jd_profile.get("nice_to_have_skills") or []]
+        coverage: Dict[str, float] = defaultdict(float)
+        for skills, weight in ((must, MUST_HAVE_WEIGHT), (nice, NICE_TO_HAVE_WEIGHT)):
+            if not skills:
+                continue
+            for skill in skills:
+                hits: Set[str] = set()
+                for key in _requirement_keys(skill):
+                    hits |= self._postings.get(key, set())
+                for candidate_id in hits:
+                    coverage[candidate_id] += weight / len(skills)
+
+        ranked = sorted(coverage, key=lambda c: (-coverage[c], c))
+        pool = ranked[: max(k, 1) * RERANK_FACTOR]
+        if pool:  # keep everyone tied with the cut-off, seniority / domain decide between them
+            cutoff = coverage[pool[-1]]
+            pool += [c for c in ranked[len(pool) :] if coverage[c] >= cutoff - 1e-9]
+        if len(pool) < k:  # too few skill hits: fill up so seniority / domain can still rank
+            pool += [c for c in sorted(self.profiles) if c not in coverage][: k * RERANK_FACTOR - len(pool)]
+        scored = [(candidate_id, score_job_fit(self.profiles[candidate_id], jd_profile)) for candidate_id in pool]
+        scored.sort(key=lambda item: (-item[1]["overall_fit"], -item[1]["technical_fit"], item[0]))
+        return scored[:k]
+
+    async def screen(
+        self, jd_text: str, k: int = 10, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Parse a JD, shortlist the top `k` candidates and run job_fit_analyst_agent on them only,
+        reusing their score_job_fit result (see batch.run_job_fit).
+
+        Returns:
+            (jd_profile, results) with results ordered by the shortlist rank.
+        """
+        jd_profile = await run_agent_json(jd_summarize_agent, jd_text)
+        shortlist = self.top_k(jd_profile, k)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fit(rank: int, candidate_id: str, prefilter: Dict[str, Any]) -> Dict[str, Any]:
+            result: Dict[str, Any] = {"rank": rank, "candidate_id": candidate_id, "prefilter": prefilter}
+            async with semaphore:
+                try:
+                    result["job_fit"] = await run_job_fit(self.profiles[candidate_id], jd_profile, prefilter)
+                except Exception as e:  # keep the rest of the shortlist
+                    logger.warning("Fit for %s failed: %s", candidate_id, e)
+                    result["error"] = f"{type(e).__name__}: {e}"
+            return result
+
+        results = await asyncio.gather(
+            *(fit(rank, candidate_id, prefilter) for rank, (candidate_id, prefilter) in enumerate(shortlist, start=1))
+        )
+        return jd_profile, list(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store parsed resumes and rank them against a job description.")
+    parser.add_argument("--store", default=None, help="SQLite file (default: RESUME_CANDIDATE_STORE_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Parse and store resumes")
+    add.add_argument("--resumes", required=True, help="Directory of .txt/.md files or a JSONL file")
+    add.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    rank = commands.add_parser("rank", help="Shortlist stored candidates for a JD")
+    rank.add_argument("--jd", required=True, help="Text file with the job description")
+    rank.add_argument("--top", type=int, default=10)
+    rank.add_argument("--out", default="shortlist.jsonl")
+    rank.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    load_dotenv()
+    store = CandidateStore(args.store)
+    start = time.perf_counter()
+    if args.command == "add":
+        parsed, failed = asyncio.run(store.add_resumes(load_documents(args.resumes), args.concurrency))
+        print(
+            f"Parsed {parsed} new/changed resumes ({failed} failed), {len(store)} candidates stored "
+            f"({time.perf_counter() - start:.1f}s)"
+        )
+        return
+
+    with open(args.jd, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+    calls = total_model_calls()
+    _, results = asyncio.run(store.screen(jd_text, args.top, args.concurrency))
+    with open(args.out, "w", encoding="utf-8") as out:
+        for result in results:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    print(
+        f"Top {len(results)} of {len(store)} candidates -> {args.out} "
+        f"in {time.perf_counter() - start:.1f}s, {total_model_calls() - calls} model calls"
+    )
+
+
+if __name__ == "__main__":
+    main()
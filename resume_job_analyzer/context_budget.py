@@ -0,0 +1,302 @@
+# context_budget.py
+#
+# Token-budgeted input assembly for the downstream resume agents, plus
+# per-call prompt size reporting for every agent.
+#
+# job_fit_analyst_agent and analyze_resume_enhancer_agent only need part of the
+# earlier results. AGENT_CONTEXT lists, per agent and in priority order, which
+# fields to take from which session-state key (the parse agents' output_key
+# values, or "resume_text" from the workflow router). assemble_context() builds
+# compact JSON from them and, if it exceeds the agent's budget:
+#   1. caps long optional lists at MAX_LIST_ITEMS,
+#   2. drops optional fields, lowest priority first,
+#   3. truncates the longest text (normally the raw resume) as a last resort.
+# Required lists (the skills score_job_fit compares) are never cut; if they
+# alone exceed the budget, the context is sent over budget with a warning.
+#
+# The workflow builds its step messages with assemble_context() directly. On the
+# orchestrator path, context_budget_callback() rewrites the JSON request that
+# root_agent passed to the AgentTool the same way, filling missing sections
+# from state.
+#
+# Token counts are estimates (~4 characters per token): the installed ADK does
+# not surface usage metadata on LlmResponse, and counting exactly would cost an
+# API round-trip per call.
+#
+# Budgets (tokens): RESUME_FIT_CONTEXT_TOKENS (1500),
+# RESUME_ENHANCER_CONTEXT_TOKENS (4000).
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+
+CHARS_PER_TOKEN = 4
+MAX_LIST_ITEMS = 10
+TRUNCATION_MARK = " ...[truncated]"
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+@dataclass(frozen=True)
+class ContextField:
+    section: str  # top-level key of the assembled input
+    source: str  # session-state key holding the value
+    field: Optional[str] = None  # key inside the state value; None = the whole value
+    required: bool = True
+
+
+RESUME = "analyze_resume_agent_output"
+JD = "jd_summarize_agent_output"
+FIT = "job_fit_analyst_agent_output"
+SCORES = "job_fit_scores"  # score_job_fit result computed by the caller (batch, candidate store)
+
+AGENT_CONTEXT: Dict[str, List[ContextField]] = {
+    # Everything score_job_fit reads is required; the rest only helps the prose.
+    "job_fit_analyst_agent": [
+        ContextField("fit_scores", SCORES),
+        ContextField("resume_profile", RESUME, "key_skills"),
+        ContextField("resume_profile", RESUME, "experience_highlights"),
+        ContextField("jd_profile", JD, "role_title"),
+        ContextField("jd_profile", JD, "seniority_level"),
+        ContextField("jd_profile", JD, "must_have_skills"),
+        ContextField("jd_profile", JD, "nice_to_have_skills"),
+        ContextField("jd_profile", JD, "experience_requirements"),
+        ContextField("jd_profile", JD, "keywords_for_ats"),
+        ContextField("resume_profile", RESUME, "education", required=False),
+        ContextField("jd_profile", JD, "core_responsibilities", required=False),
+        ContextField("resume_profile", RESUME, "weaknesses", required=False),
+    ],
+    # The raw resume already carries the candidate's skills and education, so
+    # the profiles are reduced to what the resume itself can't tell the model.
+    "analyze_resume_enhancer_agent": [
+        ContextField("original_resume_text", "resume_text"),
+        ContextField("jd_profile", JD, "role_title"),
+        ContextField("jd_profile", JD, "seniority_level"),
+        ContextField("jd_profile", JD, "must_have_skills"),
+        ContextField("jd_profile", JD, "nice_to_have_skills"),
+        ContextField("jd_profile", JD, "keywords_for_ats"),
+        ContextField("job_fit_summary", FIT, "missing_must_have_skills"),
+        ContextField("job_fit_summary", FIT, "missing_nice_to_have_skills"),
+        ContextField("job_fit_summary", FIT, "matched_skills"),
+        ContextField("resume_profile", RESUME, "weaknesses", required=False),
+        ContextField("job_fit_summary", FIT, "gaps_summary", required=False),
+        ContextField("job_fit_summary", FIT, "recommendations", required=False),
+        ContextField("jd_profile", JD, "core_responsibilities", required=False),
+        ContextField("resume_profile", RESUME, "key_skills", required=False),
+    ],
+}
+
+DEFAULT_BUDGETS = {
+    "job_fit_analyst_agent": ("RESUME_FIT_CONTEXT_TOKENS", 1500),
+    "analyze_resume_enhancer_agent": ("RESUME_ENHANCER_CONTEXT_TOKENS", 4000),
+}
+
+
+def context_budget(agent_name: str) -> Optional[int]:
+    if agent_name not in DEFAULT_BUDGETS:
+        return None
+    env_name, default = DEFAULT_BUDGETS[agent_name]
+    return int(os.getenv(env_name, default))
+
+
+def _as_value(value: Any) -> Any:
+    """State values are dicts (workflow) or the agent's raw JSON text (output_key)."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _truncate_longest_text(sections: Dict[str, Any], excess_chars: int) -> bool:
+    candidates = [(len(v), k, None) for k, v in sections.items() if isinstance(v, str)]
+    candidates += [
+        (len(v), k, f) for k, s in sections.items() if isinstance(s, dict) for f, v in s.items() if isinstance(v, str)
+    ]
+    if not candidates:
+        return False
+    length, section, field = max(candidates)
+    keep = max(0, length - excess_chars - len(TRUNCATION_MARK))
+    if field is None:
+        sections[section] = sections[section][:keep] + TRUNCATION_MARK
+    else:
+        sections[section][field] = sections[section][field][:keep] + TRUNCATION_MARK
+    return True
+
+
+def assemble_context(agent_name: str, sources: Dict[str, Any], budget: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Build the input for `agent_name` from `sources` (session state) within `budget` tokens.
+
+    Returns:
+        (text, estimated_tokens). Only the fields listed in AGENT_CONTEXT are used.
+    """
+    if budget is None:
+        budget = context_budget(agent_name) or 0
+    sections: Dict[str, Any] = {}
+    present: List[ContextField] = []
+    for spec in AGENT_CONTEXT[agent_name]:
+        value = _as_value(sources.get(spec.source))
+        if spec.field is not None:
+            value = value.get(spec.field) if isinstance(value, dict) else None
+        if value in (None, "", [], {}):
+            continue
+        if spec.field is None:
+            sections[spec.section] = value
+        else:
+            sections.setdefault(spec.section, {})[spec.field] = value
+        present.append(spec)
+
+    text = _compact(sections)
+    tokens = estimate_tokens(text)
+    if not budget or tokens <= budget:
+        return text, tokens
+
+    optional = [s for s in present if not s.required]
+    for spec in optional:
+        value = sections[spec.section][spec.field]
+        if isinstance(value, list) and len(value) > MAX_LIST_ITEMS:
+            sections[spec.section][spec.field] = value[:MAX_LIST_ITEMS]
+    text = _compact(sections)
+    if estimate_tokens(text) <= budget:
+        return text, estimate_tokens(text)
+
+    for spec in reversed(optional):
+        del sections[spec.section][spec.field]
+        if not sections[spec.section]:
+            del sections[spec.section]
+        text = _compact(sections)
+        if estimate_tokens(text) <= budget:
+            return text, estimate_tokens(text)
+
+    excess = estimate_tokens(text) - budget
+    if _truncate_longest_text(sections, excess * CHARS_PER_TOKEN):
+        logger.warning("%s context over budget (%d tokens); truncated the longest text", agent_name, budget)
+        text = _compact(sections)
+    if estimate_tokens(text) > budget:
+        logger.warning(
+            "%s context still over budget (%d > %d tokens); required fields are kept whole",
+            agent_name,
+            estimate_tokens(text),
+            budget,
+        )
+    return text, estimate_tokens(text)
+
+
+def context_budget_callback(agent_name: str) -> Callable:
+    """
+    before_model_callback that replaces a JSON request with the budgeted context.
+
+    Sections present in the request win over session state (state may hold
+    results of an earlier turn); plain-text requests are left unchanged.
+    """
+    specs = AGENT_CONTEXT[agent_name]
+
+    def before_model_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        part = _first_user_text_part(llm_request)
+        if part is None:
+            return None
+        request = _as_value(part.text)
+        if not isinstance(request, dict):
+            return None
+
+        sources: Dict[str, Any] = {}
+        for spec in specs:
+            if spec.source in sources:
+                continue
+            from_request = request.get(spec.section)
+            sources[spec.source] = from_request if from_request is not None else callback_context.state.get(spec.source)
+        text, _ = assemble_context(agent_name, sources)
+        if text != "{}":
+            part.text = text
+        return None
+
+    return before_model_callback
+
+
+def _first_user_text_part(llm_request: LlmRequest) -> Optional[types.Part]:
+    for content in llm_request.contents:
+        if content.role == "user":
+            for part in content.parts or []:
+                if part.text:
+                    return part
+    return None
+
+
+# -----------------------------
+# Prompt size reporting
+# -----------------------------
+
+
+@dataclass
+class PromptStats:
+    calls: int = 0
+    total_tokens: int = 0
+    max_tokens: int = 0
+    last_tokens: int = 0
+
+
+_prompt_stats: Dict[str, PromptStats] = {}
+_prompt_stats_lock = threading.Lock()
+
+
+def estimate_prompt_tokens(llm_request: LlmRequest) -> int:
+    """Estimated prompt size: system instruction, tool declarations and all contents."""
+    chars = 0
+    config = llm_request.config
+    if config is not None:
+        chars += len(str(config.system_instruction or ""))
+        for tool in config.tools or []:
+            chars += len(_compact(tool.model_dump(mode="json", exclude_none=True)))
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+            elif part.function_call:
+                chars += len(_compact(part.function_call.model_dump(mode="json", exclude_none=True)))
+            elif part.function_response:
+                chars += len(_compact(part.function_response.model_dump(mode="json", exclude_none=True)))
+    return (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def prompt_token_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """before_model_callback that records the estimated prompt size of each model call."""
+    tokens = estimate_prompt_tokens(llm_request)
+    agent_name = callback_context.agent_name
+    with _prompt_stats_lock:
+        stats = _prompt_stats.setdefault(agent_name, PromptStats())
+        stats.calls += 1
+        stats.total_tokens += tokens
+        stats.max_tokens = max(stats.max_tokens, tokens)
+        stats.last_tokens = tokens
+    logger.info("%s prompt ~%d tokens", agent_name, tokens)
+    return None
+
+
+def prompt_stats() -> Dict[str, Dict[str, int]]:
+    """Per-agent model calls and estimated prompt tokens (total / max / last)."""
+    with _prompt_stats_lock:
+        return {name: asdict(stats) for name, stats in _prompt_stats.items()}
+
+
+def total_model_calls() -> int:
+    """Model calls made so far by all agents (calls answered from a cache are not counted)."""
+    with _prompt_stats_lock:
+        return sum(stats.calls for stats in _prompt_stats.values())
@@ -0,0 +1,181 @@
+# model_router.py
+#
+# Per-call model selection for the resume agents.
+#
+# Each agent has a RoutingPolicy: a list of model tiers (cheapest first), an
+# optional input size above which it starts on the top tier, and an optional
+# quality check for its validated output. route_model_callback() is a
+# before_model_callback that sets llm_request.model:
+#   - the tier pinned in session state for this agent (router_tier_key()), if any,
+#   - otherwise the top tier for large inputs (the user message, in tokens),
+#   - otherwise the first tier.
+#
+# Every caller runs the specialists through agent_runner (run_agent_json, the
+# workflow steps, and the orchestrator's ValidatingAgentTool). It pins the
+# starting tier up front, and validate_or_retry() re-asks a reply that fails
+# validation or the quality check on the next tier. The pin is keyed per
+# agent, so one agent's escalation does not carry over to another agent.
+#
+# Tiers can be overridden per agent, e.g.
+#   RESUME_MODELS_ANALYZE_RESUME_ENHANCER_AGENT=gemini-2.5-flash,gemini-2.5-pro
+#   RESUME_LARGE_INPUT_TOKENS_ANALYZE_RESUME_ENHANCER_AGENT=3000
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+from .context_budget import estimate_tokens
+
+
+FLASH = "gemini-2.5-flash"
+PRO = "gemini-2.5-pro"
+
+ROUTER_TIER_KEY = "router_tier"
+
+logger = logging.getLogger(__name__)
+
+
+def check_enhancement(value: Dict[str, Any]) -> Optional[str]:
+    """Cheap sanity check of an enhancer reply; returns the reason it looks weak, or None."""
+    if len(str(value.get("improved_summary") or "").split()) < 15:
+        return "summary too short"
+    sections = value.get("improved_experience_sections") or []
+    if not sections:
+        return "no experience sections"
+    if any(not section.get("enhanced_bullets") for section in sections):
+        return "section without enhanced bullets"
+    unchanged = sum(1 for s in sections if s.get("enhanced_bullets") == s.get("original_bullets"))
+    if unchanged * 2 > len(sections):
+        return "bullets mostly unchanged"
+    if not value.get("improved_skills_section"):
+        return "empty skills section"
+    return None
+
+
+def check_job_fit(value: Dict[str, Any]) -> Optional[str]:
+    for key in ("strengths_summary", "gaps_summary", "recommendations"):
+        if not value.get(key):
+            return f"empty {key}"
+    return None
+
+
+@dataclass
+class RoutingPolicy:
+    tiers: List[str]
+    large_input_tokens: Optional[int] = None
+    quality_check: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None
+
+
+ROUTING: Dict[str, RoutingPolicy] = {
+    "analyze_resume_agent": RoutingPolicy([FLASH]),
+    "jd_summarize_agent": RoutingPolicy([FLASH]),
+    "job_fit_analyst_agent": RoutingPolicy([FLASH], quality_check=check_job_fit),
+    "analyze_resume_enhancer_agent": RoutingPolicy([FLASH, PRO], large_input_tokens=3000, quality_check=check_enhancement),
+    "root_agent": RoutingPolicy([FLASH]),
+}
+
+
+def routing_policy(agent_name: str) -> RoutingPolicy:
+    """The agent's policy with env overrides applied."""
+    policy = ROUTING.get(agent_name, RoutingPolicy([FLASH]))
+    suffix = agent_name.upper()
+    tiers = os.getenv(f"RESUME_MODELS_{suffix}")
+    large = os.getenv(f"RESUME_LARGE_INPUT_TOKENS_{suffix}")
+    if tiers is None and large is None:
+        return policy
+    return RoutingPolicy(
+        tiers=[t.strip() for t in tiers.split(",") if t.strip()] if tiers else policy.tiers,
+        large_input_tokens=int(large) if large else policy.large_input_tokens,
+        quality_check=policy.quality_check,
+    )
+
+
+def default_model(agent_name: str) -> str:
+    """Model an agent is constructed with (its first tier)."""
+    return routing_policy(agent_name).tiers[0]
+
+
+@dataclass
+class RouterStats:
+    runs: int = 0
+    calls_by_model: Dict[str, int] = field(default_factory=dict)
+    escalations: Dict[str, int] = field(default_factory=dict)
+
+
+_stats: Dict[str, RouterStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _agent_stats(agent_name: str) -> RouterStats:
+    return _stats.setdefault(agent_name, RouterStats())
+
+
+def record_run(agent_name: str) -> None:
+    with _stats_lock:
+        _agent_stats(agent_name).runs += 1
+
+
+def record_escalation(agent_name: str, reason: str) -> None:
+    logger.info("Escalating %s to a higher model tier: %s", agent_name, reason)
+    with _stats_lock:
+        escalations = _agent_stats(agent_name).escalations
+        escalations[reason] = escalations.get(reason, 0) + 1
+
+
+def router_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-agent model calls by model, escalations by reason and escalation rate per run."""
+    with _stats_lock:
+        return {
+            name: {
+                "runs": stats.runs,
+                "calls_by_model": dict(stats.calls_by_model),
+                "escalations": dict(stats.escalations),
+                "escalation_rate": round(sum(stats.escalations.values()) / stats.runs, 3) if stats.runs else 0.0,
+            }
+            for name, stats in _stats.items()
+        }
+
+
+def router_tier_key(agent_name: str) -> str:
+    """Session-state key pinning the model tier of one agent."""
+    return f"{ROUTER_TIER_KEY}:{agent_name}"
+
+
+def starting_tier(policy: RoutingPolicy, input_text: str) -> int:
+    """Tier of the first attempt for an input."""
+    if policy.large_input_tokens and estimate_tokens(input_text) > policy.large_input_tokens:
+        return len(policy.tiers) - 1
+    return 0
+
+
+def _user_text(llm_request: LlmRequest) -> str:
+    for content in llm_request.contents:
+        if content.role == "user" and content.parts and content.parts[0].text:
+            return "".join(part.text or "" for part in content.parts)
+    return ""
+
+
+def choose_model(agent_name: str, llm_request: LlmRequest, state: Any) -> str:
+    policy = routing_policy(agent_name)
+    tier = state.get(router_tier_key(agent_name))
+    if tier is None:
+        tier = starting_tier(policy, _user_text(llm_request))
+    return policy.tiers[min(int(tier), len(policy.tiers) - 1)]
+
+
+def route_model_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """before_model_callback that picks the model for this call."""
+    if not isinstance(callback_context._invocation_context.agent.model, str):
+        return None  # a model object (e.g. LiteLlm) is used as configured
+    agent_name = callback_context.agent_name
+    model = choose_model(agent_name, llm_request, callback_context.state)
+    llm_request.model = model
+    with _stats_lock:
+        calls = _agent_stats(agent_name).calls_by_model
+        calls[model] = calls.get(model, 0) + 1
+    return None
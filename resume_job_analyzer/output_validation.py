@@ -0,0 +1,149 @@
+# output_validation.py
+#
+# Validates each specialist agent's JSON reply against its schema (schemas.py)
+# and repairs common defects locally instead of asking the model again:
+#   - ```json fences and prose around the object,
+#   - trailing commas, smart quotes, Python literals (True / None),
+#   - scores outside 0-100 or given as strings ("85%"), bare strings for lists.
+#
+# The repair runs in after_model_callback, so a repaired reply is what lands in
+# the agent's output_key (and in the parse cache). Replies that cannot be
+# repaired are left untouched and counted; run_agent_json() in agent_runner.py
+# retries those once with a corrective message.
+#
+# Counters per agent: valid (no change needed), repaired, invalid, retried,
+# retry_failed. See output_stats().
+
+import json
+import logging
+import re
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+
+VALID = "valid"
+REPAIRED = "repaired"
+INVALID = "invalid"
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PY_LITERAL = re.compile(r"\b(True|False|None)\b")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+logger = logging.getLogger(__name__)
+
+
+def _outer_object(text: str) -> str:
+    start, end = text.find("{"), text.rfind("}")
+    return text[start : end + 1] if start != -1 and end > start else text
+
+
+def _repair_candidates(text: str):
+    """Progressively more aggressive rewrites of `text`, cheapest first."""
+    text = _outer_object(_FENCE.sub("", text))
+    yield text
+    text = _TRAILING_COMMA.sub(r"\1", text.translate(_SMART_QUOTES))
+    yield text
+    yield _PY_LITERAL.sub(lambda m: _PY_LITERALS[m.group(1)], text)
+
+
+def validate_output(schema: Type[BaseModel], text: str) -> Tuple[Optional[Dict[str, Any]], str, str]:
+    """
+    Validate an agent reply against `schema`, repairing it if needed.
+
+    Returns:
+        (value, status, error): `value` is the validated dict (None if invalid),
+        `status` is "valid", "repaired" or "invalid", `error` describes the last failure.
+    """
+    try:
+        raw = json.loads(text)
+    except ValueError:
+        raw = None
+    if isinstance(raw, dict):
+        try:
+            value = schema.model_validate(raw).model_dump()
+        except ValidationError as e:
+            return None, INVALID, _short_error(e)
+        return value, VALID if value == {k: raw.get(k) for k in value} else REPAIRED, ""
+
+    error = "no JSON object found"
+    for candidate in _repair_candidates(text):
+        try:
+            raw = json.loads(candidate)
+        except ValueError as e:
+            error = f"invalid JSON: {e}"
+            continue
+        if not isinstance(raw, dict):
+            error = "reply is not a JSON object"
+            continue
+        try:
+            return schema.model_validate(raw).model_dump(), REPAIRED, ""
+        except ValidationError as e:
+            return None, INVALID, _short_error(e)
+    return None, INVALID, error
+
+
+def _short_error(error: ValidationError) -> str:
+    problems = [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()[:5]]
+    return "schema mismatch: " + "; ".join(problems)
+
+
+@dataclass
+class OutputStats:
+    valid: int = 0
+    repaired: int = 0
+    invalid: int = 0
+    retried: int = 0
+    retry_failed: int = 0
+
+
+_stats: Dict[str, OutputStats] = {}
+_stats_lock = threading.Lock()
+
+
+def record(agent_name: str, field: str) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(agent_name, OutputStats())
+        setattr(stats, field, getattr(stats, field) + 1)
+
+
+def output_stats() -> Dict[str, Dict[str, int]]:
+    """Per-agent counters: valid / repaired / invalid replies and retries."""
+    with _stats_lock:
+        return {name: asdict(stats) for name, stats in _stats.items()}
+
+
+def output_validation_callback(schema: Type[BaseModel]) -> Callable:
+    """after_model_callback that validates the final JSON reply and swaps in the repaired version."""
+
+    def after_model_callback(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        content = llm_response.content
+        if llm_response.partial or not content or not content.parts:
+            return None
+        if any(part.function_call or part.function_response for part in content.parts):
+            return None
+        text = "".join(part.text or "" for part in content.parts)
+        if not text.strip():
+            return None
+
+        agent_name = callback_context.agent_name
+        value, status, error = validate_output(schema, text)
+        record(agent_name, status)
+        if status == INVALID:
+            logger.warning("%s returned output that could not be repaired: %s", agent_name, error)
+            return None
+        if status == REPAIRED:
+            logger.info("%s output repaired locally", agent_name)
+            return LlmResponse(
+                content=types.Content(role="model", parts=[types.Part.from_text(text=json.dumps(value, ensure_ascii=False))])
+            )
+        return None
+
+    return after_model_callback
@@ -0,0 +1,226 @@
+# parse_cache.py
+#
+# Persistent memo cache for the structured parse agents
+# (analyze_resume_agent, jd_summarize_agent).
+#
+# Key = sha256(agent name, model, instruction hash, normalized input text).
+# The cache is consulted in before_model_callback: on a hit the stored JSON is
+# returned as the model response, so the LLM call is skipped and output_key is
+# still written as usual. On a miss, after_model_callback stores the reply once
+# it parses as JSON with the expected keys.
+#
+# Entries expire after a TTL, the table is bounded with LRU eviction, and
+# entries written under an older instruction text are purged the first time an
+# agent runs with a new one.
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "resume_parse_cache.sqlite")
+DEFAULT_TTL = 30 * 24 * 3600.0  # seconds
+DEFAULT_MAX_ENTRIES = 20000
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-pasted copies of the same document share a key."""
+    return " ".join(text.split())
+
+
+def _sha256(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _content_text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text or "" for part in content.parts)
+
+
+class ParseCache:
+    """
+    SQLite-backed cache of validated parse results.
+
+    Args:
+        path: SQLite file. Env: RESUME_PARSE_CACHE_PATH.
+        ttl: Entry lifetime in seconds. Env: RESUME_PARSE_CACHE_TTL.
+        max_entries: LRU bound. Env: RESUME_PARSE_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = path or os.getenv("RESUME_PARSE_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else float(os.getenv("RESUME_PARSE_CACHE_TTL", DEFAULT_TTL))
+        if max_entries is None:
+            max_entries = int(os.getenv("RESUME_PARSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS parses (
+                key TEXT PRIMARY KEY,
+                agent_name TEXT NOT NULL,
+                instruction_hash TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        self._checked_instructions: set = set()
+        # (invocation_id, agent_name) -> key, carried from before_ to after_model_callback
+        self._pending: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    @staticmethod
+    def make_key(agent_name: str, model: str, instruction_hash: str, text: str) -> str:
+        return _sha256(agent_name, model or "", instruction_hash, normalize_text(text))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM parses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if now - stored_at > self.ttl:
+                self._conn.execute("DELETE FROM parses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE parses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(value)
+
+    def put(self, key: str, agent_name: str, instruction_hash: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, agent_name, instruction_hash, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._conn.execute(
+                """DELETE FROM parses WHERE key IN (
+                    SELECT key FROM parses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+            self.stores += 1
+
+    def invalidate(self, agent_name: str, keep_instruction_hash: Optional[str] = None) -> int:
+        """Drop an agent's entries, except those written under `keep_instruction_hash`."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM parses WHERE agent_name = ? AND instruction_hash != ?",
+                (agent_name, keep_instruction_hash or ""),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _purge_old_instructions(self, agent_name: str, instruction_hash: str) -> None:
+        if (agent_name, instruction_hash) in self._checked_instructions:
+            return
+        self._checked_instructions.add((agent_name, instruction_hash))
+        removed = self.invalidate(agent_name, keep_instruction_hash=instruction_hash)
+        if removed:
+            logger.info("Parse cache: instruction for %s changed, purged %d entries", agent_name, removed)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores}
+
+    def callbacks(self, required_keys: Iterable[str]) -> Tuple[Callable, Callable]:
+        """
+        Build (before_model_callback, after_model_callback) for a parse agent.
+        Replies are only stored if they are a JSON object containing `required_keys`.
+        """
+        required_keys = tuple(required_keys)
+
+        def before_model_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+            text = _content_text(callback_context.user_content)
+            if not text:
+                return None
+            instruction = str(llm_request.config.system_instruction or "") if llm_request.config else ""
+            instruction_hash = _sha256(instruction)
+            agent_name = callback_context.agent_name
+            self._purge_old_instructions(agent_name, instruction_hash)
+
+            key = self.make_key(agent_name, llm_request.model, instruction_hash, text)
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                return LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part.from_text(text=json.dumps(cached))])
+                )
+            self.misses += 1
+            self._pending[(callback_context.invocation_id, agent_name)] = (key, instruction_hash)
+            return None
+
+        def after_model_callback(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+            pending = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+            if pending is None or llm_response.partial or not llm_response.content:
+                return None
+            if any(part.function_call for part in llm_response.content.parts or []):
+                return None
+            try:
+                value = json.loads(_FENCE.sub("", _content_text(llm_response.content)))
+            except ValueError:
+                return None
+            if isinstance(value, dict) and all(k in value for k in required_keys):
+                key, instruction_hash = pending
+                self.put(key, callback_context.agent_name, instruction_hash, value)
+            return None
+
+        return before_model_callback, after_model_callback
+
+
+_default_cache: Optional[ParseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Process-wide cache, opened on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParseCache()
+    return _default_cache
+
+
+def parse_cache_callbacks(required_keys: Iterable[str]) -> Tuple[Callable, Callable]:
+    """Callbacks bound to the process-wide cache (the SQLite file is opened on first use)."""
+    bound: list = []
+
+    def _bound() -> list:
+        if not bound:
+            bound.extend(get_parse_cache().callbacks(required_keys))
+        return bound
+
+    def before_model_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        return _bound()[0](callback_context=callback_context, llm_request=llm_request)
+
+    def after_model_callback(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        return _bound()[1](callback_context=callback_context, llm_response=llm_response)
+
+    return before_model_callback, after_model_callback
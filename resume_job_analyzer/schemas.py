@@ -0,0 +1,138 @@
+# schemas.py
+#
+# Pydantic models for the JSON each specialist agent must return.
+# They are used to validate (and lightly coerce) replies in
+# output_validation.py rather than as ADK `output_schema`, which would forbid
+# tools on job_fit_analyst_agent.
+#
+# Coercions are deliberately small: a bare string where a list is expected
+# becomes a one-item list, and scores like "85", 85.4 or "85%" become integers
+# clamped to 0-100.
+
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+def _as_list(value: Any) -> Any:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    return value
+
+
+def _as_text(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return value
+
+
+def _as_score(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip().rstrip("%").strip()
+        try:
+            value = float(value)
+        except ValueError:
+            return value  # let pydantic report it
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return max(0, min(100, round(value)))
+    return value
+
+
+class _AgentOutput(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+
+class ResumeProfile(_AgentOutput):
+    key_skills: List[str]
+    experience_highlights: List[str]
+    education: List[str] = []
+    weaknesses: List[str] = []
+
+    _lists = field_validator("key_skills", "experience_highlights", "education", "weaknesses", mode="before")(_as_list)
+
+
+class JDProfile(_AgentOutput):
+    role_title: str
+    seniority_level: str = ""
+    location_type: str = ""
+    core_responsibilities: List[str] = []
+    must_have_skills: List[str]
+    nice_to_have_skills: List[str] = []
+    experience_requirements: List[str] = []
+    keywords_for_ats: List[str] = []
+
+    _texts = field_validator("role_title", "seniority_level", "location_type", mode="before")(_as_text)
+    _lists = field_validator(
+        "core_responsibilities",
+        "must_have_skills",
+        "nice_to_have_skills",
+        "experience_requirements",
+        "keywords_for_ats",
+        mode="before",
+    )(_as_list)
+
+
+class JobFit(_AgentOutput):
+    overall_fit: int
+    technical_fit: int
+    domain_fit: int
+    seniority_fit: int
+    matched_skills: List[str] = []
+    missing_must_have_skills: List[str] = []
+    missing_nice_to_have_skills: List[str] = []
+    strengths_summary: List[str] = []
+    gaps_summary: List[str] = []
+    recommendations: List[str] = []
+
+    _scores = field_validator("overall_fit", "technical_fit", "domain_fit", "seniority_fit", mode="before")(_as_score)
+    _lists = field_validator(
+        "matched_skills",
+        "missing_must_have_skills",
+        "missing_nice_to_have_skills",
+        "strengths_summary",
+        "gaps_summary",
+        "recommendations",
+        mode="before",
+    )(_as_list)
+
+
+class ExperienceSection(_AgentOutput):
+    role_title: str = ""
+    company: str = ""
+    location: str = ""
+    dates: str = ""
+    original_bullets: List[str] = []
+    enhanced_bullets: List[str] = []
+
+    _texts = field_validator("role_title", "company", "location", "dates", mode="before")(_as_text)
+    _lists = field_validator("original_bullets", "enhanced_bullets", mode="before")(_as_list)
+
+
+class ResumeEnhancement(_AgentOutput):
+    improved_summary: str
+    improved_experience_sections: List[ExperienceSection]
+    improved_skills_section: List[str] = []
+    education_section: List[str] = []
+    tailoring_notes_for_candidate: List[str] = []
+
+    _summary = field_validator("improved_summary", mode="before")(_as_text)
+    _lists = field_validator(
+        "improved_experience_sections",
+        "improved_skills_section",
+        "education_section",
+        "tailoring_notes_for_candidate",
+        mode="before",
+    )(_as_list)
+
+
+# agent name -> schema of its reply
+OUTPUT_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    "analyze_resume_agent": ResumeProfile,
+    "jd_summarize_agent": JDProfile,
+    "job_fit_analyst_agent": JobFit,
+    "analyze_resume_enhancer_agent": ResumeEnhancement,
+}
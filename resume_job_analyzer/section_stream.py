@@ -0,0 +1,114 @@
+# section_stream.py
+#
+# Incremental delivery of analyze_resume_enhancer_agent's experience sections.
+#
+# The enhancer returns one large JSON object, with every role inside
+# "improved_experience_sections". With SSE streaming the reply arrives in text
+# chunks; ArrayItemParser scans them once, character by character, and returns
+# each element of that array as soon as its closing brace arrives. Callers can
+# show the first role while gemini-2.5-pro is still writing the rest.
+#
+# stream_array_items() runs an agent in streaming mode and yields
+# ("item", dict) for every completed element, then ("final", reply_text) with
+# the full reply (after the output-validation callback has repaired it).
+
+import json
+import logging
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+
+from .agent_runner import run_agent_events
+
+
+SECTIONS_KEY = "improved_experience_sections"
+
+logger = logging.getLogger(__name__)
+
+
+class ArrayItemParser:
+    """
+    Streaming extractor for the elements of a top-level array field.
+
+    feed() may be called with arbitrary chunks; it returns the elements of
+    `key` that were completed by this chunk, parsed as JSON.
+    """
+
+    def __init__(self, key: str = SECTIONS_KEY):
+        self.key = key
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start = -1
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        self._text += chunk
+        text = self._text
+        items = []
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start + 1 : i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                if char == "[" and self._depth == 1 and self._last_key == self.key and not self.done:
+                    self._array_depth = self._depth + 1
+                elif char == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._array_depth is None:
+                    continue
+                if char == "}" and self._depth == self._array_depth and self._item_start >= 0:
+                    try:
+                        items.append(json.loads(text[self._item_start : i + 1]))
+                    except ValueError as e:  # e.g. trailing comma; the final reply gets repaired
+                        logger.debug("Skipping unparsable streamed item: %s", e)
+                    self._item_start = -1
+                elif char == "]" and self._depth == self._array_depth - 1:
+                    self._array_depth = None
+                    self.done = True
+        self._pos = len(text)
+        return items
+
+
+async def stream_array_items(
+    agent: BaseAgent,
+    message: str,
+    key: str = SECTIONS_KEY,
+    state: Optional[Dict[str, Any]] = None,
+) -> AsyncGenerator[Tuple[str, Any], None]:
+    """
+    Run `agent` with streaming and yield ("item", element) for each completed
+    element of `key`, then ("final", full_reply_text).
+    """
+    parser = ArrayItemParser(key)
+    final_text = ""
+    async for event in run_agent_events(agent, message, state, stream=True):
+        if not event.content or not event.content.parts:
+            continue
+        text = "".join(part.text or "" for part in event.content.parts)
+        if event.partial:
+            for item in parser.feed(text):
+                yield "item", item
+        elif event.is_final_response():
+            final_text = text
+    yield "final", final_text
@@ -0,0 +1,212 @@
+# skill_index.py
+#
+# Vector index of canonical skills for semantic skill matching.
+#
+# Every skill is reduced to its core words (canonical form, per-word synonyms,
+# no filler like "experience with" or qualifiers like "DB") and embedded as a
+# hashed character n-gram + word vector
+# (deterministic: crc32 feature hashing, no model download), L2-normalized, so
+# a cosine similarity is a dot product. The vocabulary (canonical names from the
+# synonym table plus SKILL_CATEGORIES) is stored as a float32 .npy matrix and
+# loaded with a memory map, so processes share the pages and start instantly.
+#
+# match() compares a whole required-skill list against a whole available-skill
+# list with one matrix product:
+#   1. direct: cosine(required, available) >= DIRECT_THRESHOLD
+#      ("PostgreSQL DB" vs "PostgreSQL", "Kubernetes cluster" vs "Kubernetes"),
+#   2. category: the required skill snaps to a category ("relational databases")
+#      and an available skill snaps to one of its members ("postgresql").
+#
+# skill_matcher.match_skills() uses it as the last matching stage, so
+# score_job_fit (job_fit_analyst_agent's tool) gets it automatically.
+#
+# Env: RESUME_SKILL_INDEX_DIR (default .cache/skill_index), rebuilt when the
+# vocabulary or DIM changes.
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .skill_matcher import _STOPWORDS, SYNONYMS, canonicalize
+
+
+DIM = 1024
+NGRAM = 3
+DIRECT_THRESHOLD = 0.82
+SNAP_THRESHOLD = 0.75
+DEFAULT_INDEX_DIR = os.path.join(".cache", "skill_index")
+
+# category -> member skills (canonical names)
+SKILL_CATEGORIES: Dict[str, List[str]] = {
+    "relational databases": ["postgresql", "mysql", "sql server", "oracle database", "sqlite", "mariadb"],
+    "nosql databases": ["mongodb", "cassandra", "dynamodb", "redis", "couchbase", "elasticsearch"],
+    "cloud platforms": ["google cloud", "amazon web services", "microsoft azure"],
+    "frontend frameworks": ["react", "vue", "angular", "svelte", "next.js"],
+    "backend frameworks": ["django", "flask", "fastapi", "spring", "express", "rails", ".net"],
+    "containerization": ["docker", "kubernetes", "podman", "helm"],
+    "infrastructure as code": ["terraform", "cloudformation", "pulumi", "ansible"],
+    "ci cd": ["jenkins", "github actions", "gitlab ci", "circleci", "argo cd"],
+    "deep learning": ["tensorflow", "pytorch", "keras", "jax"],
+    "machine learning": ["scikit-learn", "xgboost", "lightgbm", "deep learning"],
+    "mlops": ["mlflow", "kubeflow", "vertex ai", "sagemaker", "airflow"],
+    "big data": ["spark", "hadoop", "kafka", "flink", "hive", "databricks"],
+    "data visualization": ["tableau", "power bi", "looker", "matplotlib", "plotly"],
+    "version control": ["git", "github", "gitlab", "bitbucket"],
+    "object-oriented programming": ["java", "c++", "c#", "python"],
+}
+
+
+# Generic words that qualify a skill without changing it ("Postgres DB", "Kubernetes cluster")
+_QUALIFIERS = {"db", "database", "databases", "cluster", "clusters", "ops", "development", "developer",
+               "framework", "frameworks", "language", "languages", "library", "libraries", "stack"}
+
+
+def _embedding_text(skill: str) -> str:
+    """Canonical form with per-word synonyms applied and filler / qualifier words dropped."""
+    text = canonicalize(skill)
+    words = [SYNONYMS.get(word, word) for word in text.split() if word not in _STOPWORDS]
+    core = [word for word in words if word not in _QUALIFIERS]
+    return " ".join(core or words) or text
+
+
+def _feature_ids(text: str) -> List[int]:
+    padded = f" {text} "
+    grams = [padded[i : i + NGRAM] for i in range(len(padded) - NGRAM + 1)]
+    words = [f"w:{word}" for word in text.split()]
+    return [zlib.crc32(feature.encode("utf-8")) for feature in grams + words]
+
+
+@lru_cache(maxsize=16384)
+def embed(skill: str) -> np.ndarray:
+    """Unit-length float32 vector of a skill's canonical form (read-only, cached)."""
+    vector = np.zeros(DIM, dtype=np.float32)
+    for feature in _feature_ids(_embedding_text(skill)):
+        # the top bit picks the sign, which keeps hash collisions from only adding up
+        vector[feature % DIM] += 1.0 if feature & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector.setflags(write=False)
+    return vector
+
+
+def embed_many(skills: Sequence[str]) -> np.ndarray:
+    if not skills:
+        return np.zeros((0, DIM), dtype=np.float32)
+    return np.stack([embed(skill) for skill in skills])
+
+
+def _vocabulary() -> Tuple[List[str], Dict[str, str]]:
+    """(names, member -> category) for the index."""
+    member_of: Dict[str, str] = {}
+    names = set(SYNONYMS.values()) | set(SKILL_CATEGORIES)
+    for category, members in SKILL_CATEGORIES.items():
+        for member in members:
+            names.add(member)
+            member_of.setdefault(member, category)
+    return sorted(names), member_of
+
+
+class SkillIndex:
+    """
+    Memory-mapped matrix of canonical skill vectors plus the category table.
+
+    Args:
+        directory: Where vectors.npy / vocab.json live. Env: RESUME_SKILL_INDEX_DIR.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.getenv("RESUME_SKILL_INDEX_DIR", DEFAULT_INDEX_DIR)
+        names, self.member_of = _vocabulary()
+        fingerprint = hashlib.sha256(json.dumps([DIM, NGRAM, names]).encode("utf-8")).hexdigest()
+        self.names, vectors = self._load_or_build(names, fingerprint)
+        # plain ndarray view of the memory map (skips np.memmap's per-op overhead)
+        self.vectors = np.asarray(vectors)
+        self._snaps: Dict[str, Optional[str]] = {}
+        self._snaps_lock = threading.Lock()
+
+    def _load_or_build(self, names: List[str], fingerprint: str) -> Tuple[List[str], np.ndarray]:
+        vectors_path = os.path.join(self.directory, "vectors.npy")
+        vocab_path = os.path.join(self.directory, "vocab.json")
+        try:
+            with open(vocab_path, "r", encoding="utf-8") as f:
+                vocab = json.load(f)
+            if vocab.get("fingerprint") == fingerprint:
+                return vocab["names"], np.load(vectors_path, mmap_mode="r")
+        except (OSError, ValueError):
+            pass
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{vectors_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, embed_many(names))
+        os.replace(tmp_path, vectors_path)
+        with open(vocab_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "names": names}, f)
+        return names, np.load(vectors_path, mmap_mode="r")
+
+    def snap(self, skills: Sequence[str]) -> List[Optional[str]]:
+        """
+        Nearest vocabulary entry for each skill, or None below SNAP_THRESHOLD.
+        Results are memoized per skill string; unseen skills are snapped in one batch.
+        """
+        with self._snaps_lock:
+            unseen = list(dict.fromkeys(skill for skill in skills if skill not in self._snaps))
+        if unseen:
+            similarity = embed_many(unseen) @ self.vectors.T
+            best = similarity.argmax(axis=1)
+            scores = similarity[np.arange(len(best)), best]
+            with self._snaps_lock:
+                for skill, i, score in zip(unseen, best, scores):
+                    self._snaps[skill] = self.names[i] if score >= SNAP_THRESHOLD else None
+        with self._snaps_lock:
+            return [self._snaps[skill] for skill in skills]
+
+    def match(self, required: Sequence[str], available: Sequence[str]) -> List[Optional[str]]:
+        """
+        For each required skill, the available skill that satisfies it (or None).
+        """
+        if not required or not available:
+            return [None] * len(required)
+        similarity = embed_many(required) @ embed_many(available).T
+        best = similarity.argmax(axis=1)
+        direct = similarity[np.arange(len(required)), best] >= DIRECT_THRESHOLD
+
+        required_snaps = self.snap(required)
+        available_categories: Dict[str, int] = {}
+        for i, snapped in enumerate(self.snap(available)):
+            category = self.member_of.get(snapped) if snapped else None
+            if category:
+                available_categories.setdefault(category, i)
+                # one level up, e.g. pytorch -> deep learning -> machine learning
+                parent = self.member_of.get(category)
+                if parent:
+                    available_categories.setdefault(parent, i)
+
+        matches: List[Optional[str]] = []
+        for i, snapped in enumerate(required_snaps):
+            if direct[i]:
+                matches.append(available[best[i]])
+            elif snapped in SKILL_CATEGORIES and snapped in available_categories:
+                matches.append(available[available_categories[snapped]])
+            else:
+                matches.append(None)
+        return matches
+
+
+_default_index: Optional[SkillIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_skill_index() -> SkillIndex:
+    """Process-wide index, loaded (or built) on first use."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SkillIndex()
+    return _default_index
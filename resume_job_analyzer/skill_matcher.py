@@ -0,0 +1,255 @@
+# skill_matcher.py
+#
+# Deterministic job-fit scoring used by job_fit_analyst_agent as a FunctionTool.
+# The model only writes the prose fields (strengths, gaps, recommendations);
+# skill matching and the four numeric scores are computed here:
+#   1. canonicalize skills (lowercase, punctuation, synonym table),
+#   2. match JD skills against resume skills (exact, token-subset, fuzzy, then
+#      the vector index in skill_index.py for near-variants and categories);
+#      very short skills ("R", "C", "Go") only match as a whole skill,
+#   3. combine coverage ratios into weighted 0-100 scores.
+
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+FUZZY_THRESHOLD = 0.88
+SHORT_SKILL_CHARS = 2  # canonical skills this short need an exact match ("r" is not "r d management")
+
+# Score weights
+MUST_HAVE_WEIGHT = 0.75
+NICE_TO_HAVE_WEIGHT = 0.25
+OVERALL_WEIGHTS = {"technical_fit": 0.5, "domain_fit": 0.25, "seniority_fit": 0.25}
+
+# alias -> canonical name. Canonical names map to themselves implicitly.
+SYNONYMS: Dict[str, str] = {
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "golang": "go",
+    "py": "python",
+    "python3": "python",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "llm": "large language models",
+    "llms": "large language models",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "aws": "amazon web services",
+    "azure": "microsoft azure",
+    "ci/cd": "ci cd",
+    "cicd": "ci cd",
+    "tf": "tensorflow",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "nosql": "nosql databases",
+    "rdbms": "relational databases",
+    "oop": "object-oriented programming",
+    "ab testing": "a/b testing",
+    "stats": "statistics",
+    "c plus plus": "c++",
+    "cpp": "c++",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "dotnet": ".net",
+}
+
+_PARENS = re.compile(r"\(([^)]*)\)")
+_NON_SKILL_CHARS = re.compile(r"[^a-z0-9+#./ -]")
+_ALTERNATIVES = re.compile(r",|;|\bor\b|\band\b")
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)")
+
+# Filler words in JD phrasing like "Experience with MLOps tools"
+_STOPWORDS = {"experience", "with", "in", "of", "and", "or", "the", "a", "an", "knowledge", "tools",
+              "proficiency", "familiarity", "strong", "solid", "skills", "using", "platforms", "platform"}
+
+SENIORITY_YEARS = {
+    "intern": 0,
+    "junior": 1,
+    "entry": 1,
+    "mid": 3,
+    "intermediate": 3,
+    "senior": 5,
+    "staff": 7,
+    "lead": 7,
+    "principal": 10,
+    "director": 10,
+}
+
+
+def canonicalize(skill: str) -> str:
+    """Lowercase, strip punctuation / parentheticals and map through the synonym table."""
+    text = _PARENS.sub(" ", skill.lower())
+    text = _NON_SKILL_CHARS.sub(" ", text)
+    text = " ".join(text.split()).strip(" .-/")
+    return SYNONYMS.get(text, text)
+
+
+@lru_cache(maxsize=8192)
+def _variants(skill: str) -> FrozenSet[str]:
+    """
+    Canonical forms a single JD/resume entry stands for. "Cloud platforms (GCP, AWS, or Azure)"
+    yields the full phrase plus each alternative, and matches if any of them matches.
+    """
+    variants = {canonicalize(skill)}
+    for group in _PARENS.findall(skill):
+        for alternative in _ALTERNATIVES.split(group.lower()):
+            alternative = canonicalize(alternative)
+            if alternative:
+                variants.add(alternative)
+    variants.discard("")
+    return frozenset(variants)
+
+
+@lru_cache(maxsize=8192)
+def _tokens(skill: str) -> FrozenSet[str]:
+    return frozenset(token for token in skill.split() if token not in _STOPWORDS)
+
+
+@lru_cache(maxsize=65536)
+def _matches(required: str, have: str) -> bool:
+    if required == have:
+        return True
+    if len(required) <= SHORT_SKILL_CHARS:
+        return False
+    required_tokens = _tokens(required)
+    # "experience with mlops tools" vs "mlops", "machine learning" vs "machine learning engineering"
+    if required_tokens and required_tokens <= _tokens(have):
+        return True
+    matcher = SequenceMatcher(None, required, have)
+    # real_quick_ratio() is an O(1) upper bound; skip the full diff when it can't pass
+    return matcher.real_quick_ratio() >= FUZZY_THRESHOLD and matcher.ratio() >= FUZZY_THRESHOLD
+
+
+def match_skills(required: Iterable[str], available: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split `required` into (matched, missing) against `available`.
+    Returned skills keep the JD's original wording.
+    """
+    available = list(available)
+    available_variants = set()
+    for skill in available:
+        available_variants |= _variants(skill)
+
+    matched, missing = [], []
+    for skill in required:
+        variants = _variants(skill)
+        if not variants:
+            continue
+        if variants & available_variants or any(
+            _matches(v, a) for v in variants for a in available_variants
+        ):
+            matched.append(skill)
+        else:
+            missing.append(skill)
+
+    if missing and available:
+        # imported here: skill_index builds on this module's canonicalize()
+        from .skill_index import get_skill_index
+
+        found = get_skill_index().match(missing, available)
+        matched += [skill for skill, match in zip(missing, found) if match is not None]
+        missing = [skill for skill, match in zip(missing, found) if match is None]
+    return matched, missing
+
+
+def _coverage(matched: List[str], missing: List[str]) -> Optional[float]:
+    total = len(matched) + len(missing)
+    return len(matched) / total if total else None
+
+
+def _max_years(lines: Iterable[str]) -> Optional[float]:
+    years = [float(m) for line in lines for m in _YEARS.findall(str(line).lower())]
+    return max(years) if years else None
+
+
+def _required_years(jd_profile: dict) -> Optional[float]:
+    years = _max_years(jd_profile.get("experience_requirements") or [])
+    if years is not None:
+        return years
+    level = str(jd_profile.get("seniority_level") or "").lower()
+    for name, level_years in SENIORITY_YEARS.items():
+        if name in level:
+            return float(level_years)
+    return None
+
+
+def technical_fit(must_matched, must_missing, nice_matched, nice_missing) -> int:
+    must = _coverage(must_matched, must_missing)
+    nice = _coverage(nice_matched, nice_missing)
+    if must is None and nice is None:
+        return 50
+    if must is None:
+        return round(100 * nice)
+    if nice is None:
+        return round(100 * must)
+    return round(100 * (MUST_HAVE_WEIGHT * must + NICE_TO_HAVE_WEIGHT * nice))
+
+
+def domain_fit(resume_profile: dict, jd_profile: dict) -> int:
+    """Share of the JD's ATS keywords found in the resume's skills or experience text."""
+    keywords = jd_profile.get("keywords_for_ats") or []
+    if not keywords:
+        return 50
+    resume_terms = list(resume_profile.get("key_skills") or [])
+    resume_terms += list(resume_profile.get("experience_highlights") or [])
+    matched, missing = match_skills(keywords, resume_terms)
+    return round(100 * len(matched) / (len(matched) + len(missing)))
+
+
+def seniority_fit(resume_profile: dict, jd_profile: dict) -> int:
+    required = _required_years(jd_profile)
+    have = _max_years(resume_profile.get("experience_highlights") or [])
+    if required is None or have is None:
+        return 50
+    if required <= 0 or have >= required:
+        return 100
+    return round(100 * have / required)
+
+
+def score_job_fit(resume_profile: dict, jd_profile: dict) -> dict:
+    """
+    Deterministically compute skill matches and fit scores for a resume against a JD.
+
+    Args:
+        resume_profile: JSON output of analyze_resume_agent (key_skills, experience_highlights, ...).
+        jd_profile: JSON output of jd_summarize_agent (must_have_skills, nice_to_have_skills, ...).
+
+    Returns:
+        dict with overall_fit, technical_fit, domain_fit, seniority_fit (integers 0-100),
+        matched_skills, missing_must_have_skills and missing_nice_to_have_skills.
+    """
+    key_skills = resume_profile.get("key_skills") or []
+    must_matched, must_missing = match_skills(jd_profile.get("must_have_skills") or [], key_skills)
+    nice_matched, nice_missing = match_skills(jd_profile.get("nice_to_have_skills") or [], key_skills)
+
+    scores = {
+        "technical_fit": technical_fit(must_matched, must_missing, nice_matched, nice_missing),
+        "domain_fit": domain_fit(resume_profile, jd_profile),
+        "seniority_fit": seniority_fit(resume_profile, jd_profile),
+    }
+    overall = round(sum(scores[name] * weight for name, weight in OVERALL_WEIGHTS.items()))
+
+    return {
+        "overall_fit": overall,
+        **scores,
+        "matched_skills": must_matched + nice_matched,
+        "missing_must_have_skills": must_missing,
+        "missing_nice_to_have_skills": nice_missing,
+    }
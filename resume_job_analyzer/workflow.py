@@ -0,0 +1,249 @@
+# workflow.py
+#
+# Deterministic alternative to the LLM-routed root_agent:
+#
+#   route_input ──► ParallelAgent(parse_resume_step, parse_jd_step) ──► job_fit_step ──► resume_enhancer_step
+#
+# - route_input splits the user message into resume / JD sections (by their
+#   "Resume:" / "Job Description:" headings) and detects whether the user asked
+#   for a tailored resume. No model call.
+# - Each step runs one specialist agent on a message built from session state
+#   and stores its parsed JSON under the agent's output_key. Steps whose inputs
+#   are missing are skipped, which covers the resume-only and JD-only cases.
+#   Steps whose upstream step failed store {"error": ...} naming it instead of
+#   spending a model call on a missing profile.
+# - The enhancer step streams: each improved experience section is emitted as
+#   its own provisional (partial) event as soon as it is complete
+#   (section_stream.py), before the full reply is validated and stored.
+#   RESUME_ENHANCER_STREAM=0 turns this off.
+#
+# Select it with RESUME_ANALYZER_ROOT=workflow (see agent.py).
+
+import json
+import os
+import re
+from typing import Any, AsyncGenerator, Callable, Dict, Optional, Tuple
+
+from google.adk.agents import BaseAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .agent_runner import escalation_state, run_agent_json, validate_or_retry
+from .context_budget import assemble_context
+from .output_validation import validate_output
+from .schemas import OUTPUT_SCHEMAS
+from .section_stream import SECTIONS_KEY, stream_array_items
+
+
+RESUME_TEXT_KEY = "resume_text"
+JD_TEXT_KEY = "jd_text"
+WANTS_ENHANCEMENT_KEY = "wants_enhancement"
+
+_RESUME_HEADING = re.compile(r"^[ \t#*]*(?:my\s+)?(?:resume|cv|curriculum vitae)\b[ \t*]*[:\-]", re.I | re.M)
+_JD_HEADING = re.compile(
+    r"^[ \t#*]*(?:(?:the\s+)?job\s+description|jd|job\s+posting|job\s+ad|role\s+description)\b[ \t*]*[:\-]",
+    re.I | re.M,
+)
+_ENHANCE_INTENT = re.compile(r"\b(tailor|update|enhance|improve|rewrite|optimi[sz]e)\w*", re.I)
+_JD_HINTS = re.compile(r"\b(responsibilities|requirements|we are looking|you will|qualifications|must have)\b", re.I)
+
+
+def split_user_message(text: str) -> Dict[str, Any]:
+    """
+    Split a user message into {resume_text, jd_text, wants_enhancement}.
+
+    Sections start at a "Resume:" / "CV:" or "Job Description:" / "JD:" heading and
+    run until the next heading. Text before the first heading is the request itself
+    and is only used to detect enhancement intent. Without any heading, the whole
+    message is treated as a single document (a JD if it reads like one).
+    """
+    headings = sorted(
+        [(m.start(), m.end(), RESUME_TEXT_KEY) for m in _RESUME_HEADING.finditer(text)]
+        + [(m.start(), m.end(), JD_TEXT_KEY) for m in _JD_HEADING.finditer(text)]
+    )
+    result: Dict[str, Any] = {RESUME_TEXT_KEY: "", JD_TEXT_KEY: "", WANTS_ENHANCEMENT_KEY: False}
+
+    if not headings:
+        key = JD_TEXT_KEY if _JD_HINTS.search(text) else RESUME_TEXT_KEY
+        result[key] = text.strip()
+        return result
+
+    request = text[: headings[0][0]]
+    for i, (_, body_start, key) in enumerate(headings):
+        body_end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+        section = text[body_start:body_end].strip()
+        result[key] = f"{result[key]}\n\n{section}".strip() if result[key] else section
+    result[WANTS_ENHANCEMENT_KEY] = bool(_ENHANCE_INTENT.search(request))
+    return result
+
+
+class InputRouterAgent(BaseAgent):
+    """Writes resume_text / jd_text / wants_enhancement to session state."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        parts = ctx.user_content.parts if ctx.user_content and ctx.user_content.parts else []
+        text = "".join(part.text or "" for part in parts)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=split_user_message(text)),
+        )
+
+
+class StateInputStep(BaseAgent):
+    """
+    Runs `agent` on a message built from session state and stores its validated
+    JSON reply (or {"error": ...} if it stayed unusable after a retry).
+
+    `build_message(state)` returns the message text, or None to skip the step.
+    If a state key in `requires` holds an {"error": ...} result, the step stores
+    an error naming it without calling the model.
+    The agent runs in its own child session (like AgentTool), so it only sees the
+    message built for it, not the whole conversation.
+    """
+
+    agent: BaseAgent
+    build_message: Callable[[Dict[str, Any]], Optional[str]]
+    output_key: str
+    requires: Tuple[str, ...] = ()
+
+    def _upstream_error(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for key in self.requires:
+            value = state.get(key)
+            if isinstance(value, dict) and "error" in value:
+                return {"error": f"skipped, {key} failed: {value['error']}"}
+        return None
+
+    def _result_event(self, ctx: InvocationContext, value: Dict[str, Any], **kwargs: Any) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part.from_text(text=json.dumps(value, ensure_ascii=False))]),
+            actions=EventActions(state_delta={self.output_key: value}),
+            **kwargs,
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        message = self.build_message(dict(ctx.session.state))
+        if message is None:
+            return
+        error = self._upstream_error(ctx.session.state)
+        if error is not None:
+            yield self._result_event(ctx, error)
+            return
+        try:
+            value: Dict[str, Any] = await run_agent_json(self.agent, message)
+        except ValueError as e:
+            value = {"error": str(e)}
+        yield self._result_event(ctx, value)
+
+
+class StreamingSectionsStep(StateInputStep):
+    """
+    StateInputStep that streams the agent's reply and emits every element of
+    `stream_key` as a separate event the moment it is complete.
+
+    Those events come from the first attempt, before validation, so they are
+    provisional: partial=True (the runner does not store them) and
+    custom_metadata {"stream_key", "index"}. The final event carries the kept
+    value. If a retry or escalation changed the elements, it is marked with
+    custom_metadata {"supersedes": stream_key} and the streamed ones should be
+    replaced.
+    """
+
+    stream_key: str = SECTIONS_KEY
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        message = self.build_message(dict(ctx.session.state))
+        if message is None:
+            return
+        error = self._upstream_error(ctx.session.state)
+        if error is not None:
+            yield self._result_event(ctx, error)
+            return
+        state = escalation_state(self.agent, message)
+        reply = ""
+        streamed = []
+        async for kind, payload in stream_array_items(self.agent, message, self.stream_key, state):
+            if kind == "final":
+                reply = payload
+                continue
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                partial=True,
+                custom_metadata={"stream_key": self.stream_key, "index": len(streamed)},
+                content=types.Content(
+                    role="model", parts=[types.Part.from_text(text=json.dumps(payload, ensure_ascii=False))]
+                ),
+            )
+            streamed.append(payload)
+        try:
+            value: Dict[str, Any] = await validate_or_retry(self.agent, message, reply, state)
+        except ValueError as e:
+            value = {"error": str(e)}
+        # compare with the first attempt after validation, which fills in defaults
+        schema = OUTPUT_SCHEMAS.get(self.agent.name)
+        first = validate_output(schema, reply)[0] if schema else value
+        superseded = bool(streamed) and (first or {}).get(self.stream_key) != value.get(self.stream_key)
+        yield self._result_event(ctx, value, custom_metadata={"supersedes": self.stream_key} if superseded else None)
+
+
+def build_workflow_agent(
+    resume_agent: BaseAgent,
+    jd_agent: BaseAgent,
+    fit_agent: BaseAgent,
+    enhancer_agent: BaseAgent,
+    name: str = "resume_workflow_agent",
+) -> SequentialAgent:
+    """Wire the specialist agents into the deterministic workflow."""
+    def resume_message(state: Dict[str, Any]) -> Optional[str]:
+        return state.get(RESUME_TEXT_KEY) or None
+
+    def jd_message(state: Dict[str, Any]) -> Optional[str]:
+        return state.get(JD_TEXT_KEY) or None
+
+    # Downstream inputs are assembled from state within a token budget (context_budget.py).
+    def fit_message(state: Dict[str, Any]) -> Optional[str]:
+        if not (state.get(RESUME_TEXT_KEY) and state.get(JD_TEXT_KEY)):
+            return None
+        return assemble_context(fit_agent.name, state)[0]
+
+    def enhancer_message(state: Dict[str, Any]) -> Optional[str]:
+        if not (state.get(WANTS_ENHANCEMENT_KEY) and state.get(RESUME_TEXT_KEY) and state.get(JD_TEXT_KEY)):
+            return None
+        return assemble_context(enhancer_agent.name, state)[0]
+
+    enhancer_step_cls = StateInputStep if os.getenv("RESUME_ENHANCER_STREAM", "1") == "0" else StreamingSectionsStep
+
+    return SequentialAgent(
+        name=name,
+        sub_agents=[
+            InputRouterAgent(name="route_input"),
+            ParallelAgent(
+                name="parse_inputs",
+                sub_agents=[
+                    StateInputStep(name="parse_resume_step", agent=resume_agent, build_message=resume_message, output_key=resume_agent.output_key),
+                    StateInputStep(name="parse_jd_step", agent=jd_agent, build_message=jd_message, output_key=jd_agent.output_key),
+                ],
+            ),
+            StateInputStep(
+                name="job_fit_step",
+                agent=fit_agent,
+                build_message=fit_message,
+                output_key=fit_agent.output_key,
+                requires=(resume_agent.output_key, jd_agent.output_key),
+            ),
+            enhancer_step_cls(
+                name="resume_enhancer_step",
+                agent=enhancer_agent,
+                build_message=enhancer_message,
+                output_key=enhancer_agent.output_key,
+                requires=(resume_agent.output_key, jd_agent.output_key, fit_agent.output_key),
+            ),
+        ],
+    )
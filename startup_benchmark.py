@@ -0,0 +1,130 @@
+"""Cold-start benchmark for the agent packages.
+
+Every run is a fresh interpreter with -X importtime, so nothing is cached
+between runs. Per package it measures three phases:
+
+  adk      import google.adk.agents (shared by all packages, the baseline)
+  import   import <package>, what adk web's loader and the worker processes pay
+  build    the first <package>.agent.root_agent access, which is what adk web
+           reads (agents, tools, instruction files, .env)
+
+and reports the median over the runs, plus the modules imported by the
+package itself ranked by self time (the -X importtime report, minus
+everything google.adk already pulled in).
+
+Packages are given as <agents dir>/<package>, the way adk web is pointed at
+them; own modules are those from the agents dir.
+
+Run from the repository root:
+  python startup_benchmark.py --runs 5 --top 8
+  python startup_benchmark.py github_agent --runs 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PACKAGES = [
+    "website_page_builder/sequential_manager_agent",
+    "github_agent",
+    "resume_job_analyzer",
+    "redit_summarizer_texttospeech",
+]
+
+_MARK = "--startup-benchmark-import--"
+
+_CHILD = f"""
+import json, sys, time
+t0 = time.perf_counter()
+import google.adk.agents
+t1 = time.perf_counter()
+print({_MARK!r}, file=sys.stderr, flush=True)
+import {{package}} as package
+t2 = time.perf_counter()
+package.agent.root_agent
+t3 = time.perf_counter()
+print(json.dumps({{{{"adk": t1 - t0, "import": t2 - t1, "build": t3 - t2}}}}))
+"""
+
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    """Self time (us) per module imported after the marker line."""
+    self_us: Dict[str, int] = {}
+    lines = stderr.splitlines()
+    start = lines.index(_MARK) + 1 if _MARK in lines else 0
+    for line in lines[start:]:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_col, _, name = line[len("import time:"):].split("|", 2)
+        self_us[name.strip()] = self_us.get(name.strip(), 0) + int(self_col)
+    return self_us
+
+
+def run_once(package: str) -> dict:
+    agents_dir, name = os.path.split(os.path.join(ROOT, package))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.format(package=name)],
+        capture_output=True,
+        text=True,
+        cwd=agents_dir,
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"{package}: {errors[-1] if errors else proc.returncode}")
+    phases = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {**phases, "modules": _parse_importtime(proc.stderr)}
+
+
+def benchmark(package: str, runs: int) -> dict:
+    results = [run_once(package) for _ in range(runs)]
+    modules: Dict[str, List[int]] = {}
+    for result in results:
+        for name, us in result["modules"].items():
+            modules.setdefault(name, []).append(us)
+    return {
+        "adk": statistics.median(r["adk"] for r in results),
+        "import": statistics.median(r["import"] for r in results),
+        "build": statistics.median(r["build"] for r in results),
+        "modules": {name: statistics.median(us) for name, us in modules.items()},
+    }
+
+
+def report(package: str, stats: dict, top: int) -> None:
+    local = set(os.listdir(os.path.dirname(os.path.join(ROOT, package))))
+    own = {name: us for name, us in stats["modules"].items() if name.split(".")[0] in local}
+    other = {name: us for name, us in stats["modules"].items() if name not in own}
+    print(f"\n{package}")
+    print(f"  google.adk baseline : {stats['adk'] * 1000:8.1f} ms")
+    print(f"  import package      : {stats['import'] * 1000:8.1f} ms"
+          f"  ({len(own)} own modules {sum(own.values()) / 1000:.1f} ms,"
+          f" {len(other)} others {sum(other.values()) / 1000:.1f} ms)")
+    print(f"  first root_agent    : {stats['build'] * 1000:8.1f} ms")
+    ranked = sorted(stats["modules"].items(), key=lambda item: item[1], reverse=True)[:top]
+    if ranked:
+        print("  slowest imports (self time):")
+        for name, us in ranked:
+            print(f"    {us / 1000:7.1f} ms  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("packages", nargs="*", default=PACKAGES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="modules to list per package")
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} cold runs per package")
+    for package in args.packages:
+        report(package, benchmark(package, args.runs), args.top)
+
+
+if __name__ == "__main__":
+    main()
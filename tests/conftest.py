@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The website agents import their helpers as the top-level `utils` package,
+# with website_page_builder/ on sys.path (see website_page_builder/*/agent.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "website_page_builder"))
@@ -0,0 +1,157 @@
+import pytest
+
+from utils import html_postprocess
+from utils.html_postprocess import minify_css, minify_js, postprocess_html, subset_css, _unicode_ranges
+
+
+# --- minify_js -------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        # division, not a regex: the "// half" is a real comment
+        ("var a = b / c / d; // half", "var a = b / c / d;"),
+        ("x = f(a) / 2 // half", "x = f(a) / 2"),
+        ("x = (a + b) / 2 /* c */", "x = (a + b) / 2"),
+        ("x = arr[i] / 2", "x = arr[i] / 2"),
+        ("a = i++ / 2", "a = i++ / 2"),
+        ("y = 1 /* a */ / 2", "y = 1 / 2"),
+        # regex literals containing "//", "/*" or "/" in a class stay whole
+        ("var r = /\\/\\/ not a comment/g.test(s); // c", "var r = /\\/\\/ not a comment/g.test(s);"),
+        ("if (x) return /[/]\\d+/.test(y)", "if (x) return /[/]\\d+/.test(y)"),
+        ("let re = x ? /a\\/*b/ : /c/", "let re = x ? /a\\/*b/ : /c/"),
+        ("f(/=/.source)", "f(/=/.source)"),
+        # after the ")" of an if / while / for head a "/" starts a regex
+        ("if (ok) /\\/\\//.test(s) && go()", "if (ok) /\\/\\//.test(s) && go()"),
+        ("if (f(a)) /x\\/\\//.test(y)", "if (f(a)) /x\\/\\//.test(y)"),
+        ("for (const k of ks) /a/.test(k) && n++", "for (const k of ks) /a/.test(k) && n++"),
+    ],
+)
+def test_minify_js_regex_versus_division(source, expected):
+    assert minify_js(source) == expected
+
+
+def test_minify_js_keeps_template_literals_with_nested_expressions():
+    source = "const t = `a ${ {k: '}'}.k } b ${`in ${y /* no */}`} // keep` // drop"
+    assert minify_js(source) == "const t = `a ${ {k: '}'}.k } b ${`in ${y /* no */}`} // keep`"
+
+
+def test_minify_js_keeps_strings_and_line_breaks():
+    assert minify_js("s = '// not /* a comment */'") == "s = '// not /* a comment */'"
+    # line breaks survive (automatic semicolon insertion), blank lines and indentation do not
+    assert minify_js("a = 1\nb = 2\n\n\n    c()\n") == "a = 1\nb = 2\nc()"
+    assert minify_js("a = b\n++c") == "a = b\n++c"
+
+
+def test_minify_js_keeps_license_comments():
+    assert minify_js("/*! MIT */\nx = 1 // y") == "/*! MIT */\nx = 1"
+
+
+@pytest.mark.parametrize("source", ["s = 'unterminated", "x = `${a} ${`", "x = 1 /* open", "r = /abc\n/"])
+def test_minify_js_leaves_untokenizable_scripts_unchanged(source):
+    assert minify_js(source) == source
+
+
+# --- minify_css ------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        # a descendant ":hover" is not the same selector as "a:hover"
+        ("a :hover{color:red}", "a :hover{color:red}"),
+        ("a:hover { color : red ; }", "a:hover{color :red}"),
+        ("a > b , c{margin : 0 auto ;}", "a>b,c{margin :0 auto}"),
+        ("div :is(.a, .b) > p{x:1}", "div :is(.a,.b)>p{x:1}"),
+        ("a::before{content:''}", "a::before{content:''}"),
+        # "and (" needs its space, calc() operators too
+        ("@media (min-width: 600px) and (max-width:800px){.a{x:1}}", "@media (min-width:600px) and (max-width:800px){.a{x:1}}"),
+        (".a{width:calc(100% - 2px)}", ".a{width:calc(100% - 2px)}"),
+        # strings are untouched, comments dropped
+        ('.a{content:"a  /* b */ ;}"} /* x */ .b{}', '.a{content:"a  /* b */ ;}"}.b{}'),
+    ],
+)
+def test_minify_css(source, expected):
+    assert minify_css(source) == expected
+
+
+# --- subset_css ------------------------------------------------------------------
+
+def test_unicode_ranges():
+    assert _unicode_ranges("src:url(x);unicode-range: U+0025-00FF, u+4??, U+131") == [
+        (0x25, 0xFF),
+        (0x400, 0x4FF),
+        (0x131, 0x131),
+    ]
+    assert _unicode_ranges("src:url(x)") is None
+
+
+def test_subset_css_drops_unused_rules_and_font_ranges():
+    css = (
+        "@import url(x.css);"
+        ".a,.b{x:1}.c{x:2}"
+        "@media (max-width:1px){.c{x:4}.a{x:5}}"
+        "@font-face{font-family:L;unicode-range:U+0000-00FF}"
+        "@font-face{font-family:C;unicode-range:U+0400-045F}"
+        "@font-face{font-family:W;unicode-range:U+4??}"
+        "@font-face{font-family:N;src:url(n.woff2)}"
+        ".a[data-x='.q']{x:6}"
+    )
+    assert subset_css(css, {"a"}, {ord("A")}) == (
+        "@import url(x.css);"
+        ".a{x:1}"
+        "@media (max-width:1px){.a{x:5}}"
+        "@font-face{font-family:L;unicode-range:U+0000-00FF}"
+        "@font-face{font-family:N;src:url(n.woff2)}"
+        ".a[data-x='.q']{x:6}"
+    )
+    # a code point inside the wildcard range keeps that face
+    assert "font-family:W" in subset_css(css, set(), {0x4A0})
+
+
+def test_subset_css_functional_pseudo_classes():
+    css = ".c:not(.z){x:1}:is(.a,.z){x:2}.z:is(.a){x:3}"
+    # :not(.unused) matches everything and :is(.a, .unused) still matches .a
+    assert subset_css(css, {"a", "c"}, set()) == ".c:not(.z){x:1}:is(.a,.z){x:2}"
+
+
+# --- postprocess_html ----------------------------------------------------------
+
+PAGE = """<!DOCTYPE html>
+<html>
+  <head>
+    <title>T</title>
+    <style>
+      /* theme */
+      .a { color : red ; }
+    </style>
+  </head>
+  <body>
+    <!-- hero -->
+    <main class="a">Hi</main>
+    <script>
+      // greet
+      console.log(1 / 2)
+    </script>
+  </body>
+</html>
+"""
+
+
+def test_postprocess_html_minifies():
+    page, report = postprocess_html(PAGE)
+    assert not report.reverted
+    assert "<!-- hero -->" not in page and "/* theme */" not in page and "// greet" not in page
+    assert ".a{color :red}" in page and "console.log(1 / 2)" in page
+    assert report.bytes_after < report.bytes_before
+    assert report.validation["errors"] == []
+
+
+def test_postprocess_html_keeps_original_when_validation_gets_worse(monkeypatch):
+    # simulate a minifier bug that drops the document structure
+    monkeypatch.setattr(html_postprocess, "minify_html", lambda html, stats=None: html.replace("<body>", ""))
+    page, report = postprocess_html(PAGE)
+    assert report.reverted
+    assert page == PAGE
+    assert report.bytes_after == report.bytes_before
+    assert report.validation["errors"] == []
+    assert "original markup was kept" in report.summary()
@@ -1,2 +1,9 @@
-from .agent import root_agent
+from . import agent
+
+
+def __getattr__(name):
+    # root_agent is built on first access (see agent.py)
+    if name == "root_agent":
+        return agent.root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -3,7 +3,6 @@ import sys
 from typing import List, Dict
 
 import requests
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 from google.genai import types
@@ -18,32 +17,31 @@ if _website_builder_dir not in sys.path:
 # Import utils with proper path handling
 try:
     from website_page_builder.utils.file_loader import load_text_file
+    from website_page_builder.utils.lazy_agents import lazy_agents
 except ImportError:
     # Fallback: try direct import if website_page_builder is already in path
     from utils.file_loader import load_text_file
-
-
-
-load_dotenv()
+    from utils.lazy_agents import lazy_agents
 
 
 # Path to instruction.txt relative to this file
 BASE_DIR = os.path.dirname(__file__)
 instruction_path = os.path.join(BASE_DIR, "instructions.txt")
 
-instruction_text = load_text_file(instruction_path)
 
-page_designer_agent = Agent(
-    name="page_designer_agent",
-    model="gemini-2.0-flash",
-    description=""" The page_designer_agent acts as the creative architect. It consumes high-level requirement documents
+def build_page_designer_agent() -> Agent:
+    return Agent(
+        name="page_designer_agent",
+        model="gemini-2.0-flash",
+        description=""" The page_designer_agent acts as the creative architect. It consumes high-level requirement documents
     and translates them into a rigorous UI Design Specification. It selects specific color hex codes, defines typography,
     writes marketing copy, and dictates the exact CSS Flexbox/Grid structures and JavaScript logic required. 
     It prepares the detailed 'blueprint' that the code_writer_agent will strictly follow to generate the final single-file HTML.""",
-    instruction=instruction_text,
-    output_key="page_designer_agent_output"
-)
+        instruction=load_text_file(instruction_path),
+        output_key="page_designer_agent_output"
+    )
 
 
 # ADK web expects root_agent (needed when used as sub-agent in SequentialAgent)
-root_agent = page_designer_agent
+# (built on first access, see utils/lazy_agents.py)
+__getattr__ = lazy_agents(__name__, page_designer_agent=build_page_designer_agent, root_agent=build_page_designer_agent)
@@ -0,0 +1,136 @@
+import os
+import re
+import sys
+from typing import AsyncGenerator, List, Tuple
+
+from google.adk.agents import Agent, BaseAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+# Add website_page_builder directory to path for imports
+_current_file = os.path.abspath(__file__)
+_agent_dir = os.path.dirname(_current_file)
+_website_builder_dir = os.path.dirname(_agent_dir)
+if _website_builder_dir not in sys.path:
+    sys.path.insert(0, _website_builder_dir)
+
+# Import utils with proper path handling
+try:
+    from utils.file_loader import load_text_file
+    from utils.lazy_agents import lazy_agents
+    from utils.stage_timing import end_pipeline, end_stage, start_stage, timed
+except ImportError:
+    from website_page_builder.utils.file_loader import load_text_file
+    from website_page_builder.utils.lazy_agents import lazy_agents
+    from website_page_builder.utils.stage_timing import end_pipeline, end_stage, start_stage, timed
+
+
+# The page design is split into independent, section-level jobs that all read
+# only {requirement_write_agent_output} and run concurrently in a ParallelAgent.
+# They agree on CSS variable names and element-id conventions up front (see the
+# instruction files), so no job needs another job's output. DesignSpecMerger
+# then stitches their parts, in template order, into page_designer_agent_output,
+# which code_write_agent consumes unchanged.
+#
+# (agent name, instruction file, output_key)
+DESIGN_JOBS: List[Tuple[str, str, str]] = [
+    ("design_system_agent", "design_system_instructions.txt", "design_system_spec"),
+    ("header_hero_designer_agent", "header_hero_instructions.txt", "header_hero_spec"),
+    ("content_sections_designer_agent", "content_sections_instructions.txt", "content_sections_spec"),
+    ("interaction_designer_agent", "interactions_instructions.txt", "interaction_spec"),
+]
+
+DESIGN_OUTPUT_KEY = "page_designer_agent_output"
+
+BASE_DIR = os.path.dirname(__file__)
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*\n(.*?)\n```\s*$", re.S)
+
+
+def build_design_jobs() -> List[Agent]:
+    """One fresh LlmAgent per design job (an agent can only have one parent)."""
+    return [
+        Agent(
+            name=name,
+            model="gemini-2.0-flash",
+            description=f"Writes one part of the UI Design Specification ({output_key}) from the requirement document.",
+            instruction=load_text_file(os.path.join(BASE_DIR, instruction_file)),
+            # The requirements are already in the instruction; skip the conversation history.
+            include_contents="none",
+            output_key=output_key,
+        )
+        for name, instruction_file, output_key in DESIGN_JOBS
+    ]
+
+
+def _part(text: str, heading: str) -> str:
+    """A job's Markdown without a wrapping code fence, starting with `heading` if it lacks one."""
+    text = (text or "").strip()
+    fenced = _FENCE.match(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    if heading and not text.startswith("#"):
+        text = f"{heading}\n{text}"
+    return text
+
+
+def merge_design_spec(state: dict) -> str:
+    """Stitch the design jobs' outputs into the page_designer_agent template."""
+    parts = [
+        "# UI Design Specification",
+        _part(state.get("design_system_spec", ""), "## 1. Design System & Global Styles"),
+        "## 2. Section-by-Section Design Specs",
+        _part(state.get("header_hero_spec", ""), ""),
+        _part(state.get("content_sections_spec", ""), ""),
+        _part(state.get("interaction_spec", ""), "## 3. Interaction & JavaScript Logic"),
+    ]
+    return "\n\n".join(part for part in parts if part)
+
+
+class DesignSpecMerger(BaseAgent):
+    """
+    Writes the merged UI Design Specification to page_designer_agent_output. No model call.
+    The parts were already shown as the jobs' events, so only the state is updated.
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        spec = merge_design_spec(ctx.session.state)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={DESIGN_OUTPUT_KEY: spec}),
+        )
+
+
+def build_parallel_designer(name: str = "parallel_designer_agent", root: bool = False) -> SequentialAgent:
+    """
+    Design jobs in parallel, then the merge; every stage is timed (utils/stage_timing.py).
+
+    Args:
+        name: Agent name.
+        root: True when this is the top-level agent, which publishes the stage timings.
+    """
+    return SequentialAgent(
+        name=name,
+        sub_agents=[
+            ParallelAgent(
+                name="parallel_page_design",
+                sub_agents=[timed(job) for job in build_design_jobs()],
+                before_agent_callback=start_stage,
+                after_agent_callback=end_stage,
+            ),
+            DesignSpecMerger(name="merge_design_spec", before_agent_callback=start_stage, after_agent_callback=end_stage),
+        ],
+        before_agent_callback=start_stage,
+        after_agent_callback=end_pipeline if root else end_stage,
+    )
+
+
+def _build_root() -> SequentialAgent:
+    return build_parallel_designer(root=True)
+
+
+# ADK web expects root_agent (reads requirement_write_agent_output, like page_designer_agent)
+# (built on first access, see utils/lazy_agents.py)
+__getattr__ = lazy_agents(__name__, parallel_designer_agent=_build_root, root_agent=_build_root)
@@ -3,7 +3,6 @@ import sys
 from typing import List, Dict
 
 import requests
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 from google.genai import types
@@ -19,33 +18,32 @@ if _website_builder_dir not in sys.path:
 # Since website_page_builder is added to sys.path, use direct import
 try:
     from utils.file_loader import load_text_file
+    from utils.lazy_agents import lazy_agents
 except ImportError:
     # Fallback: try full path if direct import doesn't work
     from website_page_builder.utils.file_loader import load_text_file
-
-
-
-load_dotenv()
+    from website_page_builder.utils.lazy_agents import lazy_agents
 
 
 # Path to instruction.txt relative to this file
 BASE_DIR = os.path.dirname(__file__)
 instruction_path = os.path.join(BASE_DIR, "instructions.txt")
 
-instruction_text = load_text_file(instruction_path)
 
-requirement_write_agent = Agent(
-    name="requirement_write_agent",
-    model="gemini-2.0-flash",
-    description=""" You are a helpful assistant that can write website requirements
+def build_requirement_write_agent() -> Agent:
+    return Agent(
+        name="requirement_write_agent",
+        model="gemini-2.0-flash",
+        description=""" You are a helpful assistant that can write website requirements
                 You will translate users ideas into blueprints. User will you what kind of website they need,
                  and you will generate a detailed specification document covering design, layout,
                   and functionality for the design team to build.
             """,
-    instruction= instruction_text,
+        instruction=load_text_file(instruction_path),
     
-    output_key="requirement_write_agent_output"
-)
+        output_key="requirement_write_agent_output"
+    )
 
 # ADK web expects root_agent
-root_agent = requirement_write_agent
\ No newline at end of file
+# (built on first access, see utils/lazy_agents.py)
+__getattr__ = lazy_agents(__name__, requirement_write_agent=build_requirement_write_agent, root_agent=build_requirement_write_agent)
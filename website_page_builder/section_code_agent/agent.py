@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import os
+import sys
+from typing import AsyncGenerator, Dict, List, Optional
+
+from google.adk.agents import Agent, BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import Field
+
+# Add website_page_builder directory to path for imports
+_current_file = os.path.abspath(__file__)
+_agent_dir = os.path.dirname(_current_file)
+_website_builder_dir = os.path.dirname(_agent_dir)
+if _website_builder_dir not in sys.path:
+    sys.path.insert(0, _website_builder_dir)
+
+# Import utils with proper path handling
+try:
+    from utils.file_loader import load_text_file
+    from utils.html_assembly import (
+        Fragment, SectionJob, assemble_page, parse_fragment, split_design_spec, validate_html,
+    )
+    from utils.lazy_agents import lazy_agents
+    from utils.stage_timing import end_pipeline, end_stage, start_stage
+except ImportError:
+    from website_page_builder.utils.file_loader import load_text_file
+    from website_page_builder.utils.html_assembly import (
+        Fragment, SectionJob, assemble_page, parse_fragment, split_design_spec, validate_html,
+    )
+    from website_page_builder.utils.lazy_agents import lazy_agents
+    from website_page_builder.utils.stage_timing import end_pipeline, end_stage, start_stage
+
+
+# Section-parallel alternative to code_write_agent.
+#
+# The UI Design Specification (page_designer_agent_output) is split into parts:
+# the shared design system (":root" variables, reset, global classes and head
+# links), one part per page section, and the script. Every part is generated
+# concurrently by its own short-lived LlmAgent; a reply that is truncated or has
+# unbalanced markup is re-asked for that part only. The fragments are then
+# assembled locally into the single-file layout of code_write_agent's
+# instructions, the merged page is validated, and the result is stored like
+# code_write_agent's reply, under code_write_agent_output.
+#
+# Env: WEBSITE_SECTION_CONCURRENCY (default 8), WEBSITE_SECTION_RETRIES (default 1).
+
+DESIGN_KEY = "page_designer_agent_output"
+CODE_OUTPUT_KEY = "code_write_agent_output"
+VALIDATION_KEY = "code_validation"
+
+BASE_DIR = os.path.dirname(__file__)
+
+logger = logging.getLogger(__name__)
+
+
+def _job_message(job: SectionJob, jobs: List[SectionJob]) -> str:
+    """The user message for one part: its spec plus the context it shares with the others."""
+    specs = {other.kind: other.spec for other in jobs if other.kind in ("base", "script")}
+    outline = "\n".join(
+        f"- {other.title} ({other.kind})" for other in jobs if other.kind not in ("base", "script")
+    )
+    if job.kind == "base":
+        return f"Your part: base\n\n{job.spec or 'No design system given; choose one that fits the page outline.'}\n\nPage outline:\n{outline}"
+    if job.kind == "script":
+        return f"Your part: script\n\nPage outline:\n{outline}\n\n{job.spec}"
+    return "\n\n".join(
+        part
+        for part in (
+            f'Your part: {"section" if job.kind == "main" else job.kind} "{job.title}"',
+            f"Page outline (for navigation links):\n{outline}",
+            f"Design system (defined by the base part, for reference):\n{specs.get('base', '')}",
+            f"Your spec:\n{job.spec}",
+            f"Interactions (your markup must provide the ids they use):\n{specs.get('script', '')}" if specs.get("script") else "",
+        )
+        if part
+    )
+
+
+def _load_instruction() -> str:
+    return load_text_file(os.path.join(BASE_DIR, "instructions.txt"))
+
+
+def _final_text(event: Event) -> str:
+    if not event.is_final_response() or not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text or "" for part in event.content.parts)
+
+
+class SectionCodeWriter(BaseAgent):
+    """
+    Writes code_write_agent_output by generating page sections concurrently and
+    assembling them locally. Falls back to `fallback` (the single-pass
+    code_write_agent) when the design spec has no sections to split on.
+    """
+
+    model: str = "gemini-2.0-flash"
+    instruction: str = Field(default_factory=_load_instruction)
+    concurrency: int = 8
+    max_retries: int = 1
+    fallback: Optional[BaseAgent] = None
+
+    def _job_agent(self, job: SectionJob, message: str) -> Agent:
+        def set_message(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+            # The part's spec goes in as the user turn, so CSS braces are never template-expanded.
+            llm_request.contents = [types.Content(role="user", parts=[types.Part.from_text(text=message)])]
+            return None
+
+        return Agent(
+            name=f"section_code_{job.key}",
+            model=self.model,
+            instruction=self.instruction,
+            include_contents="none",
+            before_model_callback=set_message,
+            before_agent_callback=start_stage,
+            after_agent_callback=end_stage,
+        )
+
+    async def _run_job(
+        self, ctx: InvocationContext, job: SectionJob, message: str, semaphore: asyncio.Semaphore
+    ) -> Fragment:
+        error = ""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                message = f"{message}\n\nYour previous reply was rejected ({error}). Output the complete part again."
+            reply = ""
+            async with semaphore:
+                # The job's events stay out of the session; only the assembled page is recorded.
+                async for event in self._job_agent(job, message).run_async(ctx):
+                    reply = _final_text(event) or reply
+            try:
+                return parse_fragment(job, reply)
+            except ValueError as e:
+                error = str(e)
+                logger.warning("Section %s (attempt %d) rejected: %s", job.key, attempt + 1, error)
+        raise ValueError(error)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        jobs = split_design_spec(ctx.session.state.get(DESIGN_KEY, ""))
+        if not jobs:
+            if self.fallback is None:
+                raise ValueError(f"{DESIGN_KEY} has no sections to generate")
+            logger.info("Design spec has no sections; running %s instead", self.fallback.name)
+            async for event in self.fallback.run_async(ctx):
+                yield event
+            return
+
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        results = await asyncio.gather(
+            *(self._run_job(ctx, job, _job_message(job, jobs), semaphore) for job in jobs), return_exceptions=True
+        )
+        fragments: Dict[str, Fragment] = {}
+        failed: List[str] = []
+        for job, result in zip(jobs, results):
+            if isinstance(result, Fragment):
+                fragments[job.key] = result
+            else:
+                failed.append(f"{job.title}: {result}")
+
+        page = assemble_page(jobs, fragments)
+        report = validate_html(page)
+        report.errors = failed + report.errors
+        if not report.ok:
+            logger.warning("Assembled page has problems: %s", report.errors)
+        text = f"```html\n{page}```"
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part.from_text(text=text)]),
+            actions=EventActions(state_delta={CODE_OUTPUT_KEY: text, VALIDATION_KEY: report.as_dict()}),
+        )
+
+
+def build_section_code_writer(
+    name: str = "section_code_writer", fallback: Optional[BaseAgent] = None, root: bool = False
+) -> SectionCodeWriter:
+    """
+    Args:
+        name: Agent name.
+        fallback: Agent run instead when the design spec cannot be split (e.g. a timed code_write_agent).
+        root: True when this is the top-level agent, which publishes the stage timings.
+    """
+    return SectionCodeWriter(
+        name=name,
+        concurrency=int(os.getenv("WEBSITE_SECTION_CONCURRENCY", "8")),
+        max_retries=int(os.getenv("WEBSITE_SECTION_RETRIES", "1")),
+        fallback=fallback,
+        before_agent_callback=start_stage,
+        after_agent_callback=end_pipeline if root else end_stage,
+    )
+
+
+def _build_root() -> SectionCodeWriter:
+    return build_section_code_writer(root=True)
+
+
+# ADK web expects root_agent (reads page_designer_agent_output, like code_write_agent)
+# (built on first access, see utils/lazy_agents.py)
+__getattr__ = lazy_agents(__name__, section_code_writer=_build_root, root_agent=_build_root)
@@ -2,7 +2,6 @@ import os
 import sys
 from typing import List, Dict
 from google.adk.agents import SequentialAgent
-from dotenv import load_dotenv
 
 # Add the starter_agents directory to path to enable proper imports
 _current_file = os.path.abspath(__file__)
@@ -18,31 +17,102 @@ if _website_builder_dir not in sys.path:
 
 # Import utils with proper path handling
 try:
-    from utils.file_loader import load_text_file
+    from utils.artifact_store import STAGE_KEYS, artifact_callbacks, stream_html_callback
+    from utils.callbacks import add_stage_callbacks
+    from utils.html_postprocess import build_html_postprocessor, postprocess_enabled
+    from utils.lazy_agents import lazy_agents
+    from utils.stage_cache import USER_MESSAGE, stage_cache_callbacks, stage_cache_enabled
+    from utils.stage_timing import end_pipeline, start_stage, timed
 except ImportError:
-    from website_page_builder.utils.file_loader import load_text_file
+    from website_page_builder.utils.artifact_store import STAGE_KEYS, artifact_callbacks, stream_html_callback
+    from website_page_builder.utils.callbacks import add_stage_callbacks
+    from website_page_builder.utils.html_postprocess import build_html_postprocessor, postprocess_enabled
+    from website_page_builder.utils.lazy_agents import lazy_agents
+    from website_page_builder.utils.stage_cache import USER_MESSAGE, stage_cache_callbacks, stage_cache_enabled
+    from website_page_builder.utils.stage_timing import end_pipeline, start_stage, timed
 
-load_dotenv()
+# Import sub-agent builders directly from their agent modules
+# Since we've added website_page_builder to sys.path, we can use the shorter import path
+from requirement_write_agent.agent import build_requirement_write_agent
+from page_designer_agent.agent import build_page_designer_agent
+from code_write_agent.agent import build_code_write_agent
+from parallel_designer_agent.agent import build_parallel_designer
+from section_code_agent.agent import build_section_code_writer
 
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+# WEBSITE_BUILDER_PIPELINE selects how the design spec is produced:
+#   sequential (default): requirement_write_agent -> page_designer_agent -> code_write_agent
+#   parallel:             requirement_write_agent -> parallel_designer_agent -> code_write_agent
+#                         (design system, header/hero, content sections and interactions
+#                         are written concurrently and merged into page_designer_agent_output)
+# WEBSITE_CODE_WRITER selects how the HTML is produced:
+#   single (default): code_write_agent writes the whole index.html in one generation
+#   sections:         section_code_writer generates every page section concurrently and
+#                     assembles and validates the page locally (falls back to
+#                     code_write_agent if the design spec has no sections)
+# Every stage is timed; the run's timings are stored in state under "stage_timings".
+#
+# Every stage's output is stored, versioned, in the artifact store
+# (utils/artifact_store.py) and the page is streamed to
+# .cache/website_artifacts/projects/<WEBSITE_PROJECT>/index.html. With
+# WEBSITE_RESUME_FROM=design (or code) the upstream stages replay their latest
+# stored output instead of running.
+#
+# Stages are memoized (utils/stage_cache.py): a stage whose prompts, models and
+# inputs (STAGE_INPUTS) match an earlier run replays that run's output.
+# WEBSITE_STAGE_CACHE=0 turns this off.
+#
+# Finally html_postprocessor (utils/html_postprocess.py) minifies the page's CSS,
+# JS and markup locally, optionally inlines fonts / icon CSS from the asset
+# cache, validates it and overwrites index.html with the result (state:
+# final_html, postprocess_report). WEBSITE_POSTPROCESS=0 skips it.
+#
+# Nothing is built at import: root_agent is built on first access
+# (utils/lazy_agents.py), after .env is loaded, so the env settings above apply.
 
-# Path to instructions.txt relative to this file
-BASE_DIR = os.path.dirname(__file__)
-instruction_path = os.path.join(BASE_DIR, "instructions.txt")
+# What each stage's output depends on, whichever agents implement it
+STAGE_INPUTS = {
+    "requirements": [USER_MESSAGE],
+    "design": [STAGE_KEYS["requirements"]],
+    "code": [STAGE_KEYS["requirements"], STAGE_KEYS["design"]],
+}
 
-instruction_text = load_text_file(instruction_path)
 
-# Import sub-agents directly from their agent modules
-# Since we've added website_page_builder to sys.path, we can use the shorter import path
-from requirement_write_agent.agent import requirement_write_agent
-from page_designer_agent.agent import page_designer_agent
-from code_write_agent.agent import code_write_agent
-
-# SequentialAgent only accepts name and sub_agents parameters
-# It orchestrates the workflow automatically between sub-agents
-sequential_manager_agent = SequentialAgent(
-    name="sequential_manager_agent",
-    sub_agents=[requirement_write_agent, page_designer_agent, code_write_agent],
-)
-
-root_agent = sequential_manager_agent
\ No newline at end of file
+def streaming_code_writer():
+    """Timed copy of code_write_agent that streams the page to disk as it is generated."""
+    return timed(build_code_write_agent()).model_copy(update={"after_model_callback": stream_html_callback})
+
+
+def build_sequential_manager() -> SequentialAgent:
+    pipeline_mode = os.getenv("WEBSITE_BUILDER_PIPELINE", "sequential").lower()
+    code_mode = os.getenv("WEBSITE_CODE_WRITER", "single").lower()
+
+    if pipeline_mode == "parallel":
+        design_stage = build_parallel_designer(name="parallel_designer_agent")
+    else:
+        design_stage = timed(build_page_designer_agent())
+
+    if code_mode == "sections":
+        code_stage = build_section_code_writer(fallback=streaming_code_writer())
+    else:
+        code_stage = streaming_code_writer()
+
+    requirement_stage = timed(build_requirement_write_agent())
+    for stage, agent in (("requirements", requirement_stage), ("design", design_stage), ("code", code_stage)):
+        add_stage_callbacks(agent, *artifact_callbacks(stage))
+        if stage_cache_enabled():
+            add_stage_callbacks(agent, *stage_cache_callbacks(agent, STAGE_KEYS[stage], STAGE_INPUTS[stage]))
+
+    stages = [requirement_stage, design_stage, code_stage]
+    if postprocess_enabled():
+        stages.append(build_html_postprocessor())
+
+    # The sub-agents are timed copies, so the originals stay usable as standalone agents
+    return SequentialAgent(
+        name="sequential_manager_agent",
+        sub_agents=stages,
+        before_agent_callback=start_stage,
+        after_agent_callback=end_pipeline,
+    )
+
+
+__getattr__ = lazy_agents(__name__, sequential_manager_agent=build_sequential_manager, root_agent=build_sequential_manager)
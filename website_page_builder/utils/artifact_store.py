@@ -0,0 +1,327 @@
+# utils/artifact_store.py
+#
+# On-disk artifacts of the website builder pipeline.
+#
+#   <root>/objects/<sha256>                  every stage output, content-addressed
+#   <root>/projects/<project>/<stage>.jsonl  version history per stage
+#   <root>/projects/<project>/index.html     the latest page
+#
+# Stages are "requirements", "design" and "code" (their output_key values are in
+# STAGE_KEYS). Each version records its digest, size, time and the digests of
+# the upstream stage outputs it was built from; identical consecutive outputs
+# do not create a new version.
+#
+# - artifact_callbacks(stage) returns (before, after) agent callbacks. After a
+#   stage runs, its output is stored as a new version. With WEBSITE_RESUME_FROM
+#   set to "design" or "code", the stages upstream of it are not run: their
+#   latest stored output is replayed into state instead. Iterating on the design
+#   then does not re-pay for requirement writing.
+# - stream_html_callback() is an after_model_callback for code_write_agent that
+#   streams the page into index.html as tokens arrive (with SSE streaming; a
+#   non-streaming reply is written in one piece). The file is written as
+#   index.html.part and renamed when the reply is complete.
+#
+# Env: WEBSITE_ARTIFACT_DIR (default .cache/website_artifacts),
+#      WEBSITE_PROJECT (default "default"), WEBSITE_RESUME_FROM (design | code).
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.genai import types
+
+try:
+    from utils.html_assembly import extract_html
+except ImportError:
+    from website_page_builder.utils.html_assembly import extract_html
+
+STAGES = ["requirements", "design", "code"]
+STAGE_KEYS = {
+    "requirements": "requirement_write_agent_output",
+    "design": "page_designer_agent_output",
+    "code": "code_write_agent_output",
+}
+PAGE_FILE = "index.html"
+DEFAULT_ARTIFACT_DIR = os.path.join(".cache", "website_artifacts")
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class StageVersion:
+    stage: str
+    version: int
+    digest: str
+    bytes: int
+    created_at: float
+    inputs: Dict[str, str] = field(default_factory=dict)  # upstream stage -> digest
+
+
+class ArtifactStore:
+    """
+    Content-addressed, versioned stage outputs for one project.
+
+    Args:
+        root: Store directory. Env: WEBSITE_ARTIFACT_DIR.
+        project: History namespace (one website). Env: WEBSITE_PROJECT.
+    """
+
+    def __init__(self, root: Optional[str] = None, project: Optional[str] = None):
+        self.root = root or os.getenv("WEBSITE_ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)
+        self.project = project or os.getenv("WEBSITE_PROJECT", "default")
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.project_dir = os.path.join(self.root, "projects", self.project)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.project_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def page_path(self) -> str:
+        return os.path.join(self.project_dir, PAGE_FILE)
+
+    def _history_path(self, stage: str) -> str:
+        return os.path.join(self.project_dir, f"{stage}.jsonl")
+
+    def load(self, digest: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.objects_dir, digest), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def history(self, stage: str) -> List[StageVersion]:
+        """All versions of a stage, oldest first."""
+        try:
+            with open(self._history_path(stage), "r", encoding="utf-8") as f:
+                return [StageVersion(**json.loads(line)) for line in f if line.strip()]
+        except OSError:
+            return []
+
+    def latest(self, stage: str) -> Optional[Tuple[StageVersion, str]]:
+        """The newest version of a stage whose content is still present."""
+        for version in reversed(self.history(stage)):
+            content = self.load(version.digest)
+            if content is not None:
+                return version, content
+        return None
+
+    def put(self, stage: str, content: str, inputs: Optional[Dict[str, str]] = None) -> StageVersion:
+        """Store `content` as the next version of `stage` (unchanged content keeps the current version)."""
+        digest = content_digest(content)
+        object_path = os.path.join(self.objects_dir, digest)
+        with self._lock:
+            if not os.path.exists(object_path):
+                _write_atomic(object_path, content.encode("utf-8"))
+            history = self.history(stage)
+            if history and history[-1].digest == digest:
+                return history[-1]
+            version = StageVersion(
+                stage=stage,
+                version=len(history) + 1,
+                digest=digest,
+                bytes=len(content.encode("utf-8")),
+                created_at=time.time(),
+                inputs=inputs or {},
+            )
+            with open(self._history_path(stage), "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(version)) + "\n")
+        return version
+
+    def write_page(self, html: str) -> str:
+        _write_atomic(self.page_path, html.encode("utf-8"))
+        return self.page_path
+
+
+class HtmlStreamWriter:
+    """
+    Writes the HTML inside a ```html fence to disk as reply text arrives.
+
+    feed() takes successive text chunks; close() renames the .part file into
+    place and returns the path (or None if the reply contained no HTML).
+    """
+
+    _FENCE = "```"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._part_path = f"{path}.part"
+        self._file = None
+        self._pending = ""
+        self._started = False
+        self._done = False
+        self.bytes_written = 0
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def _write(self, text: str) -> None:
+        if not text:
+            return
+        if self._file is None:
+            self._file = open(self._part_path, "w", encoding="utf-8")
+        self._file.write(text)
+        self._file.flush()
+        self.bytes_written += len(text.encode("utf-8"))
+
+    def _find_start(self) -> bool:
+        """Drop everything before the page: the ```html fence line, or up to a bare <!DOCTYPE / <html."""
+        lowered = self._pending.lower()
+        fence = lowered.find("```html")
+        if fence >= 0:
+            newline = self._pending.find("\n", fence)
+            if newline < 0:
+                return False  # the fence line is not complete yet
+            self._pending = self._pending[newline + 1 :]
+            return True
+        bare = [i for i in (lowered.find("<!doctype"), lowered.find("<html")) if i >= 0]
+        if bare:
+            self._pending = self._pending[min(bare) :]
+            return True
+        return False
+
+    def feed(self, chunk: str) -> None:
+        if self._done:
+            return
+        self._pending += chunk
+        if not self._started:
+            self._started = self._find_start()
+            if not self._started:
+                return
+        end = self._pending.find(self._FENCE)
+        if end >= 0:
+            self._write(self._pending[:end])
+            self._pending = ""
+            self._done = True
+            return
+        # hold back a possible partial closing fence
+        keep = len(self._FENCE) - 1
+        self._write(self._pending[:-keep])
+        self._pending = self._pending[-keep:]
+
+    def close(self) -> Optional[str]:
+        if not self._started:
+            return None
+        if not self._done:
+            self._write(self._pending)
+        if self._file is None:
+            return None
+        self._file.close()
+        self._file = None
+        os.replace(self._part_path, self.path)
+        return self.path
+
+
+_default_store: Optional[ArtifactStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Process-wide store, created on first use."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ArtifactStore()
+    return _default_store
+
+
+def resume_from() -> Optional[str]:
+    """The stage WEBSITE_RESUME_FROM asks to restart at, if valid."""
+    stage = os.getenv("WEBSITE_RESUME_FROM", "").strip().lower()
+    if stage and stage not in STAGES:
+        logger.warning("Ignoring WEBSITE_RESUME_FROM=%s (expected one of %s)", stage, ", ".join(STAGES))
+        return None
+    return stage or None
+
+
+def artifact_callbacks(stage: str):
+    """(before, after) agent callbacks that replay / record `stage` in the artifact store."""
+    key = STAGE_KEYS[stage]
+    upstream = STAGES[: STAGES.index(stage)]
+
+    def replay_stage(callback_context: CallbackContext) -> Optional[types.Content]:
+        target = resume_from()
+        if not target or STAGES.index(stage) >= STAGES.index(target):
+            return None
+        stored = get_artifact_store().latest(stage)
+        if stored is None:
+            logger.info("No stored %s to resume from; running the stage", stage)
+            return None
+        version, content = stored
+        logger.info("Resuming: replaying %s v%d (%s)", stage, version.version, version.digest[:12])
+        callback_context.state[key] = content
+        return types.Content(role="model", parts=[types.Part.from_text(text=content)])
+
+    def record_stage(callback_context: CallbackContext) -> Optional[types.Content]:
+        content = callback_context.state.get(key)
+        if not isinstance(content, str) or not content.strip():
+            return None
+        state = callback_context.state
+        inputs = {
+            name: content_digest(state[STAGE_KEYS[name]])
+            for name in upstream
+            if isinstance(state.get(STAGE_KEYS[name]), str)
+        }
+        store = get_artifact_store()
+        version = store.put(stage, content, inputs)
+        if stage == "code":
+            html = extract_html(content)
+            if html:
+                store.write_page(html)
+                _save_adk_artifact(callback_context, html)
+        logger.info("Stored %s v%d (%d bytes)", stage, version.version, version.bytes)
+        return None
+
+    return replay_stage, record_stage
+
+
+def _save_adk_artifact(callback_context: CallbackContext, html: str) -> None:
+    """Also attach the page to the session (ADK web's Artifacts tab), when an artifact service is set."""
+    try:
+        callback_context.save_artifact(PAGE_FILE, types.Part.from_bytes(data=html.encode("utf-8"), mime_type="text/html"))
+    except ValueError:
+        pass  # no artifact service configured
+
+
+_writers: Dict[str, HtmlStreamWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def stream_html_callback(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """after_model_callback: stream the page being generated into the project's index.html."""
+    content = llm_response.content
+    text = "".join(part.text or "" for part in content.parts) if content and content.parts else ""
+    key = callback_context.invocation_id
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = HtmlStreamWriter(get_artifact_store().page_path)
+    if llm_response.partial:
+        writer.feed(text)
+        return None
+    # the final response carries the whole reply; it is only needed if nothing was streamed
+    if not writer.started:
+        writer.feed(text)
+    with _writers_lock:
+        _writers.pop(key, None)
+    path = writer.close()
+    if path:
+        logger.info("Wrote %s (%d bytes)", path, writer.bytes_written)
+    return None
@@ -0,0 +1,48 @@
+# utils/callbacks.py
+#
+# ADK agents take a single before_agent_callback / after_agent_callback. The
+# pipeline stages need several (timing, artifact store, ...), so they are
+# chained onto the stage with add_stage_callbacks().
+#
+# A before callback that returns content short-circuits the stage (ADK then
+# skips the agent and its after callback). The chain runs the after callbacks
+# itself in that case, so timing and recording still see the stage finish.
+from typing import Callable, List, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+AgentCallback = Callable[..., Optional[types.Content]]
+
+
+def add_stage_callbacks(
+    agent: BaseAgent, before: Optional[AgentCallback] = None, after: Optional[AgentCallback] = None
+) -> BaseAgent:
+    """
+    Chain `before` / `after` behind the agent's existing callbacks, in place.
+
+    Before callbacks run in order until one returns content; after callbacks all
+    run, and the first content returned (if any) is used.
+    """
+    befores: List[AgentCallback] = [cb for cb in (agent.before_agent_callback, before) if cb]
+    afters: List[AgentCallback] = [cb for cb in (agent.after_agent_callback, after) if cb]
+
+    def run_afters(callback_context: CallbackContext) -> Optional[types.Content]:
+        result = None
+        for callback in afters:
+            content = callback(callback_context=callback_context)
+            result = result or content
+        return result
+
+    def before_agent(callback_context: CallbackContext) -> Optional[types.Content]:
+        for callback in befores:
+            content = callback(callback_context=callback_context)
+            if content is not None:
+                run_afters(callback_context)
+                return content
+        return None
+
+    agent.before_agent_callback = before_agent if befores else None
+    agent.after_agent_callback = run_afters if afters else None
+    return agent
@@ -0,0 +1,286 @@
+# utils/html_assembly.py
+#
+# Deterministic pieces of section-parallel code generation:
+# - split_design_spec() cuts a UI Design Specification (page_designer_agent's
+#   template) into jobs: the shared design system ("base"), one job per page
+#   section, and the JavaScript ("script").
+# - parse_fragment() reads one job's reply (fenced html / css / js blocks) and
+#   rejects truncated or unbalanced fragments, so only that job is re-run.
+# - assemble_page() stitches the fragments into the single-file layout
+#   code_write_agent's instructions require.
+# - validate_html() checks the merged page: doctype, tag balance, duplicate ids,
+#   and ids / in-page links the script and navigation rely on.
+# - extract_html() pulls the page out of a code writer's fenced reply.
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr",
+}
+# Elements whose end tag HTML lets you omit
+OPTIONAL_END = {"p", "li", "dt", "dd", "option", "optgroup", "tr", "td", "th", "thead", "tbody", "tfoot", "colgroup"}
+
+_HEADING = re.compile(r"^(#{2,3})\s+(.*?)\s*$", re.M)
+_FENCE_BLOCK = re.compile(r"```([A-Za-z]*)[ \t]*\n(.*?)```", re.S)
+_SCRIPT_ID_REF = re.compile(r"""(?:getElementById\(\s*['"]([\w-]+)['"]|querySelector(?:All)?\(\s*['"]#([\w-]+)['"])""")
+_HTML_FENCE = re.compile(r"```(?:html|htm)?[ \t]*\n(.*?)(?:```|\Z)", re.S | re.I)
+_WRAPPER_TAG = re.compile(r"^\s*<(style|script)[^>]*>\s*|\s*</(style|script)>\s*$", re.I)
+
+
+@dataclass
+class SectionJob:
+    key: str      # identifier, e.g. "c_features"
+    title: str    # heading text from the spec
+    kind: str     # base | header | main | footer | script
+    spec: str     # the spec text of this part
+
+
+@dataclass
+class Fragment:
+    html: str = ""
+    css: str = ""
+    js: str = ""
+
+
+@dataclass
+class ValidationResult:
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        return {"errors": self.errors, "warnings": self.warnings}
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")[:40] or "section"
+
+
+def split_design_spec(spec: str) -> List[SectionJob]:
+    """
+    Jobs for a UI Design Specification, in page order: base, sections..., script.
+    Returns an empty list when the spec has no "### " sections to split on.
+    """
+    headings = list(_HEADING.finditer(spec or ""))
+    base, script, sections = "", "", []
+    for i, match in enumerate(headings):
+        level, title = len(match.group(1)), match.group(2)
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(spec)
+        body = spec[match.start() : end].strip()
+        lowered = title.lower()
+        if level == 2 and "design system" in lowered:
+            base = body
+        elif level == 2 and ("interaction" in lowered or "javascript" in lowered):
+            script = body
+        elif level == 3:
+            kind = "header" if re.search(r"header|nav", lowered) else "footer" if "footer" in lowered else "main"
+            sections.append((title, kind, body))
+    if not sections:
+        return []
+
+    jobs = [SectionJob("base", "Design System & Global Styles", "base", base)]
+    for title, kind, body in sections:
+        name = re.sub(r"^[A-Z]\.\s*", "", title)
+        section_id = re.search(r"#([A-Za-z][\w-]*)", name)  # "Features (`#features`)"
+        key = _slug(section_id.group(1) if section_id else name)
+        while any(job.key == key for job in jobs):
+            key += "_2"
+        jobs.append(SectionJob(key, name, kind, body))
+    if script:
+        jobs.append(SectionJob("script", "Interaction & JavaScript Logic", "script", script))
+    return jobs
+
+
+def _strip_wrapper(code: str) -> str:
+    """Drop a <style>/<script> wrapper the model added around a css/js block."""
+    return _WRAPPER_TAG.sub("", code.strip()).strip()
+
+
+def parse_fragment(job: SectionJob, reply: str) -> Fragment:
+    """
+    The fenced blocks of a job's reply. Raises ValueError for a truncated reply
+    (unclosed fence), a missing required block or unbalanced markup / CSS.
+    """
+    reply = reply or ""
+    if reply.count("```") % 2:
+        raise ValueError("reply is truncated (unclosed code block)")
+    blocks: Dict[str, str] = {}
+    for lang, code in _FENCE_BLOCK.findall(reply):
+        lang = {"javascript": "js", "htm": "html"}.get(lang.lower(), lang.lower())
+        blocks[lang] = f"{blocks[lang]}\n{code.strip()}" if lang in blocks else code.strip()
+
+    fragment = Fragment(
+        html=blocks.get("html", ""),
+        css=_strip_wrapper(blocks.get("css", "")),
+        js=_strip_wrapper(blocks.get("js", "")),
+    )
+    required = {"base": "css", "script": "js"}.get(job.kind, "html")
+    if not getattr(fragment, required):
+        raise ValueError(f"no ```{required} block")
+    if fragment.css.count("{") != fragment.css.count("}"):
+        raise ValueError("unbalanced braces in css")
+    if job.kind not in ("base", "script"):
+        errors = check_tags(fragment.html)
+        if errors:
+            raise ValueError("; ".join(errors[:3]))
+    return fragment
+
+
+class _PageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: List[Tuple[str, int]] = []
+        self.errors: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.anchors: List[str] = []
+        self.scripts: List[str] = []
+        self.doctype = False
+        self._in_script = False
+
+    def handle_decl(self, decl: str) -> None:
+        if decl.lower().startswith("doctype"):
+            self.doctype = True
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        attrs = dict(attrs)
+        if attrs.get("id"):
+            self.ids[attrs["id"]] = self.ids.get(attrs["id"], 0) + 1
+        href = attrs.get("href") or ""
+        if tag == "a" and href.startswith("#") and len(href) > 1:
+            self.anchors.append(href[1:])
+        if tag == "script" and not attrs.get("src"):
+            self._in_script = True
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, self.getpos()[0]))
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        # <div/> is not self-closing in HTML, but a model writing it means an empty element
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS and self.stack and self.stack[-1][0] == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script":
+            self._in_script = False
+        if tag in VOID_ELEMENTS:
+            return
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            self.errors.append(f"line {self.getpos()[0]}: unexpected </{tag}>")
+            return
+        while self.stack:
+            open_tag, line = self.stack.pop()
+            if open_tag == tag:
+                return
+            if open_tag not in OPTIONAL_END:
+                self.errors.append(f"line {line}: <{open_tag}> not closed before </{tag}>")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_script:
+            self.scripts.append(data)
+
+    def close(self) -> None:
+        super().close()
+        for tag, line in self.stack:
+            if tag not in OPTIONAL_END:
+                self.errors.append(f"line {line}: <{tag}> never closed")
+
+
+def _parse(html: str) -> _PageParser:
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+def check_tags(html: str) -> List[str]:
+    """Tag-balance errors of an HTML fragment or page."""
+    return _parse(html).errors
+
+
+def validate_html(html: str) -> ValidationResult:
+    """Structural checks of a complete single-file page."""
+    parser = _parse(html)
+    result = ValidationResult(errors=list(parser.errors))
+    if not parser.doctype:
+        result.errors.append("missing <!DOCTYPE html>")
+    lowered = html.lower()
+    for tag in ("<html", "<head", "<body", "<title"):
+        if tag not in lowered:
+            result.errors.append(f"missing {tag}>")
+    result.warnings += [f'duplicate id "{id_}"' for id_, count in parser.ids.items() if count > 1]
+    referenced = {a or b for a, b in _SCRIPT_ID_REF.findall("\n".join(parser.scripts))}
+    result.warnings += [f'script references missing id "#{id_}"' for id_ in sorted(referenced - set(parser.ids))]
+    result.warnings += [f'link to missing id "#{id_}"' for id_ in sorted(set(parser.anchors) - set(parser.ids))]
+    return result
+
+
+def extract_html(text: str) -> str:
+    """The HTML page in a code writer reply (the ```html block, or the bare page)."""
+    text = text or ""
+    for block in _HTML_FENCE.findall(text):
+        if "<html" in block.lower() or "<!doctype" in block.lower():
+            return block.strip() + "\n"
+    start = text.lower().find("<!doctype")
+    if start < 0:
+        start = text.lower().find("<html")
+    return text[start:].strip() + "\n" if start >= 0 else ""
+
+
+def _head_title(head: str) -> Optional[str]:
+    match = re.search(r"<title>(.*?)</title>", head, re.S | re.I)
+    return match.group(1).strip() if match else None
+
+
+def _indent(text: str, level: int) -> str:
+    return "\n".join(("    " * level + line) if line.strip() else "" for line in text.splitlines())
+
+
+def assemble_page(jobs: List[SectionJob], fragments: Dict[str, Fragment], title: str = "Home") -> str:
+    """
+    Stitch fragments into one index.html: head links and all CSS in the head,
+    header / <main> sections / footer in spec order, one <script> at the end of body.
+    """
+    head = fragments["base"].html if "base" in fragments else ""
+    head_lines = [line for line in head.splitlines() if line.strip() and "<title" not in line.lower()]
+    css = [fragments[job.key].css for job in jobs if job.key in fragments and fragments[job.key].css]
+    js = [fragments[job.key].js for job in jobs if job.key in fragments and fragments[job.key].js]
+
+    def body(kind: str) -> List[str]:
+        parts = []
+        for job in jobs:
+            if job.kind != kind:
+                continue
+            fragment = fragments.get(job.key)
+            parts.append(fragment.html if fragment else f"<!-- {job.title}: not generated -->")
+        return parts
+
+    lines = [
+        "<!DOCTYPE html>",
+        '<html lang="en">',
+        "<head>",
+        '    <meta charset="UTF-8">',
+        '    <meta name="viewport" content="width=device-width, initial-scale=1.0">',
+        f"    <title>{_head_title(head) or title}</title>",
+        *[_indent(line.strip(), 1) for line in head_lines if "<meta" not in line.lower()],
+        "    <style>",
+        _indent("\n\n".join(css), 2),
+        "    </style>",
+        "</head>",
+        "<body>",
+        *[_indent(part, 1) for part in body("header")],
+        "    <main>",
+        *[_indent(part, 2) for part in body("main")],
+        "    </main>",
+        *[_indent(part, 1) for part in body("footer")],
+        "    <script>",
+        _indent("\n\n".join(js), 2),
+        "    </script>",
+        "</body>",
+        "</html>",
+    ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,622 @@
+# utils/html_postprocess.py
+#
+# Local post-processing of the generated single-file page. No model call.
+#
+# - Minifies every inline <style> (comments, whitespace) and <script>
+#   (comments, indentation; line breaks are kept so automatic semicolon
+#   insertion is unaffected), and strips HTML comments and indentation outside
+#   <pre> / <textarea>.
+# - Optionally (WEBSITE_INLINE_ASSETS=1) replaces stylesheet <link>s (Google
+#   Fonts, icon CSS) by inline <style> blocks from a local asset cache:
+#     * rules for classes the page never uses are dropped (icon sets),
+#     * @font-face blocks whose unicode-range the page text never needs are
+#       dropped, and the remaining font files are embedded as data: URIs,
+#       subset to the characters used when fontTools is installed.
+#   Assets missing from the cache stay linked, unless WEBSITE_ASSET_FETCH=1
+#   allows downloading them into the cache.
+# - Validates the result (html_assembly.validate_html) and keeps the original
+#   markup if processing introduced structural errors.
+#
+# HtmlPostProcessor is the pipeline stage: it reads code_write_agent_output and
+# writes final_html and postprocess_report (byte sizes before / after).
+#
+# Env: WEBSITE_POSTPROCESS (0 disables the stage), WEBSITE_INLINE_ASSETS,
+#      WEBSITE_ASSET_CACHE_DIR (default .cache/website_assets), WEBSITE_ASSET_FETCH.
+import base64
+import hashlib
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+import httpx
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+try:
+    from utils.artifact_store import content_digest, get_artifact_store
+    from utils.html_assembly import extract_html, validate_html
+    from utils.stage_timing import end_stage, start_stage
+except ImportError:
+    from website_page_builder.utils.artifact_store import content_digest, get_artifact_store
+    from website_page_builder.utils.html_assembly import extract_html, validate_html
+    from website_page_builder.utils.stage_timing import end_stage, start_stage
+
+try:  # optional: subset embedded font files to the characters the page uses
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+CODE_OUTPUT_KEY = "code_write_agent_output"
+FINAL_HTML_KEY = "final_html"
+REPORT_KEY = "postprocess_report"
+DEFAULT_ASSET_CACHE_DIR = os.path.join(".cache", "website_assets")
+# Google Fonts serves woff2 only to browsers it recognizes
+_FETCH_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36"}
+_FONT_MIME = {".woff2": "font/woff2", ".woff": "font/woff", ".ttf": "font/ttf", ".otf": "font/otf"}
+
+logger = logging.getLogger(__name__)
+
+
+# --- CSS ---------------------------------------------------------------------
+
+_CSS_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/|\s+|[^"\'/\s]+|/', re.S)
+# no space needed after / before these (":" only after: "a :hover" is not "a:hover")
+_CSS_NO_SPACE_AFTER = set("{};,>:")
+_CSS_NO_SPACE_BEFORE = set("{};,>")
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace; strings are left untouched."""
+    out: List[str] = []
+    space = False
+    for token in _CSS_TOKEN.findall(css):
+        if token.startswith("/*"):
+            continue
+        if token.isspace():
+            space = True
+            continue
+        if token[0] not in "\"'":
+            token = token.replace(";}", "}")
+            if token[0] == "}" and out and out[-1].endswith(";") and out[-1][0] not in "\"'":
+                out[-1] = out[-1][:-1]
+                if not out[-1]:
+                    out.pop()
+        if space and out and out[-1][-1] not in _CSS_NO_SPACE_AFTER and token[0] not in _CSS_NO_SPACE_BEFORE:
+            out.append(" ")
+        out.append(token)
+        space = False
+    return "".join(out)
+
+
+def _css_blocks(css: str) -> List[Tuple[str, str]]:
+    """Top-level (prelude, body) pairs; statements without a block (@import ...) have an empty body."""
+    blocks, i, n = [], 0, len(css)
+    while i < n:
+        start = i
+        while i < n and css[i] not in "{;":
+            if css[i] in "\"'":
+                quote = css[i]
+                i += 1
+                while i < n and css[i] != quote:
+                    i += 2 if css[i] == "\\" else 1
+            i += 1
+        if i >= n:
+            break
+        if css[i] == ";":  # @import / @charset statement
+            blocks.append((css[start : i + 1].strip(), ""))
+            i += 1
+            continue
+        depth, body_start = 1, i + 1
+        i += 1
+        while i < n and depth:
+            if css[i] in "\"'":
+                quote = css[i]
+                i += 1
+                while i < n and css[i] != quote:
+                    i += 2 if css[i] == "\\" else 1
+            elif css[i] == "{":
+                depth += 1
+            elif css[i] == "}":
+                depth -= 1
+            i += 1
+        blocks.append((css[start:body_start - 1].strip(), css[body_start : i - 1]))
+    return blocks
+
+
+def _unicode_ranges(body: str) -> Optional[List[Tuple[int, int]]]:
+    match = re.search(r"unicode-range\s*:\s*([^;}]+)", body, re.I)
+    if not match:
+        return None
+    ranges = []
+    for part in match.group(1).split(","):
+        part = part.strip().upper().removeprefix("U+")
+        if "?" in part:
+            ranges.append((int(part.replace("?", "0"), 16), int(part.replace("?", "F"), 16)))
+        elif "-" in part:
+            low, high = part.split("-", 1)
+            ranges.append((int(low, 16), int(high, 16)))
+        elif part:
+            ranges.append((int(part, 16), int(part, 16)))
+    return ranges
+
+
+def _selector_used(selector: str, used_classes: Set[str]) -> bool:
+    selector = re.sub(r"\[[^\]]*\]", "", selector)
+    # classes inside :is() / :where() / :not() / ... do not all have to be used
+    # (:is(.a, .unused) still matches .a, :not(.unused) matches everything)
+    while "(" in selector:
+        stripped = re.sub(r"\([^()]*\)", "", selector)
+        if stripped == selector:
+            break
+        selector = stripped
+    classes = re.findall(r"\.(-?[_a-zA-Z][\w-]*)", selector)
+    return all(name in used_classes for name in classes)
+
+
+def subset_css(css: str, used_classes: Set[str], codepoints: Set[int]) -> str:
+    """
+    Keep only rules that can match the page and @font-face blocks whose
+    unicode-range covers a character the page uses.
+    """
+    kept = []
+    for prelude, body in _css_blocks(css):
+        lowered = prelude.lower()
+        if not body and prelude.endswith(";"):
+            kept.append(prelude)
+        elif lowered.startswith(("@media", "@supports", "@layer")):
+            inner = subset_css(body, used_classes, codepoints)
+            if inner.strip():
+                kept.append(f"{prelude}{{{inner}}}")
+        elif lowered.startswith("@font-face"):
+            ranges = _unicode_ranges(body)
+            if ranges is None or any(low <= cp <= high for cp in codepoints for low, high in ranges):
+                kept.append(f"{prelude}{{{body}}}")
+        elif lowered.startswith("@"):
+            kept.append(f"{prelude}{{{body}}}")
+        else:
+            # :is(.a, .b) and friends are kept or dropped as a whole
+            parts = [prelude] if "(" in prelude else prelude.split(",")
+            selectors = [s for s in parts if _selector_used(s, used_classes)]
+            if selectors:
+                kept.append(f"{','.join(s.strip() for s in selectors)}{{{body}}}")
+    return "".join(kept)
+
+
+# --- JavaScript ----------------------------------------------------------------
+
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "yield", "await"}
+# after the ")" closing one of these heads a "/" starts a regex: if (x) /re/.test(y)
+_HEAD_KEYWORDS = {"if", "while", "for", "with"}
+
+
+class _JsScanner:
+    """Splits JavaScript into code, string / template / regex literals, comments and whitespace."""
+
+    def __init__(self, source: str):
+        self.s = source
+        self.i = 0
+        self.tokens: List[Tuple[str, str]] = []
+        self._parens: List[bool] = []  # per open "(": is it a control-flow head?
+        self._closed_head = False  # did the last ")" close one?
+
+    def _prev_code(self) -> str:
+        for kind, text in reversed(self.tokens):
+            if kind not in ("ws", "comment"):
+                return text if kind == "code" else "a"  # a literal ends like an identifier
+        return ""
+
+    def _read_quoted(self, quote: str) -> None:
+        start, s = self.i, self.s
+        self.i += 1
+        while self.i < len(s) and s[self.i] != quote:
+            if s[self.i] == "\n" and quote != "`":
+                raise ValueError("unterminated string")
+            if s[self.i] == "\\":
+                self.i += 1
+            elif quote == "`" and s.startswith("${", self.i):
+                # skip the expression; it stays part of the literal's text
+                outer = len(self.tokens)
+                self.i += 2
+                self.scan(until_brace=True)
+                del self.tokens[outer:]
+                continue
+            self.i += 1
+        if self.i >= len(s):
+            raise ValueError("unterminated literal")
+        self.i += 1
+        self.tokens.append(("literal", s[start : self.i]))
+
+    def _read_regex(self) -> None:
+        start, s, in_class = self.i, self.s, False
+        self.i += 1
+        while self.i < len(s):
+            char = s[self.i]
+            if char == "\\":
+                self.i += 1
+            elif char == "[":
+                in_class = True
+            elif char == "]":
+                in_class = False
+            elif char == "/" and not in_class:
+                break
+            elif char == "\n":
+                raise ValueError("unterminated regex")
+            self.i += 1
+        self.i += 1
+        while self.i < len(s) and (s[self.i].isalnum() or s[self.i] == "_"):
+            self.i += 1
+        self.tokens.append(("literal", s[start : self.i]))
+
+    def _track_parens(self, text: str) -> None:
+        for j, char in enumerate(text):
+            if char == "(":
+                word = re.search(r"[\w$]+$", text[:j] or self._prev_code())
+                self._parens.append(bool(word) and word.group() in _HEAD_KEYWORDS)
+            elif char == ")":
+                self._closed_head = self._parens.pop() if self._parens else False
+
+    def scan(self, until_brace: bool = False) -> List[Tuple[str, str]]:
+        s, depth = self.s, 0
+        while self.i < len(s):
+            char = s[self.i]
+            if until_brace and char == "}" and depth == 0:
+                self.i += 1
+                return self.tokens
+            if char in "\"'`":
+                self._read_quoted(char)
+            elif s.startswith("//", self.i):
+                end = s.find("\n", self.i)
+                end = len(s) if end < 0 else end
+                self.tokens.append(("comment", s[self.i : end]))
+                self.i = end
+            elif s.startswith("/*", self.i):
+                end = s.find("*/", self.i + 2)
+                if end < 0:
+                    raise ValueError("unterminated comment")
+                self.tokens.append(("comment", s[self.i : end + 2]))
+                self.i = end + 2
+            elif char == "/":
+                prev = self._prev_code()
+                word = re.search(r"[\w$]+$", prev)
+                if (
+                    not prev
+                    or prev[-1] in _REGEX_PRECEDERS
+                    or (word and word.group() in _REGEX_KEYWORDS)
+                    or (prev[-1] == ")" and self._closed_head)
+                ):
+                    self._read_regex()
+                else:
+                    self.tokens.append(("code", char))
+                    self.i += 1
+            elif char.isspace():
+                match = re.compile(r"\s+").match(s, self.i)
+                self.tokens.append(("ws", match.group()))
+                self.i = match.end()
+            else:
+                match = re.compile(r"[^\s\"'`/]+").match(s, self.i)
+                text = match.group()
+                if until_brace:  # stop at the brace closing a template ${...}
+                    for j, c in enumerate(text):
+                        depth += c == "{"
+                        if c == "}":
+                            if depth == 0:
+                                text = text[:j]
+                                break
+                            depth -= 1
+                self._track_parens(text)
+                self.tokens.append(("code", text))
+                self.i += len(text)
+        if until_brace:
+            raise ValueError("unterminated template expression")
+        return self.tokens
+
+
+def minify_js(js: str) -> str:
+    """
+    Drop comments, indentation and blank lines; literals are left untouched.
+    Line breaks are kept, so code relying on automatic semicolons still works.
+    Returns the input unchanged if it cannot be tokenized.
+    """
+    try:
+        tokens = _JsScanner(js).scan()
+    except ValueError as e:
+        logger.info("Not minifying script: %s", e)
+        return js
+    out: List[str] = []
+    for kind, text in tokens:
+        if kind == "comment":
+            if text.startswith("/*!"):  # license comments stay
+                out.append(text)
+            continue
+        if kind == "ws":
+            if not out:
+                continue
+            separator = "\n" if "\n" in text else " "
+            if out[-1] in ("\n", " "):
+                out[-1] = "\n" if "\n" in (out[-1], separator) else " "
+            else:
+                out.append(separator)
+            continue
+        out.append(text)
+    return "".join(out).strip()
+
+
+# --- HTML ----------------------------------------------------------------------
+
+_RAW_ELEMENT = re.compile(r"(<(style|script|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)", re.S | re.I)
+_HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_ATTR = re.compile(r'([\w:-]+)\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+)')
+_JS_TYPES = {"", "text/javascript", "application/javascript", "module"}
+
+
+def _attrs(tag: str) -> Dict[str, str]:
+    return {name.lower(): value.strip("\"'") for name, value in _ATTR.findall(tag)}
+
+
+def _minify_markup(html: str) -> str:
+    html = _HTML_COMMENT.sub("", html)
+    lines = (line.strip() for line in html.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def minify_html(html: str, stats: Optional[Dict[str, int]] = None) -> str:
+    """Minify inline <style> / <script> bodies and the markup around them."""
+    stats = stats if stats is not None else {}
+    parts, last = [], 0
+    for match in _RAW_ELEMENT.finditer(html):
+        open_tag, tag, body, close_tag = match.group(1), match.group(2).lower(), match.group(3), match.group(4)
+        parts.append(_minify_markup(html[last : match.start()]))
+        if tag == "style":
+            minified = minify_css(body)
+            stats["css_before"] = stats.get("css_before", 0) + len(body.encode("utf-8"))
+            stats["css_after"] = stats.get("css_after", 0) + len(minified.encode("utf-8"))
+            body = minified
+        elif tag == "script" and "src" not in _attrs(open_tag) and _attrs(open_tag).get("type", "").lower() in _JS_TYPES:
+            minified = minify_js(body)
+            stats["js_before"] = stats.get("js_before", 0) + len(body.encode("utf-8"))
+            stats["js_after"] = stats.get("js_after", 0) + len(minified.encode("utf-8"))
+            body = minified
+        parts.append(f"{open_tag.strip()}{body}{close_tag}")
+        last = match.end()
+    parts.append(_minify_markup(html[last:]))
+    return "\n".join(part for part in parts if part)
+
+
+# --- Asset inlining ------------------------------------------------------------
+
+
+class AssetCache:
+    """
+    Local copies of remote stylesheets and fonts, keyed by URL.
+
+    Args:
+        directory: Cache directory. Env: WEBSITE_ASSET_CACHE_DIR.
+        fetch: Download missing assets into the cache. Env: WEBSITE_ASSET_FETCH=1.
+    """
+
+    def __init__(self, directory: Optional[str] = None, fetch: Optional[bool] = None):
+        self.directory = directory or os.getenv("WEBSITE_ASSET_CACHE_DIR", DEFAULT_ASSET_CACHE_DIR)
+        self.fetch = fetch if fetch is not None else os.getenv("WEBSITE_ASSET_FETCH", "0") == "1"
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def put(self, url: str, data: bytes) -> None:
+        tmp_path = f"{self.path(url)}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(url))
+
+    def get(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self.path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            pass
+        if not self.fetch:
+            return None
+        try:
+            response = httpx.get(url, headers=_FETCH_HEADERS, timeout=10.0, follow_redirects=True)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("Could not fetch %s: %s", url, e)
+            return None
+        self.put(url, response.content)
+        return response.content
+
+
+def _page_usage(html: str) -> Tuple[Set[str], Set[int]]:
+    """(classes the page may use, codepoints of its text)."""
+    classes: Set[str] = set()
+    for value in re.findall(r'class\s*=\s*["\']([^"\']*)["\']', html, re.I):
+        classes.update(value.split())
+    # classes the script may add (classList.add('open'), className = "...")
+    for script in re.findall(r"<script\b[^>]*>(.*?)</script>", html, re.S | re.I):
+        for literal in re.findall(r"""["'`]([\w\s-]+)["'`]""", script):
+            classes.update(literal.split())
+    text = re.sub(r"<(style|script)\b.*?</\1>", " ", html, flags=re.S | re.I)
+    text = re.sub(r"<[^>]+>", " ", text)
+    return classes, {ord(char) for char in text if not char.isspace()} | {ord(" ")}
+
+
+def _subset_font(data: bytes, codepoints: Set[int], flavor: Optional[str]) -> bytes:
+    if font_subset is None:
+        return data
+    import io  # local: only needed with fontTools
+
+    options = font_subset.Options()
+    options.flavor = flavor
+    try:
+        font = font_subset.load_font(io.BytesIO(data), options)
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        out = io.BytesIO()
+        font_subset.save_font(font, out, options)
+        return out.getvalue()
+    except Exception as e:  # a font fontTools cannot handle is embedded as is
+        logger.info("Font subsetting failed: %s", e)
+        return data
+
+
+def _embed_fonts(css: str, base_url: str, cache: AssetCache, codepoints: Set[int], inlined: List[str]) -> str:
+    """Replace url(...) of font files with data: URIs where available; other urls are made absolute."""
+    icon_codepoints = {int(code, 16) for code in re.findall(r'content\s*:\s*["\']\\([0-9a-fA-F]{2,6})["\']', css)}
+
+    def replace(match: re.Match) -> str:
+        if match.group(2).startswith("data:"):
+            return match.group(0)
+        url = urljoin(base_url, match.group(2))
+        extension = os.path.splitext(url.split("?")[0])[1].lower()
+        data = cache.get(url) if extension in _FONT_MIME else None
+        if data is None:
+            return f'url("{url}")'
+        flavor = extension[1:] if extension in (".woff", ".woff2") else None
+        data = _subset_font(data, codepoints | icon_codepoints, flavor)
+        inlined.append(url)
+        return f"url(data:{_FONT_MIME[extension]};base64,{base64.b64encode(data).decode('ascii')})"
+
+    return re.sub(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""", replace, css)
+
+
+def inline_assets(html: str, cache: AssetCache) -> Tuple[str, List[str], List[str]]:
+    """
+    Inline stylesheet <link>s found in the cache. Returns (html, inlined urls, still linked urls).
+    """
+    used_classes, codepoints = _page_usage(html)
+    inlined: List[str] = []
+    linked: List[str] = []
+    inlined_hosts: Set[str] = set()
+
+    def replace(match: re.Match) -> str:
+        attrs = _attrs(match.group(0))
+        url = attrs.get("href", "")
+        if "stylesheet" not in attrs.get("rel", "").lower() or not url.startswith(("http://", "https://")):
+            return match.group(0)
+        data = cache.get(url)
+        if data is None:
+            linked.append(url)
+            return match.group(0)
+        css = subset_css(minify_css(data.decode("utf-8", "replace")), used_classes, codepoints)
+        css = _embed_fonts(css, url, cache, codepoints, inlined)
+        inlined.append(url)
+        inlined_hosts.add(url.split("/")[2])
+        return f"<style>{css}</style>"
+
+    html = re.sub(r"<link\b[^>]*>", replace, html, flags=re.I)
+    if inlined_hosts and not linked:
+        # preconnect hints for hosts that are no longer contacted
+        def drop_preconnect(match: re.Match) -> str:
+            attrs = _attrs(match.group(0))
+            host = attrs.get("href", "").split("/")[2] if "//" in attrs.get("href", "") else ""
+            gstatic = host.endswith("gstatic.com") and any(h.endswith("googleapis.com") for h in inlined_hosts)
+            return "" if attrs.get("rel") in ("preconnect", "dns-prefetch") and (host in inlined_hosts or gstatic) else match.group(0)
+
+        html = re.sub(r"<link\b[^>]*>", drop_preconnect, html, flags=re.I)
+    return html, inlined, linked
+
+
+# --- Stage -----------------------------------------------------------------------
+
+
+@dataclass
+class PostProcessReport:
+    bytes_before: int
+    bytes_after: int
+    css_before: int = 0
+    css_after: int = 0
+    js_before: int = 0
+    js_after: int = 0
+    inlined: List[str] = field(default_factory=list)
+    still_linked: List[str] = field(default_factory=list)
+    validation: Dict[str, List[str]] = field(default_factory=dict)
+    reverted: bool = False
+
+    def summary(self) -> str:
+        saved = self.bytes_before - self.bytes_after
+        pct = 100.0 * saved / self.bytes_before if self.bytes_before else 0.0
+        lines = [
+            f"Page: {self.bytes_before:,} -> {self.bytes_after:,} bytes ({-pct:+.1f}%)",
+            f"CSS: {self.css_before:,} -> {self.css_after:,} bytes; JS: {self.js_before:,} -> {self.js_after:,} bytes",
+        ]
+        if self.inlined:
+            lines.append(f"Inlined {len(self.inlined)} asset(s); still linked: {len(self.still_linked)}")
+        if self.reverted:
+            lines.append("Minified markup failed validation; the original markup was kept.")
+        for error in self.validation.get("errors", []):
+            lines.append(f"Error: {error}")
+        for warning in self.validation.get("warnings", []):
+            lines.append(f"Warning: {warning}")
+        return "\n".join(lines)
+
+
+def postprocess_html(html: str, inline: bool = False, cache: Optional[AssetCache] = None) -> Tuple[str, PostProcessReport]:
+    """Minify (and optionally inline assets into) a page; returns (page, report)."""
+    stats: Dict[str, int] = {}
+    processed = html
+    inlined: List[str] = []
+    linked: List[str] = []
+    if inline:
+        processed, inlined, linked = inline_assets(processed, cache or AssetCache())
+    processed = minify_html(processed, stats)
+
+    before = validate_html(html)
+    after = validate_html(processed)
+    reverted = len(after.errors) > len(before.errors)
+    if reverted:
+        logger.warning("Post-processing introduced errors %s; keeping the original page", after.errors)
+        processed, after, stats = html, before, {}
+    report = PostProcessReport(
+        bytes_before=len(html.encode("utf-8")),
+        bytes_after=len(processed.encode("utf-8")),
+        inlined=inlined if not reverted else [],
+        still_linked=linked,
+        validation=after.as_dict(),
+        reverted=reverted,
+        **stats,
+    )
+    return processed, report
+
+
+class HtmlPostProcessor(BaseAgent):
+    """Pipeline stage: post-processes code_write_agent_output into final_html. No model call."""
+
+    inline_assets: bool = False
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        code = ctx.session.state.get(CODE_OUTPUT_KEY, "")
+        html = extract_html(code)
+        if not html:
+            return
+        page, report = postprocess_html(html, inline=self.inline_assets)
+        store = get_artifact_store()
+        store.put("final", page, {"code": content_digest(code)})
+        store.write_page(page)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part.from_text(text=report.summary())]),
+            actions=EventActions(state_delta={FINAL_HTML_KEY: page, REPORT_KEY: asdict(report)}),
+        )
+
+
+def postprocess_enabled() -> bool:
+    return os.getenv("WEBSITE_POSTPROCESS", "1") != "0"
+
+
+def build_html_postprocessor(name: str = "html_postprocessor") -> HtmlPostProcessor:
+    """Timed post-processing stage; asset inlining follows WEBSITE_INLINE_ASSETS."""
+    return HtmlPostProcessor(
+        name=name,
+        inline_assets=os.getenv("WEBSITE_INLINE_ASSETS", "0") == "1",
+        before_agent_callback=start_stage,
+        after_agent_callback=end_stage,
+    )
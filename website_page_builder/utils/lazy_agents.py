@@ -0,0 +1,41 @@
+# utils/lazy_agents.py
+#
+# Agent modules build their agents on first use instead of at import time, so
+# importing a package (adk web's loader, the manager importing its stages) only
+# costs the module code. An agent module declares its builders and installs the
+# returned function as its module __getattr__ (PEP 562):
+#
+#     __getattr__ = lazy_agents(__name__, code_write_agent=build_code_write_agent,
+#                               root_agent=build_code_write_agent)
+#
+# The first `module.root_agent` (what adk web reads) calls the builder and
+# caches the result; names that share a builder share the object. .env is
+# loaded once per process, right before the first build.
+import functools
+import threading
+from typing import Any, Callable, Dict
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> None:
+    load_dotenv()
+
+
+def lazy_agents(module_name: str, **builders: Callable[[], Any]) -> Callable[[str], Any]:
+    """A module __getattr__ that builds each named agent on first access."""
+    built: Dict[Callable[[], Any], Any] = {}
+    lock = threading.RLock()  # builders may resolve other lazy names
+
+    def __getattr__(name: str) -> Any:
+        builder = builders.get(name)
+        if builder is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        with lock:
+            if builder not in built:
+                load_env()
+                built[builder] = builder()
+            return built[builder]
+
+    return __getattr__
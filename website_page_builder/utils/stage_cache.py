@@ -0,0 +1,284 @@
+# utils/stage_cache.py
+#
+# Memoization of whole pipeline stages (requirement_write_agent,
+# page_designer_agent / parallel_designer_agent, code_write_agent /
+# section_code_writer).
+#
+# Key = sha256(stage agent name, instruction hash, model, input values), where
+# the instruction hash and model cover the agent and all of its sub-agents, and
+# the inputs are the state keys the stage reads (or the user message for the
+# first stage). stage_cache_callbacks() returns (before, after) agent
+# callbacks: on a hit the stored output_key value is written back to state and
+# returned as the stage's reply, so the stage does not run; on a miss the
+# stage's output is stored when it finishes.
+#
+# Later stages are keyed on the state values they read, not on the message, so
+# they hit whenever their upstream output is unchanged. The requirements stage
+# is keyed on the (whitespace-normalized) message itself: a reworded request,
+# such as "same page, change only the styling", misses it, and the new
+# requirements then miss the stages after it. Style-only iteration should use
+# WEBSITE_RESUME_FROM=design (artifact_store.py) instead.
+#
+# Entries of an agent written under an older instruction or model are purged
+# the first time it runs with the new one. invalidate() drops entries
+# explicitly; stage_cache_stats() reports hits, misses and hit rate per stage.
+#
+# Env: WEBSITE_STAGE_CACHE (0 disables), WEBSITE_STAGE_CACHE_PATH
+# (default .cache/website_stage_cache.sqlite), WEBSITE_STAGE_CACHE_MAX_ENTRIES.
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "website_stage_cache.sqlite")
+DEFAULT_MAX_ENTRIES = 2000
+USER_MESSAGE = "user_message"  # pseudo input: the text of the message that started the run
+
+_TEMPLATE_VAR = re.compile(r"{+\s*([A-Za-z_][A-Za-z0-9_]*)\??\s*}+")
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _agents(agent: BaseAgent) -> List[BaseAgent]:
+    """The agent and all of its sub-agents, depth first."""
+    found = [agent]
+    for sub_agent in agent.sub_agents:
+        found.extend(_agents(sub_agent))
+    return found
+
+
+def stage_fingerprint(agent: BaseAgent) -> str:
+    """Hash of every (name, instruction, model) in the stage; changes when any prompt or model does."""
+    parts = []
+    for node in _agents(agent):
+        instruction = getattr(node, "instruction", None)
+        model = getattr(node, "model", None)
+        if isinstance(instruction, str) or isinstance(model, str):
+            parts.append(f"{node.name}|{instruction if isinstance(instruction, str) else ''}|{model or ''}")
+    return _sha256(*parts)
+
+
+def stage_inputs(agent: BaseAgent) -> List[str]:
+    """State keys the stage's instructions reference, or the user message if they reference none."""
+    keys = []
+    for node in _agents(agent):
+        instruction = getattr(node, "instruction", None)
+        if isinstance(instruction, str):
+            keys += [key for key in _TEMPLATE_VAR.findall(instruction) if key not in keys]
+    return keys or [USER_MESSAGE]
+
+
+def _input_value(callback_context: CallbackContext, key: str) -> Any:
+    if key == USER_MESSAGE:
+        content = callback_context.user_content
+        text = "".join(part.text or "" for part in content.parts) if content and content.parts else ""
+        return " ".join(text.split())
+    return callback_context.state.get(key)
+
+
+class StageCache:
+    """
+    SQLite-backed cache of stage outputs.
+
+    Args:
+        path: SQLite file. Env: WEBSITE_STAGE_CACHE_PATH.
+        max_entries: LRU bound. Env: WEBSITE_STAGE_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path or os.getenv("WEBSITE_STAGE_CACHE_PATH", DEFAULT_CACHE_PATH)
+        if max_entries is None:
+            max_entries = int(os.getenv("WEBSITE_STAGE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.max_entries = max_entries
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS stages (
+                key TEXT PRIMARY KEY,
+                agent_name TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        self._checked_fingerprints: set = set()
+        # (invocation_id, agent_name) -> (key, fingerprint), carried from the before to the after callback
+        self._pending: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def _count(self, agent_name: str, field: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(agent_name, {"hits": 0, "misses": 0, "stores": 0})
+            counts[field] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM stages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE stages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, agent_name: str, fingerprint: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stages VALUES (?, ?, ?, ?, ?, ?)",
+                (key, agent_name, fingerprint, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._conn.execute(
+                """DELETE FROM stages WHERE key IN (
+                    SELECT key FROM stages ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def invalidate(self, agent_name: Optional[str] = None, keep_fingerprint: Optional[str] = None) -> int:
+        """
+        Drop cached stage outputs.
+
+        Args:
+            agent_name: Only this stage's entries (default: every stage).
+            keep_fingerprint: Keep entries written under this fingerprint.
+        Returns:
+            The number of entries removed.
+        """
+        query, params = "DELETE FROM stages WHERE fingerprint != ?", [keep_fingerprint or ""]
+        if agent_name:
+            query += " AND agent_name = ?"
+            params.append(agent_name)
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _purge_old_fingerprints(self, agent_name: str, fingerprint: str) -> None:
+        if (agent_name, fingerprint) in self._checked_fingerprints:
+            return
+        self._checked_fingerprints.add((agent_name, fingerprint))
+        removed = self.invalidate(agent_name, keep_fingerprint=fingerprint)
+        if removed:
+            logger.info("Stage cache: %s changed, purged %d entries", agent_name, removed)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage hits, misses, stores and hit rate since start."""
+        with self._lock:
+            return {
+                name: {
+                    **counts,
+                    "hit_rate": round(counts["hits"] / (counts["hits"] + counts["misses"]), 3)
+                    if counts["hits"] + counts["misses"]
+                    else 0.0,
+                }
+                for name, counts in self._counts.items()
+            }
+
+    def callbacks(self, agent: BaseAgent, output_key: str, inputs: Optional[Sequence[str]] = None) -> Tuple[Callable, Callable]:
+        """
+        Build (before_agent_callback, after_agent_callback) memoizing `agent`.
+
+        Args:
+            agent: The stage; its name, instructions and models are part of the key.
+            output_key: State key the stage writes its result to.
+            inputs: State keys the stage reads (USER_MESSAGE for the message text).
+                Default: stage_inputs(agent).
+        """
+        inputs = list(inputs or stage_inputs(agent))
+        fingerprint = stage_fingerprint(agent)
+
+        def lookup_stage(callback_context: CallbackContext) -> Optional[types.Content]:
+            agent_name = callback_context.agent_name
+            self._purge_old_fingerprints(agent_name, fingerprint)
+            values = {key: _input_value(callback_context, key) for key in inputs}
+            key = _sha256(agent_name, fingerprint, json.dumps(values, sort_keys=True, default=str))
+            cached = self.get(key)
+            if cached is not None:
+                self._count(agent_name, "hits")
+                logger.info("Stage cache hit for %s", agent_name)
+                callback_context.state[output_key] = cached
+                text = cached if isinstance(cached, str) else json.dumps(cached, ensure_ascii=False)
+                return types.Content(role="model", parts=[types.Part.from_text(text=text)])
+            self._count(agent_name, "misses")
+            self._pending[(callback_context.invocation_id, agent_name)] = (key, fingerprint)
+            return None
+
+        def store_stage(callback_context: CallbackContext) -> Optional[types.Content]:
+            pending = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+            value = callback_context.state.get(output_key)
+            if pending is None or value is None or value == "":
+                return None
+            key, stored_fingerprint = pending
+            self.put(key, callback_context.agent_name, stored_fingerprint, value)
+            self._count(callback_context.agent_name, "stores")
+            return None
+
+        return lookup_stage, store_stage
+
+
+_default_cache: Optional[StageCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_stage_cache() -> StageCache:
+    """Process-wide cache, opened on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = StageCache()
+    return _default_cache
+
+
+def stage_cache_enabled() -> bool:
+    return os.getenv("WEBSITE_STAGE_CACHE", "1") != "0"
+
+
+def stage_cache_callbacks(
+    agent: BaseAgent, output_key: str, inputs: Optional[Sequence[str]] = None
+) -> Tuple[Callable, Callable]:
+    """Callbacks bound to the process-wide cache (the SQLite file is opened on the first run)."""
+    bound: list = []
+
+    def _bound() -> list:
+        if not bound:
+            bound.extend(get_stage_cache().callbacks(agent, output_key, inputs))
+        return bound
+
+    def before_agent_callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        return _bound()[0](callback_context=callback_context)
+
+    def after_agent_callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        return _bound()[1](callback_context=callback_context)
+
+    return before_agent_callback, after_agent_callback
+
+
+def invalidate(agent_name: Optional[str] = None) -> int:
+    """Drop cached outputs of one stage (by agent name) or of all stages."""
+    return get_stage_cache().invalidate(agent_name)
+
+
+def stage_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return get_stage_cache().stats()
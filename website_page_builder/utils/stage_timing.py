@@ -0,0 +1,95 @@
+# utils/stage_timing.py
+#
+# Per-stage wall-clock timing for the website builder pipelines.
+#
+# timed(agent) returns a copy of a leaf agent with before/after agent callbacks
+# that record how long the stage ran in this invocation; composite stages
+# (ParallelAgent, SequentialAgent) take start_stage / end_stage directly. The
+# pipeline root uses end_pipeline as its after callback: when it finishes, it
+# writes all stage timings of the run to session state under STAGE_TIMINGS_KEY
+# (seconds, in the order the stages finished, plus "total") and logs them.
+# stage_stats() returns per-stage aggregates across runs.
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+STAGE_TIMINGS_KEY = "stage_timings"
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_started: Dict[Tuple[str, str], float] = {}
+_runs: Dict[str, Dict[str, float]] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _key(callback_context: CallbackContext) -> Tuple[str, str]:
+    return callback_context.invocation_id, callback_context.agent_name
+
+
+def start_stage(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback: remember when the stage started."""
+    with _lock:
+        _started[_key(callback_context)] = time.perf_counter()
+    return None
+
+
+def end_stage(callback_context: CallbackContext) -> Optional[types.Content]:
+    """after_agent_callback: record the stage's duration for this run."""
+    _record(callback_context)
+    return None
+
+
+def end_pipeline(callback_context: CallbackContext) -> Optional[types.Content]:
+    """after_agent_callback of the pipeline root: publish the run's timings to state."""
+    total = _record(callback_context)
+    with _lock:
+        timings = _runs.pop(callback_context.invocation_id, {})
+    timings.pop(callback_context.agent_name, None)
+    timings["total"] = total
+    callback_context.state[STAGE_TIMINGS_KEY] = timings
+    logger.info("%s stage timings: %s", callback_context.agent_name, timings)
+    return None
+
+
+def _record(callback_context: CallbackContext) -> float:
+    now = time.perf_counter()
+    invocation_id, name = _key(callback_context)
+    with _lock:
+        started = _started.pop((invocation_id, name), now)
+        elapsed = round(now - started, 3)
+        _runs.setdefault(invocation_id, {})[name] = elapsed
+        stats = _stats.setdefault(name, {"runs": 0, "total_s": 0.0, "max_s": 0.0})
+        stats["runs"] += 1
+        stats["total_s"] += elapsed
+        stats["max_s"] = max(stats["max_s"], elapsed)
+    return elapsed
+
+
+def timed(agent: BaseAgent) -> BaseAgent:
+    """
+    Copy of a leaf `agent` whose runs are timed. The copy has no parent, so the
+    original can still be used standalone or in another pipeline.
+    """
+    return agent.model_copy(
+        update={"parent_agent": None, "before_agent_callback": start_stage, "after_agent_callback": end_stage}
+    )
+
+
+def stage_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-stage run count, total / average / max seconds across all runs."""
+    with _lock:
+        return {
+            name: {
+                "runs": int(stats["runs"]),
+                "total_s": round(stats["total_s"], 3),
+                "avg_s": round(stats["total_s"] / stats["runs"], 3) if stats["runs"] else 0.0,
+                "max_s": stats["max_s"],
+            }
+            for name, stats in _stats.items()
+        }